@@ -9,8 +9,10 @@ from .connection import connect, Connection  # NOQA
 from .exceptions import *  # NOQA
 from .pool import create_pool  # NOQA
 from .protocol import Record  # NOQA
+from .resultcache import ResultCache  # NOQA
 from .types import *  # NOQA
 
 
-__all__ = ('connect', 'create_pool', 'Record', 'Connection') + \
+__all__ = ('connect', 'create_pool', 'Record', 'Connection',
+           'ResultCache') + \
           exceptions.__all__  # NOQA
@@ -0,0 +1,125 @@
+# Copyright (C) 2016-present the asyncpg authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of asyncpg and is released under
+# the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
+
+
+import asyncio
+import collections
+import struct
+
+from . import connect_utils
+
+
+CancelStats = collections.namedtuple(
+    'CancelStats', ['requests', 'sent', 'deduplicated', 'failures',
+                    'total_latency', 'max_latency'])
+
+# Default limit on concurrently open cancellation connections.
+MAX_CONCURRENT_CANCELS = 8
+
+
+class _CancelDispatcher:
+    # Sends CancelRequest messages on behalf of a set of connections
+    # (all connections of a pool, or a single connection).
+    #
+    # The protocol requires a new connection for every CancelRequest,
+    # so under a timeout storm the number of such connections open at
+    # once is limited, and cancellations of the same backend which are
+    # waiting to be sent are merged.  Requests are sent to the address
+    # of the cancelled connection, which is the only one known to reach
+    # the same server.
+
+    __slots__ = ('_loop', '_semaphore', '_pending',
+                 '_requests', '_sent', '_deduplicated', '_failures',
+                 '_total_latency', '_max_latency')
+
+    def __init__(self, loop, *, max_concurrent=MAX_CONCURRENT_CANCELS):
+        self._loop = loop
+        self._semaphore = asyncio.Semaphore(max_concurrent, loop=loop)
+        # (addr, backend pid) -> list of waiters
+        self._pending = {}
+
+        self._requests = 0
+        self._sent = 0
+        self._deduplicated = 0
+        self._failures = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
+    def cancel(self, addr, params, backend_pid, backend_secret, waiter):
+        """Request the cancellation of the current query of a backend.
+
+        *waiter* is resolved when the server has received the request.
+        """
+        self._requests += 1
+
+        key = (addr, backend_pid)
+        waiters = self._pending.get(key)
+        if waiters is not None:
+            waiters.append(waiter)
+            self._deduplicated += 1
+            return
+
+        self._pending[key] = [waiter]
+        self._loop.create_task(
+            self._dispatch(key, params, backend_secret))
+
+    def get_stats(self):
+        return CancelStats(
+            self._requests, self._sent, self._deduplicated, self._failures,
+            self._total_latency, self._max_latency)
+
+    async def _dispatch(self, key, params, backend_secret):
+        addr, backend_pid = key
+        started = self._loop.time()
+        waiters = None
+
+        try:
+            async with self._semaphore:
+                # Requests for the backend made from now on are sent
+                # separately, as they are for a query which may start
+                # after this message has been processed.
+                waiters = self._pending.pop(key)
+                await self._send(addr, params, backend_pid, backend_secret)
+        except (Exception, asyncio.CancelledError) as ex:
+            if waiters is None:
+                waiters = self._pending.pop(key)
+            self._failures += 1
+            for waiter in waiters:
+                if waiter.done():
+                    continue
+                if isinstance(ex, asyncio.CancelledError):
+                    waiter.cancel()
+                else:
+                    waiter.set_exception(ex)
+            if isinstance(ex, asyncio.CancelledError):
+                raise
+        else:
+            latency = self._loop.time() - started
+            self._sent += 1
+            self._total_latency += latency
+            if latency > self._max_latency:
+                self._max_latency = latency
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    async def _send(self, addr, params, backend_pid, backend_secret):
+        r, w = await connect_utils._open_connection(
+            loop=self._loop, addr=addr, params=params)
+
+        try:
+            # Pack CancelRequest message
+            msg = struct.pack('!llll', 16, 80877102,
+                              backend_pid, backend_secret)
+
+            w.write(msg)
+            await r.read()  # Wait until EOF
+        except ConnectionResetError:
+            # On some systems Postgres will reset the connection
+            # after processing the cancellation command.
+            pass
+        finally:
+            w.close()
@@ -5,6 +5,7 @@
 # the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
 
 
+import asyncio
 import functools
 import os
 import sys
@@ -45,3 +46,11 @@ else:
                     type(path).__name__
                 )
             )
+
+
+if hasattr(asyncio, 'current_task'):
+    def current_asyncio_task(loop):
+        return asyncio.current_task(loop)
+else:
+    def current_asyncio_task(loop):
+        return asyncio.Task.current_task(loop)
@@ -37,9 +37,16 @@ _ClientConfiguration = collections.namedtuple(
         'statement_cache_size',
         'max_cached_statement_lifetime',
         'max_cacheable_statement_size',
+        'statement_cache_policy',
+        'preload_types',
+        'max_result_rows',
+        'max_result_size',
     ])
 
 
+STATEMENT_CACHE_POLICIES = {'lru', 'lfu'}
+
+
 def _parse_connect_dsn_and_args(*, dsn, host, port, user,
                                 password, database, ssl, connect_timeout,
                                 server_settings):
@@ -202,18 +209,41 @@ def _parse_connect_arguments(*, dsn, host, port, user, password, database,
                              timeout, command_timeout, statement_cache_size,
                              max_cached_statement_lifetime,
                              max_cacheable_statement_size,
+                             statement_cache_policy, preload_types,
+                             max_result_rows, max_result_size,
                              ssl, server_settings):
 
     local_vars = locals()
     for var_name in {'max_cacheable_statement_size',
                      'max_cached_statement_lifetime',
-                     'statement_cache_size'}:
+                     'statement_cache_size',
+                     'max_result_rows',
+                     'max_result_size'}:
         var_val = local_vars[var_name]
         if var_val is None or isinstance(var_val, bool) or var_val < 0:
             raise ValueError(
                 '{} is expected to be greater '
                 'or equal to 0, got {!r}'.format(var_name, var_val))
 
+    if (not isinstance(statement_cache_policy, str) or
+            statement_cache_policy not in STATEMENT_CACHE_POLICIES):
+        raise ValueError(
+            'invalid statement_cache_policy value: expected one of {} '
+            '(got {!r})'.format(
+                ', '.join(sorted(STATEMENT_CACHE_POLICIES)),
+                statement_cache_policy))
+
+    if preload_types is not None:
+        if isinstance(preload_types, str):
+            preload_types = (preload_types,)
+        else:
+            preload_types = tuple(preload_types)
+        for name in preload_types:
+            if not isinstance(name, str):
+                raise TypeError(
+                    'invalid preload_types value: expected a list of '
+                    'type or schema names (got {!r})'.format(name))
+
     if command_timeout is not None:
         try:
             if isinstance(command_timeout, bool):
@@ -237,13 +267,17 @@ def _parse_connect_arguments(*, dsn, host, port, user, password, database,
         command_timeout=command_timeout,
         statement_cache_size=statement_cache_size,
         max_cached_statement_lifetime=max_cached_statement_lifetime,
-        max_cacheable_statement_size=max_cacheable_statement_size,)
+        max_cacheable_statement_size=max_cacheable_statement_size,
+        statement_cache_policy=statement_cache_policy,
+        preload_types=preload_types,
+        max_result_rows=max_result_rows,
+        max_result_size=max_result_size,)
 
     return addrs, params, config
 
 
 async def _connect_addr(*, addr, loop, timeout, params, config,
-                        connection_class):
+                        connection_class, preloaded_types=None):
     assert loop is not None
 
     if timeout <= 0:
@@ -271,13 +305,26 @@ async def _connect_addr(*, addr, loop, timeout, params, config,
     try:
         if timeout <= 0:
             raise asyncio.TimeoutError
+        before = time.monotonic()
         await asyncio.wait_for(connected, loop=loop, timeout=timeout)
+        timeout -= time.monotonic() - before
     except Exception:
         tr.close()
         raise
 
     con = connection_class(pr, tr, loop, addr, config, params)
     pr.set_connection(con)
+
+    if config.preload_types:
+        try:
+            if timeout <= 0:
+                raise asyncio.TimeoutError
+            await con._preload_types(config.preload_types, preloaded_types,
+                                     timeout=timeout)
+        except Exception:
+            con.terminate()
+            raise
+
     return con
 
 
@@ -8,17 +8,18 @@
 import asyncio
 import collections
 import collections.abc
-import struct
+import re
 import time
 import warnings
 
+from . import cancellation
 from . import compat
 from . import connect_utils
 from . import cursor
 from . import exceptions
 from . import introspection
 from . import prepared_stmt
-from . import protocol
+from . import resultcache
 from . import serverversion
 from . import transaction
 from . import utils
@@ -38,11 +39,14 @@ class Connection(metaclass=ConnectionMeta):
     """
 
     __slots__ = ('_protocol', '_transport', '_loop', '_types_stmt',
-                 '_type_by_name_stmt', '_top_xact', '_uid', '_aborted',
-                 '_stmt_cache', '_stmts_to_close', '_listeners',
-                 '_server_version', '_server_caps', '_intro_query',
-                 '_reset_query', '_proxy', '_stmt_exclusive_section',
-                 '_config', '_params', '_addr', '_log_listeners')
+                 '_simple_types_stmt', '_type_by_name_stmt', '_top_xact',
+                 '_uid', '_aborted', '_stmt_cache', '_stmts_to_close',
+                 '_listeners', '_server_version', '_server_caps',
+                 '_simple_intro_query', '_intro_query', '_reset_query',
+                 '_proxy', '_stmt_exclusive_section', '_config', '_params',
+                 '_addr',
+                 '_log_listeners', '_termination_listeners',
+                 '_xact_counters', '_preloaded_types', '_cancel_dispatcher')
 
     def __init__(self, protocol, transport, loop,
                  addr: (str, int) or str,
@@ -52,10 +56,16 @@ class Connection(metaclass=ConnectionMeta):
         self._transport = transport
         self._loop = loop
         self._types_stmt = None
+        self._simple_types_stmt = None
         self._type_by_name_stmt = None
         self._top_xact = None
         self._uid = 0
         self._aborted = False
+        self._xact_counters = transaction._TransactionCounters()
+        self._preloaded_types = None
+        # Set to the dispatcher of the pool for pooled connections,
+        # otherwise created on first use.
+        self._cancel_dispatcher = None
 
         self._addr = addr
         self._config = config
@@ -65,12 +75,14 @@ class Connection(metaclass=ConnectionMeta):
             loop=loop,
             max_size=config.statement_cache_size,
             on_remove=self._maybe_gc_stmt,
-            max_lifetime=config.max_cached_statement_lifetime)
+            max_lifetime=config.max_cached_statement_lifetime,
+            policy=config.statement_cache_policy)
 
         self._stmts_to_close = set()
 
         self._listeners = {}
         self._log_listeners = set()
+        self._termination_listeners = set()
 
         settings = self._protocol.get_settings()
         ver_string = settings.server_version
@@ -80,10 +92,8 @@ class Connection(metaclass=ConnectionMeta):
         self._server_caps = _detect_server_capabilities(
             self._server_version, settings)
 
-        if self._server_version < (9, 2):
-            self._intro_query = introspection.INTRO_LOOKUP_TYPES_91
-        else:
-            self._intro_query = introspection.INTRO_LOOKUP_TYPES
+        self._simple_intro_query, self._intro_query = \
+            introspection.get_lookup_queries(self._server_version)
 
         self._reset_query = None
         self._proxy = None
@@ -180,8 +190,17 @@ class Connection(metaclass=ConnectionMeta):
         """
         return self._protocol.get_settings()
 
+    def is_in_transaction(self):
+        """Return True if Connection is currently inside a transaction.
+
+        :return bool: True if inside transaction, False otherwise.
+
+        .. versionadded:: 0.13.0
+        """
+        return self._protocol.is_in_transaction()
+
     def transaction(self, *, isolation='read_committed', readonly=False,
-                    deferrable=False):
+                    deferrable=False, lazy=False):
         """Create a :class:`~transaction.Transaction` object.
 
         Refer to `PostgreSQL documentation`_ on the meaning of transaction
@@ -197,11 +216,123 @@ class Connection(metaclass=ConnectionMeta):
         :param deferrable: Specifies whether or not this transaction is
                            deferrable.
 
+        :param lazy: If ``True``, ``BEGIN`` (or ``SAVEPOINT``) is not
+                     sent when the transaction is started, but in the
+                     same network write as the first statement executed
+                     in the block, saving a round-trip.  A transaction
+                     block in which nothing is executed is not sent
+                     to the server at all.  Note that
+                     :meth:`is_in_transaction` returns ``False`` until
+                     the first statement is executed.
+
+        .. versionchanged:: 0.13.0
+           Added the *lazy* parameter.
+
         .. _`PostgreSQL documentation`: https://www.postgresql.org/docs/\
                                         current/static/sql-set-transaction.html
         """
         self._check_open()
-        return transaction.Transaction(self, isolation, readonly, deferrable)
+        return transaction.Transaction(self, isolation, readonly, deferrable,
+                                       lazy)
+
+    async def run_transaction(self, fn, *args, isolation='read_committed',
+                              readonly=False, deferrable=False, retries=5,
+                              backoff=0.01, max_backoff=1.0):
+        """Run ``fn(connection, *args)`` in a transaction, retrying it
+        on serialization failures and deadlocks.
+
+        The transaction is retried when it fails with
+        :exc:`~asyncpg.exceptions.SerializationError` or
+        :exc:`~asyncpg.exceptions.DeadlockDetectedError`, after a random
+        delay of up to ``backoff * 2 ** n`` (capped by *max_backoff*)
+        seconds before the *n*-th retry.  *fn* must therefore be safe to
+        run more than once.  The transaction is :meth:`lazy <transaction>`.
+
+        .. code-block:: python
+
+            async def transfer(con, src, dst, amount):
+                await con.execute(
+                    'UPDATE accounts SET balance = balance - $2 '
+                    'WHERE id = $1', src, amount)
+                await con.execute(
+                    'UPDATE accounts SET balance = balance + $2 '
+                    'WHERE id = $1', dst, amount)
+
+            await con.run_transaction(transfer, 1, 2, 100,
+                                      isolation='serializable')
+
+        :param fn: A coroutine function, called with the connection
+                   and *args*.
+        :param isolation: Transaction isolation mode, as in
+                          :meth:`transaction`.
+        :param readonly: As in :meth:`transaction`.
+        :param deferrable: As in :meth:`transaction`.
+        :param int retries: The maximum number of retries, after which
+                            the error is raised.
+        :param float backoff: The base retry delay in seconds.
+        :param float max_backoff: The maximum retry delay in seconds.
+        :return: The result of *fn*.
+
+        .. versionadded:: 0.13.0
+        """
+        self._check_open()
+        if self._top_xact is not None or self._protocol.is_in_transaction():
+            raise exceptions.InterfaceError(
+                'cannot use run_transaction() inside a transaction')
+
+        con = self._unwrap()
+
+        async def attempt():
+            async with self.transaction(isolation=isolation,
+                                        readonly=readonly,
+                                        deferrable=deferrable, lazy=True):
+                return await fn(con, *args)
+
+        return await transaction._run_with_retries(
+            attempt, retries=retries, backoff=backoff,
+            max_backoff=max_backoff, counters=self._xact_counters,
+            loop=self._loop)
+
+    def get_transaction_stats(self):
+        """Return the statistics of :meth:`run_transaction` calls.
+
+        :return: A :class:`~asyncpg.transaction.TransactionStats` tuple
+                 of the number of calls, of retries and of calls that
+                 failed after exhausting their retries.
+
+        .. versionadded:: 0.13.0
+        """
+        return self._xact_counters.get_stats()
+
+    def get_cancel_stats(self):
+        """Return the statistics of query cancellation requests.
+
+        Queries are cancelled when they time out or when the task running
+        them is cancelled.  For connections of a pool, the statistics
+        cover all connections of the pool.
+
+        :return: A :class:`~asyncpg.cancellation.CancelStats` tuple of
+                 the number of requested cancellations, of CancelRequest
+                 messages sent to the server, of requests merged into a
+                 pending one for the same server process, of messages
+                 which could not be sent, and the total and maximum
+                 latency of the sent messages in seconds.
+
+        .. versionadded:: 0.13.0
+        """
+        return self._get_cancel_dispatcher().get_stats()
+
+    def get_statement_cache_stats(self):
+        """Return the statistics of the prepared statement cache.
+
+        :return: A ``StatementCacheStats`` tuple of the number of cache
+                 hits, misses, statements evicted to make room for new
+                 ones, and statements not cached by the ``'lfu'``
+                 :func:`statement_cache_policy <connect>`.
+
+        .. versionadded:: 0.13.0
+        """
+        return self._stmt_cache.get_stats()
 
     async def execute(self, query: str, *args, timeout: float=None) -> str:
         """Execute an SQL command (or commands).
@@ -239,7 +370,8 @@ class Connection(metaclass=ConnectionMeta):
         _, status, _ = await self._execute(query, args, 0, timeout, True)
         return status.decode()
 
-    async def executemany(self, command: str, args, *, timeout: float=None):
+    async def executemany(self, command: str, args, *, timeout: float=None,
+                          use_copy: bool=False):
         """Execute an SQL *command* for each sequence of arguments in *args*.
 
         Example:
@@ -253,14 +385,34 @@ class Connection(metaclass=ConnectionMeta):
         :param command: Command to execute.
         :param args: An iterable containing sequences of arguments.
         :param float timeout: Optional timeout value in seconds.
+        :param bool use_copy:
+            If ``True`` and *command* is a plain ``INSERT INTO table
+            (columns) VALUES ($1, ..., $n)``, optionally followed by an
+            ``ON CONFLICT`` clause, the rows are sent with a binary
+            ``COPY`` instead, which is much faster for large batches.
+            An ``ON CONFLICT`` clause is applied by copying the rows
+            to a temporary table first.  Other commands are executed
+            as usual.  The types of the columns must support the binary
+            format, and with ``ON CONFLICT DO UPDATE``, a batch must not
+            update the same row twice.  Statement-level ``INSERT``
+            triggers fire once per batch with ``COPY``, and since
+            ``COPY`` ignores rules, commands targeting views or tables
+            with rules are always executed row by row.
         :return None: This method discards the results of the operations.
 
         .. versionadded:: 0.7.0
 
         .. versionchanged:: 0.11.0
            `timeout` became a keyword-only parameter.
+
+        .. versionchanged:: 0.13.0
+           Added the *use_copy* parameter.
         """
         self._check_open()
+        if use_copy:
+            insert = _parse_copyable_insert(command)
+            if insert is not None:
+                return await self._copy_insert(command, *insert, args, timeout)
         return await self._executemany(command, args, timeout)
 
     async def _get_statement(self, query, timeout, *, named: bool=False):
@@ -277,44 +429,106 @@ class Connection(metaclass=ConnectionMeta):
                 len(query) > self._config.max_cacheable_statement_size):
             use_cache = False
 
+        if use_cache and not self._stmt_cache.admit(query):
+            use_cache = False
+
         if use_cache or named:
             stmt_name = self._get_unique_id('stmt')
         else:
             stmt_name = ''
 
+        started = time.monotonic()
         statement = await self._protocol.prepare(stmt_name, query, timeout)
 
         ready = statement._init_types()
         if ready is not True:
-            if self._types_stmt is None:
-                self._types_stmt = await self.prepare(self._intro_query)
-
-            types = await self._types_stmt.fetch(list(ready))
+            types = await self._introspect_types(ready, None)
             self._protocol.get_settings().register_data_types(types)
 
         if use_cache:
-            self._stmt_cache.put(query, statement)
+            self._stmt_cache.put(query, statement,
+                                 cost=time.monotonic() - started)
 
         # If we've just created a new statement object, check if there
         # are any statements for GC.
         if self._stmts_to_close:
-            await self._cleanup_stmts()
+            self._cleanup_stmts()
 
         return statement
 
-    def cursor(self, query, *args, prefetch=None, timeout=None):
+    async def _introspect_types(self, typeoids, timeout):
+        typeoids = list(typeoids)
+
+        if self._simple_intro_query is not None:
+            # Try the cheap query first, it is enough unless
+            # there are composite or domain types involved.
+            if self._simple_types_stmt is None:
+                self._simple_types_stmt = await self.prepare(
+                    self._simple_intro_query)
+
+            started = time.monotonic()
+            types = await self._simple_types_stmt.fetch(
+                typeoids, timeout=timeout,
+                max_result_rows=0, max_result_size=0)
+            if all(map(introspection.is_simple_type, types)):
+                return types
+
+            if timeout is not None:
+                timeout -= time.monotonic() - started
+                if timeout <= 0:
+                    raise asyncio.TimeoutError
+
+        if self._types_stmt is None:
+            self._types_stmt = await self.prepare(self._intro_query)
+
+        return await self._types_stmt.fetch(
+            typeoids, timeout=timeout,
+            max_result_rows=0, max_result_size=0)
+
+    async def _preload_types(self, names, types=None, *, timeout=None):
+        # Introspect and register the codecs of the types listed in
+        # the `preload_types` connection option, unless the type rows
+        # are passed in *types*.
+        if types is None:
+            started = time.monotonic()
+            oids = await self.fetch(
+                introspection.TYPE_OIDS_BY_NAME_OR_SCHEMA,
+                [n for n in names if not n.endswith('.*')],
+                [n[:-2] for n in names if n.endswith('.*')],
+                timeout=timeout, max_result_rows=0, max_result_size=0)
+            if timeout is not None:
+                timeout -= time.monotonic() - started
+                if timeout <= 0:
+                    raise asyncio.TimeoutError
+            types = await self._introspect_types(
+                (r[0] for r in oids), timeout)
+
+        self._protocol.get_settings().register_data_types(types)
+        self._preloaded_types = types
+
+    def cursor(self, query, *args, prefetch=None, timeout=None,
+               prefetch_ahead=False):
         """Return a *cursor factory* for the specified query.
 
         :param args: Query arguments.
         :param int prefetch: The number of rows the *cursor iterator*
                              will prefetch (defaults to ``50``.)
         :param float timeout: Optional timeout in seconds.
+        :param bool prefetch_ahead:
+            If ``True``, the *cursor iterator* will request the next
+            batch of rows while the current one is being consumed.
+            Other operations on the connection wait for that batch to
+            arrive.  If *prefetch* is not specified, the batch size is
+            adjusted automatically.
 
         :return: A :class:`~cursor.CursorFactory` object.
+
+        .. versionchanged:: 0.13.0
+           Added the *prefetch_ahead* parameter.
         """
         self._check_open()
         return cursor.CursorFactory(self, query, None, args,
-                                    prefetch, timeout)
+                                    prefetch, timeout, prefetch_ahead)
 
     async def prepare(self, query, *, timeout=None):
         """Create a *prepared statement* for the specified query.
@@ -328,17 +542,82 @@ class Connection(metaclass=ConnectionMeta):
         stmt = await self._get_statement(query, timeout, named=True)
         return prepared_stmt.PreparedStatement(self, query, stmt)
 
-    async def fetch(self, query, *args, timeout=None) -> list:
+    async def fetch(self, query, *args, timeout=None,
+                    max_result_rows=None, max_result_size=None,
+                    raw_timestamps=False, row_factory=None,
+                    cache=None) -> list:
         """Run a query and return the results as a list of :class:`Record`.
 
         :param str query: Query text.
         :param args: Query arguments.
         :param float timeout: Optional timeout value in seconds.
-
-        :return list: A list of :class:`Record` instances.
+        :param int max_result_rows:
+            Optional limit on the number of returned rows.  If not
+            specified, defaults to the value of ``max_result_rows``
+            argument to :func:`~asyncpg.connection.connect`.
+        :param int max_result_size:
+            Optional limit on the size of the result in bytes.  If not
+            specified, defaults to the value of ``max_result_size``
+            argument to :func:`~asyncpg.connection.connect`.
+        :param bool raw_timestamps:
+            If ``True``, ``date``, ``timestamp`` and ``timestamptz``
+            columns are returned as integer numbers of microseconds
+            since the Unix epoch instead of :class:`datetime.date` and
+            :class:`datetime.datetime` objects.  Infinite values are
+            returned as the minimum and maximum 64-bit integers.
+            Columns with a custom codec are not affected.
+        :param type row_factory:
+            The type of the returned rows.  If ``tuple``, rows are
+            returned as plain tuples.  If ``dict``, rows are returned as
+            dicts mapping column names to values.  Any other class is
+            instantiated without calling its ``__init__`` method and
+            the values are assigned to the attributes named after the
+            columns, which makes it suitable for classes defining
+            ``__slots__``.  The rows are constructed directly from
+            the decoded values.  Defaults to :class:`Record`.
+        :param cache:
+            An optional :class:`~asyncpg.resultcache.ResultCache`.  If
+            specified, the result is looked up in the cache first, and
+            stored in it if the query is executed.  Queries with
+            unhashable arguments are not cached.
+
+        :return list: A list of :class:`Record` instances, or instances
+                      of *row_factory*.
+
+        :raises ~asyncpg.exceptions.ResultTooLargeError:
+            if the result exceeds one of the limits.  The query is
+            cancelled in that case.
+
+        .. versionchanged:: 0.13.0
+           Added *max_result_rows*, *max_result_size*, *raw_timestamps*,
+           *row_factory* and *cache* parameters.
         """
         self._check_open()
-        return await self._execute(query, args, 0, timeout)
+
+        if cache is not None:
+            if self._proxy is not None:
+                owner = self._proxy._holder._pool
+            else:
+                owner = self
+            key = _check_result_cache(cache, owner)._make_key(
+                query, args,
+                (max_result_rows, max_result_size,
+                 raw_timestamps, row_factory))
+            if key is not None:
+                result = cache._get(key)
+                if result is not None:
+                    return result
+
+        result = await self._execute(query, args, 0, timeout,
+                                     max_rows=max_result_rows,
+                                     max_size=max_result_size,
+                                     raw_timestamps=raw_timestamps,
+                                     row_factory=row_factory)
+
+        if cache is not None and key is not None:
+            cache._put(key, result)
+
+        return result
 
     async def fetchval(self, query, *args, column=0, timeout=None):
         """Run a query and return a value in the first row.
@@ -360,17 +639,24 @@ class Connection(metaclass=ConnectionMeta):
             return None
         return data[0][column]
 
-    async def fetchrow(self, query, *args, timeout=None):
+    async def fetchrow(self, query, *args, timeout=None, row_factory=None):
         """Run a query and return the first row.
 
         :param str query: Query text
         :param args: Query arguments
         :param float timeout: Optional timeout value in seconds.
+        :param type row_factory: The type of the returned row, see
+                                 :meth:`Connection.fetch()`.
 
-        :return: The first row as a :class:`Record` instance.
+        :return: The first row as a :class:`Record` instance, or an
+                 instance of *row_factory*.
+
+        .. versionchanged:: 0.13.0
+           Added *row_factory* parameter.
         """
         self._check_open()
-        data = await self._execute(query, args, 1, timeout)
+        data = await self._execute(query, args, 1, timeout,
+                                   row_factory=row_factory)
         if not data:
             return None
         return data[0]
@@ -767,9 +1053,60 @@ class Connection(metaclass=ConnectionMeta):
         return await self._protocol.copy_in(
             copy_stmt, None, None, records, intro_stmt, timeout)
 
+    async def _copy_insert(self, command, table, columns, conflict,
+                           records, timeout):
+        # Performs executemany(use_copy=True) for an INSERT parsed
+        # by _parse_copyable_insert().
+        timeout = self._protocol._get_timeout(timeout)
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+
+        def remaining():
+            if timeout is None:
+                return None
+            return deadline - time.monotonic()
+
+        # COPY cannot write into views and does not apply rules,
+        # so only plain tables get the rows with COPY.
+        copyable = await self.fetchval(
+            _COPYABLE_TABLE_QUERY, table, timeout=timeout)
+        if not copyable:
+            return await self._executemany(command, records, remaining())
+
+        intro_query = 'SELECT {cols} FROM {tab} LIMIT 1'.format(
+            tab=table, cols=columns)
+        intro_stmt = await self._get_statement(intro_query, remaining())
+
+        if conflict is None:
+            copy_stmt = 'COPY {tab} ({cols}) FROM STDIN {opts}'.format(
+                tab=table, cols=columns, opts='(FORMAT binary)')
+            await self._copy_in_records(
+                copy_stmt, records, intro_stmt, remaining())
+            return
+
+        # COPY cannot resolve conflicts, so stage the rows in
+        # a temporary table and insert them from there.
+        tmpname = utils._quote_ident(self._get_unique_id('copy'))
+        async with self.transaction():
+            await self.execute(
+                'CREATE TEMPORARY TABLE {tmp} AS SELECT {cols} '
+                'FROM {tab} WITH NO DATA'.format(
+                    tmp=tmpname, tab=table, cols=columns),
+                timeout=remaining())
+            await self._copy_in_records(
+                'COPY {tmp} FROM STDIN (FORMAT binary)'.format(tmp=tmpname),
+                records, intro_stmt, remaining())
+            await self.execute(
+                'INSERT INTO {tab} ({cols}) SELECT * FROM {tmp} '
+                '{conflict}'.format(
+                    tab=table, cols=columns, tmp=tmpname, conflict=conflict),
+                timeout=remaining())
+            await self.execute(
+                'DROP TABLE {tmp}'.format(tmp=tmpname), timeout=remaining())
+
     async def set_type_codec(self, typename, *,
                              schema='public', encoder, decoder,
-                             binary=None, format='text'):
+                             binary=None, format='text', batch=False):
         """Set an encoder/decoder pair for the specified data type.
 
         :param typename:
@@ -827,6 +1164,19 @@ class Connection(metaclass=ConnectionMeta):
             Callable accepting a single argument encoded according to *format*
             and returning a decoded Python object.
 
+        :param batch:
+            If ``True``, *encoder* and *decoder* are invoked with a list
+            of values and must return a list of the same length.  The
+            *decoder* receives all non-NULL values of a result column at
+            once, and the *encoder* receives whole columns of
+            :meth:`Connection.executemany` arguments and
+            :meth:`Connection.copy_records_to_table` records, which allows
+            vectorized conversions.  Values nested in arrays or composite
+            types, as well as single query arguments, are passed as
+            one-item lists.  As :meth:`Connection.copy_records_to_table`
+            uses binary COPY, it only accepts codecs whose *format* is
+            not ``'text'``, batched or not.
+
         :param binary:
             **Deprecated**.  Use *format* instead.
 
@@ -870,6 +1220,9 @@ class Connection(metaclass=ConnectionMeta):
             The ``binary`` keyword argument is deprecated in favor of
             ``format``.
 
+        .. versionadded:: 0.13.0
+            The ``batch`` keyword argument.
+
         """
         self._check_open()
 
@@ -898,7 +1251,7 @@ class Connection(metaclass=ConnectionMeta):
 
         self._protocol.get_settings().add_python_codec(
             oid, typename, schema, 'scalar',
-            encoder, decoder, format)
+            encoder, decoder, format, batch)
 
         # Statement cache is no longer valid due to codec changes.
         self._drop_local_statement_cache()
@@ -965,6 +1318,168 @@ class Connection(metaclass=ConnectionMeta):
         # Statement cache is no longer valid due to codec changes.
         self._drop_local_statement_cache()
 
+    async def set_type_interning(self, typename, *, schema='public',
+                                 enabled=True):
+        """Enable or disable interning of decoded values of a text type.
+
+        When enabled, each result column of the specified type keeps
+        a small bounded cache of decoded strings, and equal values
+        of the column share the same ``str`` object.  This reduces
+        memory usage and speeds up decoding of large results with
+        low-cardinality text or enum columns.
+
+        Interning applies to enum types and to the ``text``, ``varchar``,
+        ``bpchar`` and ``name`` types (``schema='pg_catalog'``) when the
+        connection uses the UTF-8 client encoding.
+
+        :param typename:  Name of the data type.
+        :param schema:  Schema name of the data type
+                        (defaults to ``'public'``)
+        :param enabled:  Whether to enable (the default) or disable
+                         interning.
+
+        .. versionadded:: 0.13.0
+        """
+        self._check_open()
+
+        if self._type_by_name_stmt is None:
+            self._type_by_name_stmt = await self.prepare(
+                introspection.TYPE_BY_NAME)
+
+        typeinfo = await self._type_by_name_stmt.fetchrow(
+            typename, schema)
+        if not typeinfo:
+            raise ValueError('unknown type: {}.{}'.format(schema, typename))
+
+        typekind = 'enum' if typeinfo['kind'] == b'e' else 'scalar'
+
+        self._protocol.get_settings().set_type_interning(
+            typeinfo['oid'], typename, schema, typekind, enabled)
+
+        # Statement cache is no longer valid due to decoding changes.
+        self._drop_local_statement_cache()
+
+    async def set_typed_array_decoding(self, typename, *,
+                                       schema='pg_catalog', enabled=True):
+        """Enable or disable decoding of arrays into typed buffers.
+
+        When enabled, arrays of the specified element type are decoded
+        into :class:`array.array` instances instead of lists, which
+        avoids creating a Python object for every element.
+        Multidimensional arrays are returned as a :class:`memoryview`
+        of the corresponding shape.  Arrays containing ``NULL`` elements
+        cannot be decoded in this mode.
+
+        Supported element types are ``int4``, ``int8``, ``float4``
+        and ``float8``.  Note that arrays of these types are always
+        encoded directly from contiguous objects supporting the buffer
+        protocol (e.g. :class:`array.array` or NumPy arrays) with
+        a matching item type.
+
+        :param typename:  Name of the array element type.
+        :param schema:  Schema name of the element type
+                        (defaults to ``'pg_catalog'``)
+        :param enabled:  Whether to enable (the default) or disable
+                         typed array decoding.
+
+        .. versionadded:: 0.13.0
+        """
+        self._check_open()
+
+        if self._type_by_name_stmt is None:
+            self._type_by_name_stmt = await self.prepare(
+                introspection.TYPE_BY_NAME)
+
+        typeinfo = await self._type_by_name_stmt.fetchrow(
+            typename, schema)
+        if not typeinfo:
+            raise ValueError('unknown type: {}.{}'.format(schema, typename))
+
+        self._protocol.get_settings().set_typed_array_decoding(
+            typeinfo['oid'], typename, schema, enabled)
+
+    def set_json_codec(self, *, encoder=None, decoder=None, raw_bytes=False):
+        """Set the serializer and parser used for ``json`` and ``jsonb``.
+
+        By default, ``json`` and ``jsonb`` values are exchanged as
+        ``str`` instances containing the JSON document.  Unlike
+        :meth:`Connection.set_type_codec`, the callbacks set by this
+        method are invoked directly by the built-in codecs, which allows
+        plugging in a fast native JSON library.
+
+        :param encoder:
+            Callable accepting a Python object and returning its JSON
+            representation as ``str`` or ``bytes``, e.g. ``json.dumps``
+            or ``orjson.dumps``.  ``bytes`` are sent as is and must be
+            in the client encoding.
+
+        :param decoder:
+            Callable accepting a JSON document and returning a Python
+            object, e.g. ``json.loads`` or ``orjson.loads``.  When the
+            client encoding is UTF-8 (the default), the decoder receives
+            the raw ``bytes`` of the document without an intermediate
+            ``str``.
+
+        :param bool raw_bytes:
+            If ``True``, ``bytes`` arguments are sent as already
+            serialized JSON documents, bypassing *encoder*.
+
+        Calling this method without arguments restores the default
+        behavior.
+
+        Example:
+
+        .. code-block:: pycon
+
+            >>> import asyncpg
+            >>> import asyncio
+            >>> import json
+            >>> async def run():
+            ...     con = await asyncpg.connect(user='postgres')
+            ...     con.set_json_codec(encoder=json.dumps,
+            ...                        decoder=json.loads)
+            ...     result = await con.fetchval(
+            ...         "SELECT $1::jsonb", {'a': [1, 2]})
+            ...     print(result)
+            >>> asyncio.get_event_loop().run_until_complete(run())
+            {'a': [1, 2]}
+
+        .. versionadded:: 0.13.0
+        """
+        self._check_open()
+        self._protocol.get_settings().set_json_codec(
+            encoder, decoder, raw_bytes)
+
+    def set_numeric_format(self, format='decimal', *, scale=0):
+        """Set the Python representation of ``numeric`` values.
+
+        :param str format:
+            If *format* is ``'decimal'`` (the default), ``numeric`` values
+            are decoded into :class:`decimal.Decimal` instances.
+
+            If *format* is ``'float'``, values are decoded into ``float``
+            (correctly rounded), and ``float`` arguments are encoded
+            using their shortest decimal representation.
+
+            If *format* is ``'int'``, values are decoded into integers
+            holding the value multiplied by ``10 ** scale``, e.g. ``12345``
+            for ``123.45`` with ``scale=2``, and ``int`` arguments are
+            interpreted the same way.  Decoding a value that has more
+            significant fractional digits than *scale* raises
+            :exc:`ValueError`.
+
+        :param int scale:
+            Number of decimal digits after the decimal point for the
+            ``'int'`` format.
+
+        Arguments of other types, such as :class:`decimal.Decimal`,
+        are encoded as usual with every format.
+
+        .. versionadded:: 0.13.0
+        """
+        self._check_open()
+        self._protocol.get_settings().set_numeric_format(format, scale)
+
     def is_closed(self):
         """Return ``True`` if the connection is closed, ``False`` otherwise.
 
@@ -995,6 +1510,7 @@ class Connection(metaclass=ConnectionMeta):
         self._check_open()
         self._listeners.clear()
         self._log_listeners.clear()
+        self._protocol.clear_xact_commands()
         reset_query = self._get_reset_query()
         if reset_query:
             await self.execute(reset_query)
@@ -1030,47 +1546,26 @@ class Connection(metaclass=ConnectionMeta):
             stmt.mark_closed()
             self._stmts_to_close.add(stmt)
 
-    async def _cleanup_stmts(self):
+    def _cleanup_stmts(self):
         # Called whenever we create a new prepared statement in
         # `Connection._get_statement()` and `_stmts_to_close` is
-        # not empty.
+        # not empty.  The statements are closed in a batch with the
+        # next statement sent to the server.
         to_close = self._stmts_to_close
         self._stmts_to_close = set()
         for stmt in to_close:
-            # It is imperative that statements are cleaned properly,
-            # so we ignore the timeout.
-            await self._protocol.close_statement(stmt, protocol.NO_TIMEOUT)
+            self._protocol.defer_close_statement(stmt)
+
+    def _get_cancel_dispatcher(self):
+        if self._cancel_dispatcher is None:
+            self._cancel_dispatcher = cancellation._CancelDispatcher(
+                self._loop)
+        return self._cancel_dispatcher
 
     def _cancel_current_command(self, waiter):
-        async def cancel():
-            try:
-                # Open new connection to the server
-                r, w = await connect_utils._open_connection(
-                    loop=self._loop, addr=self._addr, params=self._params)
-            except Exception as ex:
-                waiter.set_exception(ex)
-                return
-
-            try:
-                # Pack CancelRequest message
-                msg = struct.pack('!llll', 16, 80877102,
-                                  self._protocol.backend_pid,
-                                  self._protocol.backend_secret)
-
-                w.write(msg)
-                await r.read()  # Wait until EOF
-            except ConnectionResetError:
-                # On some systems Postgres will reset the connection
-                # after processing the cancellation command.
-                pass
-            except Exception as ex:
-                waiter.set_exception(ex)
-            finally:
-                if not waiter.done():  # Ensure set_exception wasn't called.
-                    waiter.set_result(None)
-                w.close()
-
-        self._loop.create_task(cancel())
+        self._get_cancel_dispatcher().cancel(
+            self._addr, self._params, self._protocol.backend_pid,
+            self._protocol.backend_secret, waiter)
 
     def _process_log_message(self, fields, last_query):
         if not self._log_listeners:
@@ -1102,6 +1597,20 @@ class Connection(metaclass=ConnectionMeta):
             self._loop.call_soon(
                 self._call_listener, cb, con_ref, pid, channel, payload)
 
+    def _add_termination_listener(self, callback):
+        # *callback* is called with the connection when the connection
+        # to the server is lost or closed.
+        self._termination_listeners.add(callback)
+
+    def _remove_termination_listener(self, callback):
+        self._termination_listeners.discard(callback)
+
+    def _process_terminate(self):
+        con_ref = self._unwrap()
+        for cb in self._termination_listeners:
+            self._loop.call_soon(cb, con_ref)
+        self._termination_listeners.clear()
+
     def _call_listener(self, cb, con_ref, pid, channel, payload):
         try:
             cb(con_ref, pid, channel, payload)
@@ -1180,9 +1689,12 @@ class Connection(metaclass=ConnectionMeta):
         else:
             self._drop_local_statement_cache()
 
-    async def _execute(self, query, args, limit, timeout, return_status=False):
+    async def _execute(self, query, args, limit, timeout, return_status=False,
+                       *, max_rows=None, max_size=None,
+                       raw_timestamps=False, row_factory=None):
         executor = lambda stmt, timeout: self._protocol.bind_execute(
-            stmt, args, '', limit, return_status, timeout)
+            stmt, args, '', limit, return_status, timeout,
+            max_rows, max_size, raw_timestamps, row_factory)
         timeout = self._protocol._get_timeout(timeout)
         with self._stmt_exclusive_section:
             return await self._do_execute(query, executor, timeout)
@@ -1256,6 +1768,10 @@ async def connect(dsn=None, *,
                   statement_cache_size=100,
                   max_cached_statement_lifetime=300,
                   max_cacheable_statement_size=1024 * 15,
+                  statement_cache_policy='lru',
+                  preload_types=None,
+                  max_result_rows=0,
+                  max_result_size=0,
                   command_timeout=None,
                   ssl=None,
                   connection_class=Connection,
@@ -1312,6 +1828,42 @@ async def connect(dsn=None, *,
         default).  Pass ``0`` to allow all statements to be cached
         regardless of their size.
 
+    :param str statement_cache_policy:
+        the eviction policy of the prepared statement cache:
+
+        * ``'lru'`` (the default) evicts the least recently used
+          statement;
+
+        * ``'lfu'`` only caches a new statement when the cache is full
+          if the statement has been used more often than the statement
+          it would evict, and evicts the statement with the lowest
+          number of uses weighted by the time spent preparing it among
+          the least recently used ones.  This keeps frequently used
+          statements cached when the workload includes many ad-hoc
+          queries.
+
+        Use :meth:`Connection.get_statement_cache_stats()
+        <connection.Connection.get_statement_cache_stats>` to see
+        how effective the cache is.
+
+    :param list preload_types:
+        names of the types to introspect and set up codecs for while
+        connecting, rather than when they are first used by a query.
+        A name ending with ``.*`` stands for all types defined in the
+        schema, e.g. ``['public.mood', 'inventory.*']``.
+
+    :param int max_result_rows:
+        the maximum number of rows a query run by :meth:`Connection.fetch()
+        <connection.Connection.fetch>` and similar methods may return.
+        A query exceeding the limit is cancelled and
+        :exc:`~asyncpg.exceptions.ResultTooLargeError` is raised.
+        Pass ``0`` (the default) to disable the limit.
+
+    :param int max_result_size:
+        the maximum size of a query result in bytes, as received from
+        the server, enforced the same way as *max_result_rows*.
+        Pass ``0`` (the default) to disable the limit.
+
     :param float command_timeout:
         the default timeout for operations on this connection
         (the default is ``None``: no timeout).
@@ -1355,6 +1907,10 @@ async def connect(dsn=None, *,
     .. versionadded:: 0.11.0
        Added ``connection_class`` parameter.
 
+    .. versionadded:: 0.13.0
+       Added ``max_result_rows``, ``max_result_size``,
+       ``statement_cache_policy`` and ``preload_types`` parameters.
+
     .. _SSLContext: https://docs.python.org/3/library/ssl.html#ssl.SSLContext
     .. _create_default_context: https://docs.python.org/3/library/ssl.html#\
                                 ssl.create_default_context
@@ -1375,30 +1931,53 @@ async def connect(dsn=None, *,
         command_timeout=command_timeout,
         statement_cache_size=statement_cache_size,
         max_cached_statement_lifetime=max_cached_statement_lifetime,
-        max_cacheable_statement_size=max_cacheable_statement_size)
+        max_cacheable_statement_size=max_cacheable_statement_size,
+        statement_cache_policy=statement_cache_policy,
+        preload_types=preload_types,
+        max_result_rows=max_result_rows,
+        max_result_size=max_result_size)
 
 
 class _StatementCacheEntry:
 
-    __slots__ = ('_query', '_statement', '_cache', '_cleanup_cb')
+    __slots__ = ('_query', '_statement', '_cache', '_cleanup_cb',
+                 '_hits', '_cost')
 
-    def __init__(self, cache, query, statement):
+    def __init__(self, cache, query, statement, hits, cost):
         self._cache = cache
         self._query = query
         self._statement = statement
         self._cleanup_cb = None
+        # The number of uses and the time spent preparing
+        # the statement, for the 'lfu' policy.
+        self._hits = hits
+        self._cost = cost
+
+    def _get_weight(self):
+        return (self._hits + 1) * self._cost
+
+
+StatementCacheStats = collections.namedtuple(
+    'StatementCacheStats', ['hits', 'misses', 'evictions', 'rejections'])
 
 
 class _StatementCache:
 
     __slots__ = ('_loop', '_entries', '_max_size', '_on_remove',
-                 '_max_lifetime')
+                 '_max_lifetime', '_policy', '_freq', '_accesses',
+                 '_hits', '_misses', '_evictions', '_rejections')
+
+    # The number of least recently used entries among which
+    # the 'lfu' policy picks the one to evict.
+    _EVICTION_SAMPLE = 8
 
-    def __init__(self, *, loop, max_size, on_remove, max_lifetime):
+    def __init__(self, *, loop, max_size, on_remove, max_lifetime,
+                 policy='lru'):
         self._loop = loop
         self._max_size = max_size
         self._on_remove = on_remove
         self._max_lifetime = max_lifetime
+        self._policy = policy
 
         # We use an OrderedDict for LRU implementation.  Operations:
         #
@@ -1419,6 +1998,17 @@ class _StatementCache:
         # beginning of it.
         self._entries = collections.OrderedDict()
 
+        # For the 'lfu' policy: the number of misses of the queries
+        # which are not cached, and the number of lookups since the
+        # counters were last halved.
+        self._freq = {}
+        self._accesses = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._rejections = 0
+
     def __len__(self):
         return len(self._entries)
 
@@ -1441,41 +2031,74 @@ class _StatementCache:
             # and setup a new one if necessary.
             self._set_entry_timeout(entry)
 
+    def get_stats(self):
+        return StatementCacheStats(self._hits, self._misses,
+                                   self._evictions, self._rejections)
+
     def get(self, query, *, promote=True):
         if not self._max_size:
             # The cache is disabled.
             return
 
         entry = self._entries.get(query)  # type: _StatementCacheEntry
-        if entry is None:
-            return
-
-        if entry._statement.closed:
+        if entry is not None and entry._statement.closed:
             # Happens in unittests when we call `stmt._state.mark_closed()`
             # manually.
             self._entries.pop(query)
             self._clear_entry_callback(entry)
+            entry = None
+
+        if entry is None:
             return
 
         if promote:
             # `promote` is `False` when `get()` is called by `has()`.
             self._entries.move_to_end(query, last=True)
+            self._hits += 1
+            entry._hits += 1
+            self._count_access()
 
         return entry._statement
 
     def has(self, query):
         return self.get(query, promote=False) is not None
 
-    def put(self, query, statement):
+    def admit(self, query):
+        """Record a cache miss of *query*.
+
+        Returns True if the statement prepared for *query* should
+        be put in the cache.
+        """
+        self._misses += 1
+        if self._policy != 'lfu':
+            return True
+
+        self._count_access()
+        freq = self._freq[query] = self._freq.get(query, 0) + 1
+        if len(self._freq) > self._max_size * 4:
+            self._age()
+
+        # When the cache is full, the query must have missed it more
+        # often than the entry to be evicted was hit.
+        if (len(self._entries) < self._max_size or
+                freq > self._find_victim()._hits):
+            return True
+
+        self._rejections += 1
+        return False
+
+    def put(self, query, statement, cost=0.0):
         if not self._max_size:
             # The cache is disabled.
             return
 
-        self._entries[query] = self._new_entry(query, statement)
+        entry = self._entries[query] = self._new_entry(
+            query, statement, self._freq.pop(query, 0), cost)
 
         # Check if the cache is bigger than max_size and trim it
-        # if necessary.
-        self._maybe_cleanup()
+        # if necessary.  The new entry is about to be used, so it is
+        # not evicted.
+        self._maybe_cleanup(exclude=entry)
 
     def iter_statements(self):
         return (e._statement for e in self._entries.values())
@@ -1487,6 +2110,7 @@ class _StatementCache:
 
         # Clear the entries dict.
         self._entries.clear()
+        self._freq.clear()
 
     def _set_entry_timeout(self, entry):
         # Clear the existing timeout.
@@ -1497,8 +2121,8 @@ class _StatementCache:
             entry._cleanup_cb = self._loop.call_later(
                 self._max_lifetime, self._on_entry_expired, entry)
 
-    def _new_entry(self, query, statement):
-        entry = _StatementCacheEntry(self, query, statement)
+    def _new_entry(self, query, statement, hits, cost):
+        entry = _StatementCacheEntry(self, query, statement, hits, cost)
         self._set_entry_timeout(entry)
         return entry
 
@@ -1513,11 +2137,43 @@ class _StatementCache:
         if entry._cleanup_cb is not None:
             entry._cleanup_cb.cancel()
 
-    def _maybe_cleanup(self):
+    def _find_victim(self, exclude=None):
+        # The least recently used entries with the lowest weight.
+        victim = None
+        for i, entry in enumerate(self._entries.values()):
+            if i == self._EVICTION_SAMPLE:
+                break
+            if entry is exclude:
+                continue
+            if victim is None or entry._get_weight() < victim._get_weight():
+                victim = entry
+        return victim
+
+    def _count_access(self):
+        if self._policy == 'lfu':
+            self._accesses += 1
+            if self._accesses >= self._max_size * 10:
+                self._age()
+
+    def _age(self):
+        # Halve the counters, so that the statements which were used
+        # often a long time ago do not stay cached forever.
+        self._accesses = 0
+        for entry in self._entries.values():
+            entry._hits //= 2
+        self._freq = {query: n // 2 for query, n in self._freq.items()
+                      if n > 1}
+
+    def _maybe_cleanup(self, exclude=None):
         # Delete cache entries until the size of the cache is `max_size`.
         while len(self._entries) > self._max_size:
-            old_query, old_entry = self._entries.popitem(last=False)
+            if self._policy == 'lfu':
+                old_entry = self._entries.pop(
+                    self._find_victim(exclude)._query)
+            else:
+                old_query, old_entry = self._entries.popitem(last=False)
             self._clear_entry_callback(old_entry)
+            self._evictions += 1
 
             # Let the connection know that the statement was removed
             # from the cache.
@@ -1582,3 +2238,57 @@ def _detect_server_capabilities(server_version, connection_settings):
         sql_reset=sql_reset,
         sql_close_all=sql_close_all
     )
+
+
+_IDENT = r'(?:"(?:[^"]|"")+"|[A-Za-z_][A-Za-z0-9_$]*)'
+
+# Plain and partitioned tables without rules.
+_COPYABLE_TABLE_QUERY = '''
+    SELECT relkind IN ('r', 'p') AND NOT relhasrules
+    FROM pg_catalog.pg_class
+    WHERE oid = $1::text::regclass
+'''
+
+_COPYABLE_INSERT_RE = re.compile(r'''
+    ^\s*INSERT\s+INTO\s+
+    (?P<table>{ident}(?:\s*\.\s*{ident})?)\s*
+    \((?P<columns>\s*{ident}\s*(?:,\s*{ident}\s*)*)\)\s*
+    VALUES\s*
+    \((?P<values>\s*\$\d+\s*(?:,\s*\$\d+\s*)*)\)\s*
+    (?P<conflict>ON\s+CONFLICT\b.*?)?
+    \s*;?\s*$
+'''.format(ident=_IDENT), re.IGNORECASE | re.DOTALL | re.VERBOSE)
+
+
+def _parse_copyable_insert(query):
+    # Returns the (table, columns, ON CONFLICT clause) of an INSERT
+    # whose rows can be sent with COPY, i.e. which only inserts its
+    # arguments in order, or None.
+    match = _COPYABLE_INSERT_RE.match(query)
+    if match is None:
+        return None
+
+    columns = [c.strip() for c in match.group('columns').split(',')]
+    values = [v.strip() for v in match.group('values').split(',')]
+    if values != ['${}'.format(i) for i in range(1, len(columns) + 1)]:
+        return None
+
+    conflict = match.group('conflict')
+    if conflict is not None:
+        conflict = conflict.strip()
+        # Arguments or a RETURNING clause would need the rows
+        # to be inserted one by one.
+        if (';' in conflict or re.search(r'\$\d', conflict) or
+                re.search(r'\bRETURNING\b', conflict, re.IGNORECASE)):
+            return None
+
+    return match.group('table'), ', '.join(columns), conflict
+
+
+def _check_result_cache(cache, owner):
+    if not isinstance(cache, resultcache.ResultCache):
+        raise TypeError(
+            'cache is expected to be an instance of ResultCache, '
+            'got {!r}'.format(type(cache)))
+    cache._check_owner(owner)
+    return cache
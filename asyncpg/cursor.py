@@ -5,12 +5,17 @@
 # the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
 
 
+import asyncio
 import collections
 
 from . import compat
 from . import exceptions
 
 
+# Upper bound for the batch size of an auto-tuned cursor iterator.
+_MAX_AUTO_PREFETCH = 1000
+
+
 class CursorFactory:
     """A cursor interface for the results of a query.
 
@@ -19,12 +24,14 @@ class CursorFactory:
     """
 
     __slots__ = ('_state', '_connection', '_args', '_prefetch',
-                 '_query', '_timeout')
+                 '_query', '_timeout', '_prefetch_ahead')
 
-    def __init__(self, connection, query, state, args, prefetch, timeout):
+    def __init__(self, connection, query, state, args, prefetch, timeout,
+                 prefetch_ahead=False):
         self._connection = connection
         self._args = args
         self._prefetch = prefetch
+        self._prefetch_ahead = prefetch_ahead
         self._query = query
         self._timeout = timeout
         self._state = state
@@ -34,15 +41,23 @@ class CursorFactory:
     @compat.aiter_compat
     def __aiter__(self):
         prefetch = 50 if self._prefetch is None else self._prefetch
+        # The batch size is only tuned when the user did not ask
+        # for a specific one.
+        autotune = self._prefetch_ahead and self._prefetch is None
         return CursorIterator(self._connection,
                               self._query, self._state,
                               self._args, prefetch,
-                              self._timeout)
+                              self._timeout,
+                              self._prefetch_ahead, autotune)
 
     def __await__(self):
         if self._prefetch is not None:
             raise exceptions.InterfaceError(
                 'prefetch argument can only be specified for iterable cursor')
+        if self._prefetch_ahead:
+            raise exceptions.InterfaceError(
+                'prefetch_ahead argument can only be specified for '
+                'iterable cursor')
         cursor = Cursor(self._connection, self._query,
                         self._state, self._args)
         return cursor._init(self._timeout).__await__()
@@ -92,8 +107,11 @@ class BaseCursor:
         protocol = con._protocol
 
         self._portal_name = con._get_unique_id('portal')
+        # Result size limits do not apply to cursors, as they never
+        # buffer more than *n* rows.
         buffer, _, self._exhausted = await protocol.bind_execute(
-            self._state, self._args, self._portal_name, n, True, timeout)
+            self._state, self._args, self._portal_name, n, True, timeout,
+            0, 0)
         return buffer
 
     async def _bind(self, timeout):
@@ -148,9 +166,11 @@ class BaseCursor:
 
 class CursorIterator(BaseCursor):
 
-    __slots__ = ('_buffer', '_prefetch', '_timeout')
+    __slots__ = ('_buffer', '_prefetch', '_timeout', '_prefetch_ahead',
+                 '_autotune', '_pending')
 
-    def __init__(self, connection, query, state, args, prefetch, timeout):
+    def __init__(self, connection, query, state, args, prefetch, timeout,
+                 prefetch_ahead=False, autotune=False):
         super().__init__(connection, query, state, args)
 
         if prefetch <= 0:
@@ -160,6 +180,11 @@ class CursorIterator(BaseCursor):
         self._buffer = collections.deque()
         self._prefetch = prefetch
         self._timeout = timeout
+        self._prefetch_ahead = prefetch_ahead
+        self._autotune = autotune
+        # The future of the Execute for the next batch, sent while the
+        # caller is consuming the current one.
+        self._pending = None
 
     @compat.aiter_compat
     def __aiter__(self):
@@ -175,15 +200,49 @@ class CursorIterator(BaseCursor):
             buffer = await self._bind_exec(self._prefetch, self._timeout)
             self._buffer.extend(buffer)
 
+        if not self._buffer and self._pending is not None:
+            buffer = await self._wait_pending()
+            self._buffer.extend(buffer)
+
         if not self._buffer and not self._exhausted:
             buffer = await self._exec(self._prefetch, self._timeout)
             self._buffer.extend(buffer)
 
+        if (self._prefetch_ahead and self._pending is None and
+                not self._exhausted):
+            # Request the next batch now, so that it travels over
+            # the network while the caller processes the current one.
+            # The protocol makes other operations on the connection
+            # wait for it, and drops the rows if the iteration is
+            # abandoned.
+            self._check_ready()
+            self._pending = await self._connection._protocol.execute_ahead(
+                self._state, self._portal_name, self._prefetch)
+
         if self._buffer:
             return self._buffer.popleft()
 
         raise StopAsyncIteration
 
+    async def _wait_pending(self):
+        pending = self._pending
+        if self._autotune and not pending.done():
+            # The caller drained the buffer before the next batch
+            # arrived: fetch bigger batches to amortize the latency.
+            self._prefetch = min(self._prefetch * 2, _MAX_AUTO_PREFETCH)
+        timeout = self._timeout
+        if timeout is None:
+            timeout = self._connection._config.command_timeout
+        try:
+            # The timeout covers only the time spent waiting, not the
+            # processing of the previous batch.  On expiry the future
+            # is cancelled, which cancels the query.
+            buffer, _, self._exhausted = await asyncio.wait_for(
+                pending, timeout, loop=self._connection._loop)
+        finally:
+            self._pending = None
+        return buffer
+
 
 class Cursor(BaseCursor):
     """An open *portal* into the results of a query."""
@@ -10,7 +10,7 @@ import sys
 
 
 __all__ = ('PostgresError', 'FatalPostgresError', 'UnknownPostgresError',
-           'InterfaceError', 'PostgresLogMessage')
+           'InterfaceError', 'ResultTooLargeError', 'PostgresLogMessage')
 
 
 def _is_asyncpg_class(cls):
@@ -163,6 +163,10 @@ class InterfaceError(Exception):
     """An error caused by improper use of asyncpg API."""
 
 
+class ResultTooLargeError(Exception):
+    """A query result exceeded the configured row count or size limit."""
+
+
 class PostgresLogMessage(PostgresMessage):
     """A base class for non-error server messages."""
 
@@ -136,6 +136,80 @@ ORDER BY
 '''
 
 
+# A cheaper lookup for the types which are neither composites nor
+# domains: no recursion and no scan of pg_attribute.  The requested
+# types are returned along with their array element or range subtypes
+# (depth 1).  Composite and domain types are returned without their
+# attributes and base types, and the types of depth 1 without their
+# own dependencies: INTRO_LOOKUP_TYPES must be used when the result
+# has any of those.
+INTRO_LOOKUP_SIMPLE_TYPES = '''\
+SELECT
+    t.oid                           AS oid,
+    ns.nspname                      AS ns,
+    t.typname                       AS name,
+    t.typtype                       AS kind,
+    NULL::oid                       AS basetype,
+    t.typreceive::oid != 0 AND t.typsend::oid != 0
+                                    AS has_bin_io,
+    t.typelem                       AS elemtype,
+    elem_t.typdelim                 AS elemdelim,
+    range_t.rngsubtype              AS range_subtype,
+    (CASE WHEN t.typtype = 'r' THEN
+        (SELECT
+            range_elem_t.typreceive::oid != 0 AND
+                range_elem_t.typsend::oid != 0
+        FROM
+            pg_catalog.pg_type AS range_elem_t
+        WHERE
+            range_elem_t.oid = range_t.rngsubtype)
+    ELSE
+        elem_t.typreceive::oid != 0 AND
+            elem_t.typsend::oid != 0
+    END)                            AS elem_has_bin_io,
+    NULL::oid[]                     AS attrtypoids,
+    NULL::text[]                    AS attrnames,
+    (CASE WHEN t.oid = any($1::oid[]) THEN 0 ELSE 1 END)
+                                    AS depth
+FROM
+    pg_catalog.pg_type AS t
+    INNER JOIN pg_catalog.pg_namespace ns ON (
+        ns.oid = t.typnamespace)
+    LEFT JOIN pg_type elem_t ON (
+        t.typlen = -1 AND
+        t.typelem != 0 AND
+        t.typelem = elem_t.oid
+    )
+    LEFT JOIN pg_range range_t ON (
+        t.oid = range_t.rngtypid
+    )
+WHERE
+    t.oid = any($1::oid[] || ARRAY(
+        SELECT
+            dep_t.typelem
+        FROM
+            pg_catalog.pg_type AS dep_t
+        WHERE
+            dep_t.oid = any($1::oid[])
+            AND dep_t.typlen = -1
+            AND dep_t.typelem != 0
+
+        UNION ALL
+
+        SELECT
+            dep_r.rngsubtype
+        FROM
+            pg_catalog.pg_range AS dep_r
+        WHERE
+            dep_r.rngtypid = any($1::oid[])
+    ))
+ORDER BY
+    depth DESC,
+    -- Element types and subtypes must be registered first.
+    elem_t.oid IS NOT NULL OR range_t.rngtypid IS NOT NULL
+'''
+
+
 # Prior to 9.2 PostgreSQL did not have range types.
 INTRO_LOOKUP_TYPES_91 = '''\
 WITH RECURSIVE typeinfo_tree(
@@ -267,3 +341,42 @@ FROM
 WHERE
     t.typname = $1 AND ns.nspname = $2
 '''
+
+
+# Types to preload: the types with the given names, resolved using
+# the search path, and the types defined in the given schemas, except
+# the row types of tables.
+TYPE_OIDS_BY_NAME_OR_SCHEMA = '''\
+SELECT
+    t.oid
+FROM
+    pg_catalog.pg_type AS t
+    INNER JOIN pg_catalog.pg_namespace ns ON (ns.oid = t.typnamespace)
+    LEFT JOIN pg_catalog.pg_class c ON (c.oid = t.typrelid)
+WHERE
+    t.oid = any($1::text[]::regtype[]::oid[])
+    OR (ns.nspname = any($2::text[])
+        AND (c.oid IS NULL OR c.relkind = 'c'))
+'''
+
+
+def get_lookup_queries(server_version):
+    """Return the type lookup queries to use with a server version.
+
+    Returns a ``(simple_query, full_query)`` tuple.  If *simple_query*
+    is not ``None``, it should be tried first: its result can be used
+    as is if :func:`is_simple_type` is true for all returned rows,
+    otherwise *full_query* must be run.
+    """
+    if server_version < (9, 2):
+        return None, INTRO_LOOKUP_TYPES_91
+    else:
+        return INTRO_LOOKUP_SIMPLE_TYPES, INTRO_LOOKUP_TYPES
+
+
+def is_simple_type(ti):
+    """Check if a row returned by INTRO_LOOKUP_SIMPLE_TYPES is complete."""
+    if ti['kind'] in (b'c', b'd'):
+        return False
+    return (ti['depth'] == 0 or
+            (ti['elemdelim'] is None and ti['range_subtype'] is None))
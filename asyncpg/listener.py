@@ -0,0 +1,272 @@
+# Copyright (C) 2016-present the asyncpg authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of asyncpg and is released under
+# the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
+
+
+import asyncio
+import collections
+
+from . import compat
+from . import connect_utils
+from . import exceptions
+
+
+Notification = collections.namedtuple(
+    'Notification', ['pid', 'channel', 'payload'])
+
+
+class Subscription:
+    """A subscription to the notifications of a channel.
+
+    Subscriptions are created by :meth:`Pool.listen()
+    <asyncpg.pool.Pool.listen>`.  They are asynchronous iterators
+    of :class:`Notification` tuples:
+
+    .. code-block:: python
+
+        async with await pool.listen('events') as sub:
+            async for notification in sub:
+                print(notification.payload)
+
+    Notifications are buffered until they are consumed.  When the buffer
+    is full, the oldest notifications are dropped.
+
+    .. versionadded:: 0.13.0
+    """
+
+    __slots__ = ('_listener', '_channel', '_loop', '_max_size', '_queue',
+                 '_waiter', '_dropped', '_closed')
+
+    def __init__(self, listener, channel, max_size):
+        self._listener = listener
+        self._channel = channel
+        self._loop = listener._loop
+        self._max_size = max_size
+        self._queue = collections.deque()
+        self._waiter = None
+        self._dropped = 0
+        self._closed = False
+
+    def get_channel(self):
+        """Return the name of the channel."""
+        return self._channel
+
+    def get_dropped_count(self):
+        """Return the number of notifications dropped because
+        the buffer was full."""
+        return self._dropped
+
+    def is_closed(self):
+        return self._closed
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @compat.aiter_compat
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._queue:
+            await self._wait()
+            if not self._queue:
+                raise StopAsyncIteration
+        return self._queue.popleft()
+
+    async def get_batch(self, max_items=None):
+        """Wait for notifications and return a list of those received.
+
+        :param int max_items: The maximum number of notifications
+                              to return, all of them if ``None``.
+        :return: A list of :class:`Notification` tuples, empty if the
+                 subscription is closed.
+        """
+        if not self._queue:
+            await self._wait()
+
+        queue = self._queue
+        if max_items is None or max_items >= len(queue):
+            batch = list(queue)
+            queue.clear()
+        else:
+            batch = [queue.popleft() for _ in range(max_items)]
+        return batch
+
+    async def close(self):
+        """Unsubscribe from the channel.
+
+        Notifications already received can still be consumed.
+        """
+        if self._closed:
+            return
+        self._mark_closed()
+        await self._listener._unsubscribe(self)
+
+    async def _wait(self):
+        if self._closed:
+            return
+        self._waiter = self._loop.create_future()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
+
+    def _wakeup(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def _push(self, notification):
+        if len(self._queue) >= self._max_size:
+            self._queue.popleft()
+            self._dropped += 1
+        self._queue.append(notification)
+        self._wakeup()
+
+    def _mark_closed(self):
+        self._closed = True
+        self._wakeup()
+
+
+class _PoolListener:
+    # A connection dedicated to LISTEN, shared by the subscriptions
+    # of a pool.  The connection is not taken from the pool, and is
+    # reestablished if lost.
+
+    __slots__ = ('_pool', '_loop', '_con', '_lock', '_subscriptions',
+                 '_reconnect_task', '_closed')
+
+    # The delays between reconnection attempts grow up to this value.
+    _MAX_RECONNECT_DELAY = 5.0
+
+    def __init__(self, pool):
+        self._pool = pool
+        self._loop = pool._loop
+        self._con = None
+        self._lock = asyncio.Lock(loop=self._loop)
+        # channel -> set of Subscriptions
+        self._subscriptions = {}
+        self._reconnect_task = None
+        self._closed = False
+
+    async def subscribe(self, channel, max_size):
+        if self._closed:
+            raise exceptions.InterfaceError('pool is closed')
+
+        sub = Subscription(self, channel, max_size)
+
+        async with self._lock:
+            con = await self._get_connection()
+            subs = self._subscriptions.get(channel)
+            if subs is None:
+                await con.add_listener(channel, self._on_notification)
+                subs = self._subscriptions[channel] = set()
+            subs.add(sub)
+
+        return sub
+
+    async def _unsubscribe(self, sub):
+        async with self._lock:
+            subs = self._subscriptions.get(sub._channel)
+            if subs is None or sub not in subs:
+                return
+            subs.discard(sub)
+            if subs:
+                return
+
+            del self._subscriptions[sub._channel]
+            con = self._con
+            if con is not None and not con.is_closed():
+                await con.remove_listener(sub._channel, self._on_notification)
+
+    async def _get_connection(self):
+        con = self._con
+        if con is not None and not con.is_closed():
+            return con
+
+        pool = self._pool
+        if pool._working_addr is None:
+            # Let the pool resolve the address and connection options.
+            async with pool.acquire():
+                pass
+
+        con = await connect_utils._connect_addr(
+            loop=self._loop,
+            addr=pool._working_addr,
+            timeout=pool._working_params.connect_timeout,
+            config=pool._working_config,
+            params=pool._working_params,
+            connection_class=pool._connection_class)
+        con._cancel_dispatcher = pool._cancel_dispatcher
+        con._add_termination_listener(self._on_terminate)
+        self._con = con
+        return con
+
+    def _on_notification(self, con, pid, channel, payload):
+        subs = self._subscriptions.get(channel)
+        if not subs:
+            return
+        notification = Notification(pid, channel, payload)
+        for sub in subs:
+            sub._push(notification)
+
+    def _on_terminate(self, con):
+        if self._closed or con is not self._con:
+            return
+        self._con = None
+        if self._subscriptions and self._reconnect_task is None:
+            self._reconnect_task = self._loop.create_task(self._reconnect())
+
+    async def _reconnect(self):
+        delay = 0.1
+        try:
+            while not self._closed and self._subscriptions:
+                try:
+                    async with self._lock:
+                        con = await self._get_connection()
+                        for channel in self._subscriptions:
+                            await con.add_listener(
+                                channel, self._on_notification)
+                    return
+                except (OSError, asyncio.TimeoutError,
+                        ConnectionError, exceptions.PostgresError,
+                        exceptions.InterfaceError) as ex:
+                    if self._con is not None:
+                        self._con.terminate()
+                        self._con = None
+                    self._loop.call_exception_handler({
+                        'message': 'asyncpg pool listener failed to '
+                                   'reconnect, retrying in {:.1f} '
+                                   'seconds'.format(delay),
+                        'exception': ex
+                    })
+
+                await asyncio.sleep(delay, loop=self._loop)
+                delay = min(delay * 2, self._MAX_RECONNECT_DELAY)
+        finally:
+            self._reconnect_task = None
+
+    def _close_subscriptions(self):
+        self._closed = True
+        for subs in self._subscriptions.values():
+            for sub in subs:
+                sub._mark_closed()
+        self._subscriptions.clear()
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+
+    async def close(self):
+        self._close_subscriptions()
+        con, self._con = self._con, None
+        if con is not None:
+            await con.close()
+
+    def terminate(self):
+        self._close_subscriptions()
+        con, self._con = self._con, None
+        if con is not None:
+            con.terminate()
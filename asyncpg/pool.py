@@ -9,9 +9,13 @@ import asyncio
 import functools
 import inspect
 
+from . import cancellation
 from . import connection
 from . import connect_utils
 from . import exceptions
+from . import listener
+from . import timerwheel
+from . import transaction
 
 
 class PoolConnectionProxyMeta(type):
@@ -135,7 +139,14 @@ class PoolConnectionHolder:
                 timeout=self._pool._working_params.connect_timeout,
                 config=self._pool._working_config,
                 params=self._pool._working_params,
-                connection_class=self._pool._connection_class)
+                connection_class=self._pool._connection_class,
+                preloaded_types=self._pool._working_types)
+
+        if (self._pool._share_preloaded_types and
+                self._pool._working_types is None):
+            self._pool._working_types = con._preloaded_types
+
+        con._cancel_dispatcher = self._pool._cancel_dispatcher
 
         if self._init is not None:
             await self._init(con)
@@ -257,7 +268,9 @@ class Pool:
     __slots__ = ('_queue', '_loop', '_minsize', '_maxsize',
                  '_working_addr', '_working_config', '_working_params',
                  '_holders', '_initialized', '_closed',
-                 '_connection_class')
+                 '_connection_class', '_xact_counters',
+                 '_share_preloaded_types', '_working_types', '_listener',
+                 '_cancel_dispatcher')
 
     def __init__(self, *connect_args,
                  min_size,
@@ -268,6 +281,8 @@ class Pool:
                  init,
                  loop,
                  connection_class,
+                 share_preloaded_types=False,
+                 max_concurrent_cancels=cancellation.MAX_CONCURRENT_CANCELS,
                  **connect_kwargs):
 
         if loop is None:
@@ -292,6 +307,10 @@ class Pool:
                 'max_inactive_connection_lifetime is expected to be greater '
                 'or equal to zero')
 
+        if max_concurrent_cancels <= 0:
+            raise ValueError(
+                'max_concurrent_cancels is expected to be greater than zero')
+
         self._minsize = min_size
         self._maxsize = max_size
 
@@ -302,8 +321,14 @@ class Pool:
         self._working_addr = None
         self._working_config = None
         self._working_params = None
+        self._working_types = None
+        self._share_preloaded_types = share_preloaded_types
 
         self._connection_class = connection_class
+        self._xact_counters = transaction._TransactionCounters()
+        self._listener = None
+        self._cancel_dispatcher = cancellation._CancelDispatcher(
+            loop, max_concurrent=max_concurrent_cancels)
 
         self._closed = False
 
@@ -363,7 +388,8 @@ class Pool:
         async with self.acquire() as con:
             return await con.execute(query, *args, timeout=timeout)
 
-    async def executemany(self, command: str, args, *, timeout: float=None):
+    async def executemany(self, command: str, args, *, timeout: float=None,
+                          use_copy: bool=False):
         """Execute an SQL *command* for each sequence of arguments in *args*.
 
         Pool performs this operation using one of its connections.  Other than
@@ -371,21 +397,45 @@ class Pool:
         :meth:`Connection.executemany() <connection.Connection.executemany>`.
 
         .. versionadded:: 0.10.0
+
+        .. versionchanged:: 0.13.0
+           Added the *use_copy* parameter.
         """
         async with self.acquire() as con:
-            return await con.executemany(command, args, timeout=timeout)
+            return await con.executemany(command, args, timeout=timeout,
+                                         use_copy=use_copy)
 
-    async def fetch(self, query, *args, timeout=None) -> list:
+    async def fetch(self, query, *args, timeout=None,
+                    max_result_rows=None, max_result_size=None,
+                    raw_timestamps=False, row_factory=None,
+                    cache=None) -> list:
         """Run a query and return the results as a list of :class:`Record`.
 
         Pool performs this operation using one of its connections.  Other than
         that, it behaves identically to
         :meth:`Connection.fetch() <connection.Connection.fetch>`.
+        Results found in *cache* are returned without acquiring
+        a connection.
 
         .. versionadded:: 0.10.0
         """
+        if cache is not None:
+            key = connection._check_result_cache(cache, self)._make_key(
+                query, args,
+                (max_result_rows, max_result_size,
+                 raw_timestamps, row_factory))
+            if key is not None:
+                result = cache._get(key)
+                if result is not None:
+                    return result
+
         async with self.acquire() as con:
-            return await con.fetch(query, *args, timeout=timeout)
+            return await con.fetch(query, *args, timeout=timeout,
+                                   max_result_rows=max_result_rows,
+                                   max_result_size=max_result_size,
+                                   raw_timestamps=raw_timestamps,
+                                   row_factory=row_factory,
+                                   cache=cache)
 
     async def fetchval(self, query, *args, column=0, timeout=None):
         """Run a query and return a value in the first row.
@@ -400,7 +450,7 @@ class Pool:
             return await con.fetchval(
                 query, *args, column=column, timeout=timeout)
 
-    async def fetchrow(self, query, *args, timeout=None):
+    async def fetchrow(self, query, *args, timeout=None, row_factory=None):
         """Run a query and return the first row.
 
         Pool performs this operation using one of its connections.  Other than
@@ -410,7 +460,92 @@ class Pool:
         .. versionadded:: 0.10.0
         """
         async with self.acquire() as con:
-            return await con.fetchrow(query, *args, timeout=timeout)
+            return await con.fetchrow(query, *args, timeout=timeout,
+                                      row_factory=row_factory)
+
+    async def run_transaction(self, fn, *args, isolation='read_committed',
+                              readonly=False, deferrable=False, retries=5,
+                              backoff=0.01, max_backoff=1.0):
+        """Run ``fn(connection, *args)`` in a transaction, retrying it
+        on serialization failures and deadlocks.
+
+        Pool performs each attempt using one of its connections, which is
+        released back to the pool before waiting to retry.  Other than
+        that, it behaves identically to
+        :meth:`Connection.run_transaction()
+        <connection.Connection.run_transaction>`.
+
+        .. versionadded:: 0.13.0
+        """
+        async def attempt():
+            async with self.acquire() as con:
+                async with con.transaction(isolation=isolation,
+                                           readonly=readonly,
+                                           deferrable=deferrable, lazy=True):
+                    return await fn(con, *args)
+
+        return await transaction._run_with_retries(
+            attempt, retries=retries, backoff=backoff,
+            max_backoff=max_backoff, counters=self._xact_counters,
+            loop=self._loop)
+
+    def get_transaction_stats(self):
+        """Return the statistics of :meth:`run_transaction` calls.
+
+        .. versionadded:: 0.13.0
+        """
+        return self._xact_counters.get_stats()
+
+    def get_cancel_stats(self):
+        """Return the statistics of query cancellation requests made
+        by the connections of the pool.
+
+        See :meth:`Connection.get_cancel_stats()
+        <connection.Connection.get_cancel_stats>`.
+
+        .. versionadded:: 0.13.0
+        """
+        return self._cancel_dispatcher.get_stats()
+
+    async def listen(self, channel, *, max_size=1000):
+        """Subscribe to the notifications of *channel*.
+
+        All subscriptions of the pool share a single connection, which is
+        opened on first use and is not one of the pool connections.  The
+        connection is reestablished if lost, and channels are listened on
+        again; notifications sent while it was down are lost.
+
+        :param str channel: Channel to listen on.
+        :param int max_size: The maximum number of notifications buffered
+                             by the subscription, older notifications are
+                             dropped when it is reached.
+        :return: A :class:`~asyncpg.listener.Subscription` instance.
+
+        .. code-block:: python
+
+            sub = await pool.listen('events')
+            try:
+                async for notification in sub:
+                    print(notification.payload)
+            finally:
+                await sub.close()
+
+        Use :meth:`Subscription.get_batch()
+        <asyncpg.listener.Subscription.get_batch>` to receive all pending
+        notifications at once.
+
+        .. versionadded:: 0.13.0
+        """
+        if (isinstance(max_size, bool) or not isinstance(max_size, int) or
+                max_size <= 0):
+            raise ValueError(
+                'invalid max_size value: expected an int greater '
+                'than 0 (got {!r})'.format(max_size))
+
+        self._check_init()
+        if self._listener is None:
+            self._listener = listener._PoolListener(self)
+        return await self._listener.subscribe(channel, max_size)
 
     def acquire(self, *, timeout=None):
         """Acquire a database connection from the pool.
@@ -452,8 +587,8 @@ class Pool:
         if timeout is None:
             return await _acquire_impl()
         else:
-            return await asyncio.wait_for(
-                _acquire_impl(), timeout=timeout, loop=self._loop)
+            with timerwheel.timeout(timeout, loop=self._loop):
+                return await _acquire_impl()
 
     async def release(self, connection):
         """Release a database connection back to the pool."""
@@ -491,6 +626,8 @@ class Pool:
         self._check_init()
         self._closed = True
         coros = [ch.close() for ch in self._holders]
+        if self._listener is not None:
+            coros.append(self._listener.close())
         await asyncio.gather(*coros, loop=self._loop)
 
     def terminate(self):
@@ -501,6 +638,8 @@ class Pool:
         self._closed = True
         for ch in self._holders:
             ch.terminate()
+        if self._listener is not None:
+            self._listener.terminate()
 
     def _check_init(self):
         if not self._initialized:
@@ -509,6 +648,10 @@ class Pool:
             raise exceptions.InterfaceError('pool is closed')
 
     def _drop_statement_cache(self):
+        # The schema has changed, new connections will introspect
+        # the preloaded types again.
+        self._working_types = None
+
         # Drop statement cache for all connections in the pool.
         for ch in self._holders:
             if ch._con is not None:
@@ -561,6 +704,8 @@ def create_pool(dsn=None, *,
                 init=None,
                 loop=None,
                 connection_class=connection.Connection,
+                share_preloaded_types=False,
+                max_concurrent_cancels=cancellation.MAX_CONCURRENT_CANCELS,
                 **connect_kwargs):
     r"""Create a connection pool.
 
@@ -625,11 +770,29 @@ def create_pool(dsn=None, *,
         An asyncio event loop instance.  If ``None``, the default
         event loop will be used.
 
+    :param bool share_preloaded_types:
+        If ``True``, the types listed in the *preload_types* argument
+        of :func:`~asyncpg.connection.connect` are introspected by the
+        first connection only, and new connections reuse the result
+        instead of running the introspection queries.  Use only if the
+        preloaded types are not altered while the pool is in use.
+
+    :param int max_concurrent_cancels:
+        The maximum number of query cancellation requests sent to the
+        server at once by the connections of the pool.  Each request
+        needs a connection of its own, so when many queries time out at
+        once, further requests wait for their turn, and requests for the
+        same server process are merged.
+
     :return: An instance of :class:`~asyncpg.pool.Pool`.
 
     .. versionchanged:: 0.10.0
        An :exc:`~asyncpg.exceptions.InterfaceError` will be raised on any
        attempted operation on a released connection.
+
+    .. versionadded:: 0.13.0
+       Added the *share_preloaded_types* and *max_concurrent_cancels*
+       parameters.
     """
     if not issubclass(connection_class, connection.Connection):
         raise TypeError(
@@ -642,4 +805,6 @@ def create_pool(dsn=None, *,
         min_size=min_size, max_size=max_size,
         max_queries=max_queries, loop=loop, setup=setup, init=init,
         max_inactive_connection_lifetime=max_inactive_connection_lifetime,
+        share_preloaded_types=share_preloaded_types,
+        max_concurrent_cancels=max_concurrent_cancels,
         **connect_kwargs)
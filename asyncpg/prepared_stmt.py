@@ -88,21 +88,29 @@ class PreparedStatement:
         self._check_open()
         return self._state._get_attributes()
 
-    def cursor(self, *args, prefetch=None,
-               timeout=None) -> cursor.CursorFactory:
+    def cursor(self, *args, prefetch=None, timeout=None,
+               prefetch_ahead=False) -> cursor.CursorFactory:
         """Return a *cursor factory* for the prepared statement.
 
         :param args: Query arguments.
         :param int prefetch: The number of rows the *cursor iterator*
                              will prefetch (defaults to ``50``.)
         :param float timeout: Optional timeout in seconds.
+        :param bool prefetch_ahead:
+            If ``True``, the *cursor iterator* will request the next
+            batch of rows while the current one is being consumed.
+            See :meth:`Connection.cursor() <connection.Connection.cursor>`
+            for details.
 
         :return: A :class:`~cursor.CursorFactory` object.
+
+        .. versionchanged:: 0.13.0
+           Added the *prefetch_ahead* parameter.
         """
         self._check_open()
         return cursor.CursorFactory(self._connection, self._query,
                                     self._state, args, prefetch,
-                                    timeout)
+                                    timeout, prefetch_ahead)
 
     async def explain(self, *args, analyze=False):
         """Return the execution plan of the statement.
@@ -145,16 +153,35 @@ class PreparedStatement:
 
         return json.loads(data)
 
-    async def fetch(self, *args, timeout=None):
+    async def fetch(self, *args, timeout=None,
+                    max_result_rows=None, max_result_size=None,
+                    raw_timestamps=False, row_factory=None):
         r"""Execute the statement and return a list of :class:`Record` objects.
 
         :param str query: Query text
         :param args: Query arguments
         :param float timeout: Optional timeout value in seconds.
-
-        :return: A list of :class:`Record` instances.
+        :param int max_result_rows: Optional limit on the number of rows.
+        :param int max_result_size: Optional limit on the result size
+                                    in bytes.
+        :param bool raw_timestamps: Return dates and timestamps as
+                                    microseconds since the Unix epoch.
+                                    See :meth:`Connection.fetch()
+                                    <asyncpg.connection.Connection.fetch>`.
+        :param type row_factory: The type of the returned rows, see
+                                 :meth:`Connection.fetch()
+                                 <asyncpg.connection.Connection.fetch>`.
+
+        :return: A list of :class:`Record` instances, or instances
+                 of *row_factory*.
+
+        .. versionchanged:: 0.13.0
+           Added *max_result_rows*, *max_result_size*, *raw_timestamps*
+           and *row_factory* parameters.
         """
-        data = await self.__bind_execute(args, 0, timeout)
+        data = await self.__bind_execute(args, 0, timeout,
+                                         max_result_rows, max_result_size,
+                                         raw_timestamps, row_factory)
         return data
 
     async def fetchval(self, *args, column=0, timeout=None):
@@ -175,25 +202,36 @@ class PreparedStatement:
             return None
         return data[0][column]
 
-    async def fetchrow(self, *args, timeout=None):
+    async def fetchrow(self, *args, timeout=None, row_factory=None):
         """Execute the statement and return the first row.
 
         :param str query: Query text
         :param args: Query arguments
         :param float timeout: Optional timeout value in seconds.
+        :param type row_factory: The type of the returned row, see
+                                 :meth:`Connection.fetch()
+                                 <asyncpg.connection.Connection.fetch>`.
 
-        :return: The first row as a :class:`Record` instance.
+        :return: The first row as a :class:`Record` instance, or an
+                 instance of *row_factory*.
+
+        .. versionchanged:: 0.13.0
+           Added *row_factory* parameter.
         """
-        data = await self.__bind_execute(args, 1, timeout)
+        data = await self.__bind_execute(args, 1, timeout,
+                                         row_factory=row_factory)
         if not data:
             return None
         return data[0]
 
-    async def __bind_execute(self, args, limit, timeout):
+    async def __bind_execute(self, args, limit, timeout,
+                             max_rows=None, max_size=None,
+                             raw_timestamps=False, row_factory=None):
         self._check_open()
         protocol = self._connection._protocol
         data, status, _ = await protocol.bind_execute(
-            self._state, args, '', limit, True, timeout)
+            self._state, args, '', limit, True, timeout, max_rows, max_size,
+            raw_timestamps, row_factory)
         self._last_status = status
         return data
 
@@ -5,7 +5,9 @@
 # the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
 
 
+from array import array as _Array
 from collections.abc import Container as ContainerABC
+from collections.abc import Mapping as MappingABC
 
 
 DEF ARRAY_MAXDIM = 6  # defined in postgresql/src/includes/c.h
@@ -35,8 +37,11 @@ cdef inline _is_container(object obj):
 
 
 cdef inline _is_sub_array(object obj):
+    # Tuples are records and mappings are element values (e.g. the
+    # documents of a json[] with a custom encoder), not sub-arrays.
     return not _is_trivial_container(obj) and isinstance(obj, ContainerABC) \
-            and not cpython.PyTuple_Check(obj)
+            and not cpython.PyTuple_Check(obj) \
+            and not isinstance(obj, MappingABC)
 
 
 cdef _get_array_shape(object obj, int32_t *dims, int32_t *ndims):
@@ -140,6 +145,153 @@ cdef inline array_encode(ConnectionSettings settings, WriteBuffer buf,
     buf.write_buffer(elem_data)
 
 
+cdef inline bint _is_host_little_endian():
+    cdef uint32_t one = 1
+    return (<char*>&one)[0] == 1
+
+
+cdef inline str _typed_array_typecode(uint32_t elem_oid):
+    # array.array type codes of the element types supported
+    # by the buffer fast paths.
+    if elem_oid == INT4OID:
+        return 'i'
+    elif elem_oid == INT8OID:
+        return 'q'
+    elif elem_oid == FLOAT4OID:
+        return 'f'
+    elif elem_oid == FLOAT8OID:
+        return 'd'
+    else:
+        return None
+
+
+cdef bint _buffer_format_matches(const char *fmt, ssize_t itemsize,
+                                 uint32_t elem_oid):
+    cdef:
+        char order = b'@'
+        char code
+
+    if fmt == NULL:
+        # Unsigned bytes
+        return False
+
+    if fmt[0] in b'@=<>!':
+        order = fmt[0]
+        fmt += 1
+
+    code = fmt[0]
+    if code == 0 or fmt[1] != 0:
+        return False
+
+    # Only data in the native byte order is accepted.
+    if order == b'<' or order == b'>' or order == b'!':
+        if (order == b'<') != _is_host_little_endian():
+            return False
+
+    if elem_oid == INT4OID or elem_oid == INT8OID:
+        return (code in b'bhilqn' and
+                itemsize == (4 if elem_oid == INT4OID else 8))
+    elif elem_oid == FLOAT4OID:
+        return code == b'f' and itemsize == 4
+    elif elem_oid == FLOAT8OID:
+        return code == b'd' and itemsize == 8
+    else:
+        return False
+
+
+cdef bint buffer_array_encode(WriteBuffer buf, object obj,
+                              uint32_t elem_oid) except -1:
+    """Encode a contiguous buffer of int4, int8, float4 or float8 values.
+
+    Return ``False`` if *obj* cannot be encoded this way and the
+    regular element-wise encoder must be used instead.
+    """
+    cdef:
+        Py_buffer pybuf
+        ssize_t itemsize
+        ssize_t count
+        ssize_t datalen
+        ssize_t i
+        int32_t ndims
+        const char *src
+        char *dst
+        uint32_t v32
+        uint64_t v64
+
+    if (not cpython.PyObject_CheckBuffer(obj) or
+            cpython.PyBytes_Check(obj) or PyByteArray_Check(obj)):
+        return False
+
+    try:
+        cpython.PyObject_GetBuffer(
+            obj, &pybuf, cpython.PyBUF_C_CONTIGUOUS | cpython.PyBUF_FORMAT)
+    except BufferError:
+        return False
+
+    try:
+        itemsize = pybuf.itemsize
+        ndims = pybuf.ndim
+        if (ndims < 1 or ndims > ARRAY_MAXDIM or
+                not _buffer_format_matches(pybuf.format, itemsize,
+                                           elem_oid)):
+            return False
+
+        count = pybuf.len // itemsize
+        if count > _MAXINT32:
+            raise ValueError('too many elements in array value')
+
+        # The datum length, including the header and the per-element
+        # length words, must fit into the int32 length prefix.
+        datalen = count * (4 + itemsize)
+        if datalen > _MAXINT32 - 12 - 8 * ndims:
+            raise ValueError('array value is too large')
+
+        if count == 0:
+            # Empty array
+            buf.write_int32(12)
+            buf.write_int32(0)
+            buf.write_int32(0)
+            buf.write_int32(<int32_t>elem_oid)
+            return True
+
+        buf.write_int32(12 + 8 * ndims + <int32_t>datalen)
+        # Number of dimensions
+        buf.write_int32(ndims)
+        # flags
+        buf.write_int32(0)
+        # element type
+        buf.write_int32(<int32_t>elem_oid)
+        # upper / lower bounds
+        for i in range(ndims):
+            buf.write_int32(<int32_t>pybuf.shape[i])
+            buf.write_int32(1)
+
+        # Element data: length-prefixed values in network byte order.
+        buf._ensure_alloced(datalen)
+        dst = buf._buf + buf._length
+        src = <const char*>pybuf.buf
+
+        if itemsize == 4:
+            for i in range(count):
+                hton.pack_int32(dst, 4)
+                memcpy(&v32, src, 4)
+                hton.pack_int32(dst + 4, <int32_t>v32)
+                dst += 8
+                src += 4
+        else:
+            for i in range(count):
+                hton.pack_int32(dst, 8)
+                memcpy(&v64, src, 8)
+                hton.pack_int64(dst + 4, <int64_t>v64)
+                dst += 12
+                src += 8
+
+        buf._length += datalen
+        return True
+    finally:
+        cpython.PyBuffer_Release(&pybuf)
+
+
 cdef _write_textarray_data(ConnectionSettings settings, object obj,
                            int32_t ndims, int32_t dim, WriteBuffer array_data,
                            encode_func_ex encoder, const void *encoder_arg,
@@ -313,6 +465,76 @@ cdef inline array_decode(ConnectionSettings settings, FastReadBuffer buf,
     return result
 
 
+cdef typed_array_decode(FastReadBuffer buf, uint32_t elem_oid):
+    """Decode an int4, int8, float4 or float8 array into array.array.
+
+    Multidimensional arrays are returned as a memoryview of the
+    corresponding shape.
+    """
+    cdef:
+        int32_t ndims = hton.unpack_int32(buf.read(4))
+        int32_t flags = hton.unpack_int32(buf.read(4))
+        str typecode = _typed_array_typecode(elem_oid)
+        ssize_t itemsize = 8 if elem_oid in (INT8OID, FLOAT8OID) else 4
+        ssize_t count = 1
+        ssize_t i
+        int32_t elem_len
+        list shape
+        bytes data
+        char *dst
+        const char *src
+        uint32_t v32
+        uint64_t v64
+
+    # Skip the element type
+    buf.read(4)
+
+    if ndims == 0:
+        return _Array(typecode)
+
+    if ndims > ARRAY_MAXDIM:
+        raise RuntimeError(
+            'number of array dimensions ({}) exceed the maximum expected ({})'.
+            format(ndims, ARRAY_MAXDIM))
+
+    if flags & 1:
+        raise ValueError(
+            'cannot decode an array containing NULL elements into a '
+            'typed array')
+
+    shape = []
+    for i in range(ndims):
+        shape.append(hton.unpack_int32(buf.read(4)))
+        count *= shape[i]
+        # Ignore the lower bound information
+        buf.read(4)
+
+    data = cpython.PyBytes_FromStringAndSize(NULL, count * itemsize)
+    dst = cpython.PyBytes_AS_STRING(data)
+
+    for i in range(count):
+        elem_len = hton.unpack_int32(buf.read(4))
+        if elem_len != itemsize:
+            raise ValueError(
+                'unexpected array element length: {}'.format(elem_len))
+        src = buf.read(itemsize)
+        if itemsize == 4:
+            v32 = <uint32_t>hton.unpack_int32(src)
+            memcpy(dst, &v32, 4)
+        else:
+            v64 = <uint64_t>hton.unpack_int64(src)
+            memcpy(dst, &v64, 8)
+        dst += itemsize
+
+    result = _Array(typecode)
+    result.frombytes(data)
+
+    if ndims > 1:
+        result = memoryview(result).cast('B').cast(typecode, shape)
+
+    return result
+
+
 cdef _nested_array_decode(ConnectionSettings settings,
                           FastReadBuffer buf,
                           decode_func_ex decoder,
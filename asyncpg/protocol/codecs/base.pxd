@@ -59,6 +59,8 @@ cdef class Codec:
 
         object          py_encoder
         object          py_decoder
+        # Python codec invoked with lists of values
+        bint            py_batch
 
         # arrays
         Codec           element_codec
@@ -100,6 +102,12 @@ cdef class Codec:
     cdef encode_in_python(self, ConnectionSettings settings, WriteBuffer buf,
                           object obj)
 
+    cdef encode_in_python_batch(self, ConnectionSettings settings,
+                                WriteBuffer buf, object obj)
+
+    cdef encode_py_exchange(self, ConnectionSettings settings, WriteBuffer buf,
+                            object data)
+
     cdef decode_scalar(self, ConnectionSettings settings, FastReadBuffer buf)
 
     cdef decode_array(self, ConnectionSettings settings, FastReadBuffer buf)
@@ -115,6 +123,12 @@ cdef class Codec:
     cdef decode_in_python(self, ConnectionSettings settings,
                           FastReadBuffer buf)
 
+    cdef decode_in_python_batch(self, ConnectionSettings settings,
+                                FastReadBuffer buf)
+
+    cdef decode_py_exchange(self, ConnectionSettings settings,
+                            FastReadBuffer buf)
+
     cdef inline encode(self,
                        ConnectionSettings settings,
                        WriteBuffer buf,
@@ -162,7 +176,8 @@ cdef class Codec:
                                 encode_func c_encoder,
                                 decode_func c_decoder,
                                 ServerDataFormat format,
-                                ClientExchangeFormat xformat)
+                                ClientExchangeFormat xformat,
+                                bint batch)
 
 
 cdef class DataCodecConfig:
@@ -172,3 +187,10 @@ cdef class DataCodecConfig:
 
     cdef inline Codec get_codec(self, uint32_t oid, ServerDataFormat format)
     cdef inline Codec get_local_codec(self, uint32_t oid)
+
+
+cdef class TextInternCache:
+    cdef:
+        list entries
+
+    cdef decode(self, ConnectionSettings settings, FastReadBuffer buf)
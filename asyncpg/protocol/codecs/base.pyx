@@ -73,8 +73,12 @@ cdef class Codec:
             self.encoder = <codec_encode_func>&self.encode_composite
             self.decoder = <codec_decode_func>&self.decode_composite
         elif type == CODEC_PY:
-            self.encoder = <codec_encode_func>&self.encode_in_python
-            self.decoder = <codec_decode_func>&self.decode_in_python
+            if self.py_batch:
+                self.encoder = <codec_encode_func>&self.encode_in_python_batch
+                self.decoder = <codec_decode_func>&self.decode_in_python_batch
+            else:
+                self.encoder = <codec_encode_func>&self.encode_in_python
+                self.decoder = <codec_decode_func>&self.decode_in_python
         else:
             raise RuntimeError('unexpected codec type: {}'.format(type))
 
@@ -82,6 +86,7 @@ cdef class Codec:
         cdef Codec codec
 
         codec = Codec(self.oid)
+        codec.py_batch = self.py_batch
         codec.init(self.name, self.schema, self.kind,
                    self.type, self.format, self.xformat,
                    self.c_encoder, self.c_decoder,
@@ -98,6 +103,11 @@ cdef class Codec:
 
     cdef encode_array(self, ConnectionSettings settings, WriteBuffer buf,
                       object obj):
+        if (self.element_codec.type == CODEC_C and
+                _typed_array_typecode(self.element_codec.oid) is not None and
+                buffer_array_encode(buf, obj, self.element_codec.oid)):
+            return
+
         array_encode(settings, buf, obj, self.element_codec.oid,
                      codec_encode_func_ex,
                      <void*>(<cpython.PyObject>self.element_codec))
@@ -142,6 +152,17 @@ cdef class Codec:
     cdef encode_in_python(self, ConnectionSettings settings, WriteBuffer buf,
                           object obj):
         data = self.py_encoder(obj)
+        self.encode_py_exchange(settings, buf, data)
+
+    cdef encode_in_python_batch(self, ConnectionSettings settings,
+                                WriteBuffer buf, object obj):
+        # A lone value, e.g. a query argument: call the batch
+        # encoder with a single-item list.
+        data = _check_batch_codec_result(self, self.py_encoder([obj]), 1)
+        self.encode_py_exchange(settings, buf, data[0])
+
+    cdef encode_py_exchange(self, ConnectionSettings settings, WriteBuffer buf,
+                            object data):
         if self.xformat == PG_XFORMAT_OBJECT:
             if self.format == PG_FORMAT_BINARY:
                 bytea_encode(settings, buf, data)
@@ -164,6 +185,10 @@ cdef class Codec:
         return self.c_decoder(settings, buf)
 
     cdef decode_array(self, ConnectionSettings settings, FastReadBuffer buf):
+        if (self.element_codec.type == CODEC_C and
+                settings.is_typed_array_decoding(self.element_codec.oid)):
+            return typed_array_decode(buf, self.element_codec.oid)
+
         return array_decode(settings, buf, codec_decode_func_ex,
                             <void*>(<cpython.PyObject>self.element_codec))
 
@@ -221,6 +246,15 @@ cdef class Codec:
 
     cdef decode_in_python(self, ConnectionSettings settings,
                           FastReadBuffer buf):
+        return self.py_decoder(self.decode_py_exchange(settings, buf))
+
+    cdef decode_in_python_batch(self, ConnectionSettings settings,
+                                FastReadBuffer buf):
+        data = self.decode_py_exchange(settings, buf)
+        return _check_batch_codec_result(self, self.py_decoder([data]), 1)[0]
+
+    cdef decode_py_exchange(self, ConnectionSettings settings,
+                            FastReadBuffer buf):
         if self.xformat == PG_XFORMAT_OBJECT:
             if self.format == PG_FORMAT_BINARY:
                 data = bytea_decode(settings, buf)
@@ -235,7 +269,7 @@ cdef class Codec:
             raise RuntimeError(
                 'unexpected exchange format: {}'.format(self.xformat))
 
-        return self.py_decoder(data)
+        return data
 
     cdef inline decode(self, ConnectionSettings settings, FastReadBuffer buf):
         return self.decoder(self, settings, buf)
@@ -335,15 +369,31 @@ cdef class Codec:
                                 encode_func c_encoder,
                                 decode_func c_decoder,
                                 ServerDataFormat format,
-                                ClientExchangeFormat xformat):
+                                ClientExchangeFormat xformat,
+                                bint batch):
         cdef Codec codec
         codec = Codec(oid)
+        codec.py_batch = batch
         codec.init(name, schema, kind, CODEC_PY, format, xformat,
                    c_encoder, c_decoder, encoder, decoder,
                    None, None, None, None, 0)
         return codec
 
 
+cdef list _check_batch_codec_result(Codec codec, object result,
+                                    ssize_t expected):
+    if type(result) is not list:
+        result = list(result)
+
+    if len(<list>result) != expected:
+        raise ValueError(
+            'batch codec for type "{}"."{}" returned {} values, '
+            'expected {}'.format(codec.schema, codec.name,
+                                 len(<list>result), expected))
+
+    return <list>result
+
+
 # Encode callback for arrays
 cdef codec_encode_func_ex(ConnectionSettings settings, WriteBuffer buf,
                           object obj, const void *arg):
@@ -501,7 +551,7 @@ cdef class DataCodecConfig:
                 self.declare_fallback_codec(oid, name, schema)
 
     def add_python_codec(self, typeoid, typename, typeschema, typekind,
-                         encoder, decoder, format, xformat):
+                         encoder, decoder, format, xformat, batch=False):
         cdef:
             Codec core_codec
             encode_func c_encoder = NULL
@@ -523,7 +573,7 @@ cdef class DataCodecConfig:
         self._local_type_codecs[typeoid] = \
             Codec.new_python_codec(typeoid, typename, typeschema, typekind,
                                    encoder, decoder, c_encoder, c_decoder,
-                                   format, xformat)
+                                   format, xformat, batch)
 
     def remove_python_codec(self, typeoid, typename, typeschema):
         self._local_type_codecs.pop(typeoid, None)
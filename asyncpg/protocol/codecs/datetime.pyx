@@ -392,6 +392,64 @@ cdef interval_decode_tuple(ConnectionSettings settings, FastReadBuffer buf):
     return (months, days, microseconds)
 
 
+# Offsets between the PostgreSQL and the Unix epoch.
+DEF _PG_EPOCH_UNIX_US = 946684800000000
+DEF _PG_EPOCH_UNIX_DAYS = 10957
+DEF _DAY_US = 86400000000
+
+
+cdef timestamp_decode_epoch_us(ConnectionSettings settings,
+                               FastReadBuffer buf):
+    cdef:
+        int64_t ts = hton.unpack_int64(buf.read(8))
+
+    if ts == pg_time64_infinity or ts == pg_time64_negative_infinity:
+        return ts
+    elif ts > pg_time64_infinity - _PG_EPOCH_UNIX_US:
+        # Timestamps near the upper bound of the PostgreSQL range do not
+        # fit into int64 once shifted to the Unix epoch.
+        return <object>ts + _PG_EPOCH_UNIX_US
+    else:
+        return ts + _PG_EPOCH_UNIX_US
+
+
+cdef date_decode_epoch_us(ConnectionSettings settings, FastReadBuffer buf):
+    cdef int32_t pg_ordinal = hton.unpack_int32(buf.read(4))
+
+    if pg_ordinal == pg_date_infinity:
+        return pg_time64_infinity
+    elif pg_ordinal == pg_date_negative_infinity:
+        return pg_time64_negative_infinity
+    else:
+        return (<int64_t>pg_ordinal + _PG_EPOCH_UNIX_DAYS) * _DAY_US
+
+
+cdef Codec _new_epoch_us_codec(Codec codec, decode_func decode):
+    cdef Codec raw = Codec(codec.oid)
+    raw.init(codec.name, codec.schema, codec.kind, CODEC_C,
+             PG_FORMAT_BINARY, PG_XFORMAT_OBJECT,
+             NULL, decode, None, None, None, None, None, None, 0)
+    return raw
+
+
+cdef Codec get_epoch_us_codec(Codec codec):
+    # Return a codec decoding the values of *codec* into microseconds
+    # since the Unix epoch, or None if *codec* is not a builtin date
+    # or timestamp codec.
+    if codec.type != CODEC_C or codec.format != PG_FORMAT_BINARY:
+        return None
+
+    if (codec.c_decoder == <decode_func>&timestamp_decode or
+            codec.c_decoder == <decode_func>&timestamptz_decode):
+        return _new_epoch_us_codec(
+            codec, <decode_func>&timestamp_decode_epoch_us)
+    elif codec.c_decoder == <decode_func>&date_decode:
+        return _new_epoch_us_codec(
+            codec, <decode_func>&date_decode_epoch_us)
+    else:
+        return None
+
+
 cdef init_datetime_codecs():
     register_core_codec(DATEOID,
                         <encode_func>&date_encode,
@@ -5,12 +5,62 @@
 # the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
 
 
+cdef inline _json_serialize(ConnectionSettings settings, obj):
+    # Return the JSON document for *obj* as str or as bytes
+    # in the client encoding.
+    if settings._json_raw_bytes and cpython.PyBytes_CheckExact(obj):
+        return obj
+    elif settings._json_encoder is not None:
+        return settings._json_encoder(obj)
+    elif cpython.PyUnicode_Check(obj):
+        return obj
+    else:
+        # Without an encoder only str documents are accepted; bytes
+        # are sent as is only with raw_bytes.
+        raise TypeError('expected str, got {}'.format(type(obj).__name__))
+
+
+cdef inline _json_parse(ConnectionSettings settings, FastReadBuffer buf):
+    cdef ssize_t buf_len
+
+    if settings._json_decoder is None:
+        return text_decode(settings, buf)
+
+    if settings.is_encoding_utf8():
+        # Hand the raw document to the parser, skipping
+        # the intermediate str object.
+        buf_len = buf.len
+        data = cpython.PyBytes_FromStringAndSize(buf.read_all(), buf_len)
+    else:
+        data = text_decode(settings, buf)
+
+    return settings._json_decoder(data)
+
+
+cdef json_encode(ConnectionSettings settings, WriteBuffer buf, obj):
+    data = _json_serialize(settings, obj)
+
+    if cpython.PyBytes_CheckExact(data):
+        bytea_encode(settings, buf, data)
+    else:
+        text_encode(settings, buf, data)
+
+
+cdef json_decode(ConnectionSettings settings, FastReadBuffer buf):
+    return _json_parse(settings, buf)
+
+
 cdef jsonb_encode(ConnectionSettings settings, WriteBuffer buf, obj):
     cdef:
         char *str
         ssize_t size
 
-    as_pg_string_and_size(settings, obj, &str, &size)
+    data = _json_serialize(settings, obj)
+
+    if cpython.PyBytes_CheckExact(data):
+        cpython.PyBytes_AsStringAndSize(data, &str, &size)
+    else:
+        as_pg_string_and_size(settings, data, &str, &size)
 
     if size > 0x7fffffff - 1:
         raise ValueError('string too long')
@@ -26,13 +76,13 @@ cdef jsonb_decode(ConnectionSettings settings, FastReadBuffer buf):
     if format != 1:
         raise ValueError('unexpected JSONB format: {}'.format(format))
 
-    return text_decode(settings, buf)
+    return _json_parse(settings, buf)
 
 
 cdef init_json_codecs():
     register_core_codec(JSONOID,
-                        <encode_func>&text_encode,
-                        <decode_func>&text_decode,
+                        <encode_func>&json_encode,
+                        <decode_func>&json_decode,
                         PG_FORMAT_BINARY)
     register_core_codec(JSONBOID,
                         <encode_func>&jsonb_encode,
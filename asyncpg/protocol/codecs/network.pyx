@@ -16,6 +16,14 @@ DEF PGSQL_AF_INET6 = 3  # AF_INET + 1
 
 _ipaddr = ipaddress.ip_address
 _ipnet = ipaddress.ip_network
+_IPv4Address = ipaddress.IPv4Address
+_IPv6Address = ipaddress.IPv6Address
+_IPv4Network = ipaddress.IPv4Network
+_IPv6Network = ipaddress.IPv6Network
+_IPInterfaceTypes = (ipaddress.IPv4Interface, ipaddress.IPv6Interface)
+_IPAddressTypes = (_IPv4Address, _IPv6Address)
+_IPNetworkTypes = (_IPv4Network, _IPv6Network)
+_int_from_bytes = int.from_bytes
 
 
 cdef inline _net_encode(WriteBuffer buf, int32_t version, uint8_t bits,
@@ -44,6 +52,8 @@ cdef net_decode(ConnectionSettings settings, FastReadBuffer buf):
         uint32_t is_cidr = <uint32_t>buf.read(1)[0]
         uint32_t addrlen = <uint32_t>buf.read(1)[0]
         bytes addr
+        const char *addrbytes
+        uint32_t addr4
 
     if family != PGSQL_AF_INET and family != PGSQL_AF_INET6:
         raise ValueError('invalid address family in "{}" value'.format(
@@ -60,19 +70,40 @@ cdef net_decode(ConnectionSettings settings, FastReadBuffer buf):
             'cidr' if is_cidr else 'inet'
         ))
 
-    addr = cpython.PyBytes_FromStringAndSize(buf.read(addrlen), addrlen)
-
-    if is_cidr or bits > 0:
-        return _ipnet(addr).supernet(new_prefix=cpython.PyLong_FromLong(bits))
+    addrbytes = buf.read(addrlen)
+
+    # The objects are constructed from integers, which is much cheaper
+    # than parsing a string representation or using the generic
+    # ip_address() and ip_network() factories.
+    if family == PGSQL_AF_INET:
+        addr4 = <uint32_t>hton.unpack_int32(addrbytes)
+        if is_cidr or bits > 0:
+            # Clear the host bits.
+            if bits < 32:
+                addr4 &= ~(<uint32_t>0xffffffff >> bits)
+            return _IPv4Network((addr4, bits))
+        else:
+            return _IPv4Address(addr4)
     else:
-        return _ipaddr(addr)
+        addr = cpython.PyBytes_FromStringAndSize(addrbytes, addrlen)
+        if is_cidr or bits > 0:
+            addr_int = _int_from_bytes(addr, 'big')
+            # Clear the host bits.
+            addr_int = (addr_int >> (128 - bits)) << (128 - bits)
+            return _IPv6Network((addr_int, bits))
+        else:
+            return _IPv6Address(addr)
 
 
 cdef cidr_encode(ConnectionSettings settings, WriteBuffer buf, obj):
     cdef:
         object ipnet
 
-    ipnet = _ipnet(obj)
+    if isinstance(obj, _IPNetworkTypes):
+        ipnet = obj
+    else:
+        ipnet = _ipnet(obj)
+
     _net_encode(buf, ipnet.version, ipnet.prefixlen, 1,
                 ipnet.network_address.packed)
 
@@ -81,6 +112,18 @@ cdef inet_encode(ConnectionSettings settings, WriteBuffer buf, obj):
     cdef:
         object ipaddr
 
+    if isinstance(obj, _IPInterfaceTypes):
+        # Interfaces are address subclasses which carry a netmask.
+        _net_encode(buf, obj.version, obj.network.prefixlen, 0,
+                    obj.packed)
+        return
+    elif isinstance(obj, _IPAddressTypes):
+        _net_encode(buf, obj.version, 0, 0, obj.packed)
+        return
+    elif isinstance(obj, _IPNetworkTypes):
+        cidr_encode(settings, buf, obj)
+        return
+
     try:
         ipaddr = _ipaddr(obj)
     except ValueError:
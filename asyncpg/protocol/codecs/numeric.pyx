@@ -5,7 +5,7 @@
 # the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
 
 
-from libc.math cimport abs, log10
+from libc.math cimport abs, log10, NAN, INFINITY
 from libc.stdio cimport snprintf
 
 import decimal
@@ -21,13 +21,73 @@ DEF NUMERIC_NAN = 0xC000
 
 _Dec = decimal.Decimal
 
+# Powers of ten exactly representable as doubles and as int64.
+cdef double *_NUMERIC_POW10 = [
+    1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10, 1e11,
+    1e12, 1e13, 1e14, 1e15, 1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22]
+
+cdef int64_t *_NUMERIC_POW10_INT = [
+    1, 10, 100, 1000, 10000, 100000, 1000000, 10000000, 100000000,
+    1000000000, 10000000000, 100000000000, 1000000000000,
+    10000000000000, 100000000000000, 1000000000000000,
+    10000000000000000, 100000000000000000, 1000000000000000000]
+
+
+cdef _numeric_encode_prepare(ConnectionSettings settings, obj):
+    # Mirror the decoding format of the connection: floats are sent
+    # using their shortest representation, and integers are interpreted
+    # as scaled values.
+    if settings._numeric_format == NUMERIC_FORMAT_FLOAT:
+        if cpython.PyFloat_CheckExact(obj):
+            return _Dec(repr(obj))
+    elif settings._numeric_format == NUMERIC_FORMAT_INT:
+        if cpython.PyLong_CheckExact(obj):
+            dt = _Dec(obj).as_tuple()
+            return _Dec((dt.sign, dt.digits,
+                         dt.exponent - settings._numeric_scale))
+
+    return obj
+
+
+cdef _numeric_to_scaled_int(object mantissa, int64_t shift, bint negative,
+                            int32_t scale):
+    # Compute mantissa * 10^shift, which must be an integer.
+    if shift >= 0:
+        result = mantissa * 10 ** <object>shift
+    else:
+        result, remainder = divmod(mantissa, 10 ** <object>(-shift))
+        if remainder:
+            raise ValueError(
+                'numeric value cannot be represented as an integer '
+                'with scale {} without loss of precision'.format(scale))
+
+    return -result if negative else result
+
 
 cdef numeric_encode_text(ConnectionSettings settings, WriteBuffer buf, obj):
+    if settings._numeric_format != NUMERIC_FORMAT_DECIMAL:
+        obj = _numeric_encode_prepare(settings, obj)
+
     text_encode(settings, buf, str(obj))
 
 
 cdef numeric_decode_text(ConnectionSettings settings, FastReadBuffer buf):
-    return _Dec(text_decode(settings, buf))
+    if settings._numeric_format == NUMERIC_FORMAT_FLOAT:
+        return float(text_decode(settings, buf))
+
+    dec = _Dec(text_decode(settings, buf))
+
+    if settings._numeric_format == NUMERIC_FORMAT_INT:
+        dt = dec.as_tuple()
+        if not isinstance(dt.exponent, int):
+            raise ValueError(
+                'cannot decode numeric NaN into an integer')
+        return _numeric_to_scaled_int(
+            int(''.join(map(str, dt.digits))),
+            dt.exponent + settings._numeric_scale,
+            dt.sign, settings._numeric_scale)
+
+    return dec
 
 
 cdef numeric_encode_binary(ConnectionSettings settings, WriteBuffer buf, obj):
@@ -47,6 +107,9 @@ cdef numeric_encode_binary(ConnectionSettings settings, WriteBuffer buf, obj):
         uint16_t sign
         int64_t padding_size = 0
 
+    if settings._numeric_format != NUMERIC_FORMAT_DECIMAL:
+        obj = _numeric_encode_prepare(settings, obj)
+
     if isinstance(obj, _Dec):
         dec = obj
     else:
@@ -126,17 +189,144 @@ cdef numeric_encode_binary(ConnectionSettings settings, WriteBuffer buf, obj):
         buf.write_int16(pgdigit)
 
 
-# The decoding strategy here is to form a string representation of
-# the numeric var, as it is faster than passing an iterable of digits.
-# For this reason the below code is pure overhead and is ~25% slower
-# than the simple text decoder above.  That said, we need the binary
-# decoder to support binary COPY with numeric values.
 cdef numeric_decode_binary(ConnectionSettings settings, FastReadBuffer buf):
     cdef:
         uint16_t num_pgdigits = <uint16_t>hton.unpack_int16(buf.read(2))
         int16_t weight = hton.unpack_int16(buf.read(2))
         uint16_t sign = <uint16_t>hton.unpack_int16(buf.read(2))
         uint16_t dscale = <uint16_t>hton.unpack_int16(buf.read(2))
+
+    if settings._numeric_format == NUMERIC_FORMAT_FLOAT:
+        return _numeric_decode_float(buf, num_pgdigits, weight, sign)
+    elif settings._numeric_format == NUMERIC_FORMAT_INT:
+        return _numeric_decode_scaled(buf, num_pgdigits, weight, sign,
+                                      settings._numeric_scale)
+    else:
+        return _numeric_decode_decimal(buf, num_pgdigits, weight, sign,
+                                       dscale)
+
+
+cdef _numeric_read_digits(FastReadBuffer buf, uint16_t num_pgdigits):
+    # Read base-10000 digits as a (possibly long) integer, accumulating
+    # up to four digits at a time in C.
+    cdef:
+        int64_t chunk = 0
+        int64_t chunk_mul = 1
+        uint16_t i
+
+    result = 0
+    for i in range(num_pgdigits):
+        chunk = chunk * 10000 + hton.unpack_int16(buf.read(2))
+        chunk_mul *= 10000
+        if chunk_mul == 10000000000000000:
+            result = result * chunk_mul + chunk
+            chunk = 0
+            chunk_mul = 1
+
+    if chunk_mul > 1:
+        result = result * chunk_mul + chunk
+
+    return result
+
+
+cdef _numeric_decode_float(FastReadBuffer buf, uint16_t num_pgdigits,
+                           int16_t weight, uint16_t sign):
+    cdef:
+        int64_t mantissa = 0
+        int64_t exponent
+        double val
+        uint16_t i
+
+    if sign == NUMERIC_NAN:
+        return NAN
+
+    if num_pgdigits == 0:
+        return 0.0
+
+    # Decimal exponent of the last digit.
+    exponent = (<int64_t>weight - num_pgdigits + 1) * DEC_DIGITS
+
+    if num_pgdigits <= 4:
+        for i in range(num_pgdigits):
+            mantissa = mantissa * 10000 + hton.unpack_int16(buf.read(2))
+
+        if mantissa <= (1LL << 53) and -22 <= exponent <= 22:
+            # Both the mantissa and the power of ten are exact doubles,
+            # so a single multiplication or division gives a correctly
+            # rounded result.
+            val = <double>mantissa
+            if exponent >= 0:
+                val *= _NUMERIC_POW10[exponent]
+            else:
+                val /= _NUMERIC_POW10[-exponent]
+            return -val if sign == NUMERIC_NEG else val
+
+        pymantissa = mantissa
+    else:
+        pymantissa = _numeric_read_digits(buf, num_pgdigits)
+
+    if sign == NUMERIC_NEG:
+        pymantissa = -pymantissa
+
+    # Integer arithmetic followed by a single correctly rounded
+    # conversion.  The powers of ten are Python ints, as they do not
+    # fit into a C integer.
+    try:
+        if exponent >= 0:
+            return float(pymantissa * 10 ** <object>exponent)
+        else:
+            return pymantissa / 10 ** <object>(-exponent)
+    except OverflowError:
+        return -INFINITY if sign == NUMERIC_NEG else INFINITY
+
+
+cdef _numeric_decode_scaled(FastReadBuffer buf, uint16_t num_pgdigits,
+                            int16_t weight, uint16_t sign, int32_t scale):
+    cdef:
+        int64_t mantissa = 0
+        int64_t shift
+        int64_t p
+        uint16_t i
+
+    if sign == NUMERIC_NAN:
+        raise ValueError('cannot decode numeric NaN into an integer')
+
+    if num_pgdigits == 0:
+        return 0
+
+    shift = (<int64_t>weight - num_pgdigits + 1) * DEC_DIGITS + scale
+
+    if num_pgdigits <= 4 and -18 <= shift <= 18:
+        for i in range(num_pgdigits):
+            mantissa = mantissa * 10000 + hton.unpack_int16(buf.read(2))
+
+        if shift < 0:
+            p = _NUMERIC_POW10_INT[-shift]
+            if mantissa % p == 0:
+                mantissa //= p
+                return -mantissa if sign == NUMERIC_NEG else mantissa
+        else:
+            p = _NUMERIC_POW10_INT[shift]
+            if mantissa <= 0x7FFFFFFFFFFFFFFF // p:
+                mantissa *= p
+                return -mantissa if sign == NUMERIC_NEG else mantissa
+
+        pymantissa = mantissa
+    else:
+        pymantissa = _numeric_read_digits(buf, num_pgdigits)
+
+    return _numeric_to_scaled_int(pymantissa, shift, sign == NUMERIC_NEG,
+                                  scale)
+
+
+# The decoding strategy here is to form a string representation of
+# the numeric var, as it is faster than passing an iterable of digits.
+# For this reason the below code is pure overhead and is ~25% slower
+# than the simple text decoder above.  That said, we need the binary
+# decoder to support binary COPY with numeric values.
+cdef _numeric_decode_decimal(FastReadBuffer buf, uint16_t num_pgdigits,
+                             int16_t weight, uint16_t sign, uint16_t dscale):
+    cdef:
         int16_t pgdigit0
         ssize_t i
         int16_t pgdigit
@@ -48,6 +48,54 @@ cdef text_decode(ConnectionSettings settings, FastReadBuffer buf):
     return decode_pg_string(settings, buf.read_all(), buf_len)
 
 
+@cython.final
+cdef class TextInternCache:
+    """A bounded cache of decoded strings keyed by their raw UTF-8 data.
+
+    Used to share ``str`` objects among the values of a low-cardinality
+    text or enum column.  The cache is direct-mapped: a slot is picked
+    by the hash of the raw value and a colliding value replaces the
+    previous one.
+    """
+
+    def __cinit__(self):
+        self.entries = [None] * _TEXT_INTERN_CACHE_SIZE
+
+    cdef decode(self, ConnectionSettings settings, FastReadBuffer buf):
+        cdef:
+            ssize_t size = buf.len
+            ssize_t cached_size
+            const char *data
+            const char *cached_data
+            uint32_t h = 2166136261
+            ssize_t i
+
+        if size > _TEXT_INTERN_MAX_LEN:
+            return text_decode(settings, buf)
+
+        data = buf.read_all()
+
+        # FNV-1a
+        for i in range(size):
+            h = (h ^ <uint8_t>data[i]) * 16777619
+
+        i = h & (_TEXT_INTERN_CACHE_SIZE - 1)
+        cached = <object>cpython.PyList_GET_ITEM(self.entries, i)
+        if cached is not None:
+            cached_data = PyUnicode_AsUTF8AndSize(cached, &cached_size)
+            if cached_size == size and memcmp(cached_data, data, size) == 0:
+                return cached
+
+        val = decode_pg_string(settings, data, size)
+        self.entries[i] = val
+        return val
+
+
+cdef bint is_text_codec(Codec codec):
+    return (codec.type == CODEC_C and
+            codec.c_decoder == <decode_func>&text_decode)
+
+
 cdef init_text_codecs():
     textoids = [
         NAMEOID,
@@ -11,7 +11,53 @@ import uuid
 _UUID = uuid.UUID
 
 
+class UUID(_UUID):
+    """A :class:`uuid.UUID` created from its 16-byte representation.
+
+    The integer and string forms of the value are computed lazily,
+    which makes instantiation much cheaper than that of the base class.
+    """
+
+    __slots__ = ('_bytes', '_int')
+
+    @property
+    def int(self):
+        try:
+            return self._int
+        except AttributeError:
+            val = int.from_bytes(self._bytes, 'big')
+            _uuid_set_int(self, val)
+            return val
+
+    @property
+    def bytes(self):
+        return self._bytes
+
+    if hasattr(uuid, 'SafeUUID'):
+        @property
+        def is_safe(self):
+            return uuid.SafeUUID.unknown
+
+    def __str__(self):
+        h = self._bytes.hex()
+        return '{}-{}-{}-{}-{}'.format(
+            h[:8], h[8:12], h[12:16], h[16:20], h[20:])
+
+    def __reduce__(self):
+        return (_UUID, (None, self._bytes))
+
+
+_uuid_new = object.__new__
+_uuid_set_bytes = UUID._bytes.__set__
+_uuid_set_int = UUID._int.__set__
+
+
 cdef uuid_encode(ConnectionSettings settings, WriteBuffer wbuf, obj):
+    if type(obj) is UUID:
+        wbuf.write_int32(16)
+        wbuf.write_bytes(obj._bytes)
+        return
+
     if cpython.PyUnicode_Check(obj):
         obj = _UUID(obj)
 
@@ -19,7 +65,16 @@ cdef uuid_encode(ConnectionSettings settings, WriteBuffer wbuf, obj):
 
 
 cdef uuid_decode(ConnectionSettings settings, FastReadBuffer buf):
-    return _UUID(bytes=bytea_decode(settings, buf))
+    cdef ssize_t buf_len = buf.len
+
+    if buf_len != 16:
+        raise ValueError(
+            'invalid length of uuid value: {}'.format(buf_len))
+
+    val = _uuid_new(UUID)
+    _uuid_set_bytes(val, cpython.PyBytes_FromStringAndSize(
+        buf.read_all(), buf_len))
+    return val
 
 
 cdef init_uuid_codecs():
@@ -14,3 +14,6 @@ DEF _MAXINT32 = 2**31 - 1
 DEF _COPY_BUFFER_SIZE = 524288
 DEF _COPY_SIGNATURE = b"PGCOPY\n\377\r\n\0"
 DEF _NUMERIC_DECODER_SMALLBUF_SIZE = 256
+DEF _BATCH_CODEC_CHUNK_SIZE = 1024
+DEF _TEXT_INTERN_CACHE_SIZE = 256
+DEF _TEXT_INTERN_MAX_LEN = 128
@@ -78,7 +78,16 @@ cdef class CoreProtocol:
         # executemany support data
         object _execute_iter
         str _execute_portal_name
-        str _execute_stmt_name
+
+        # Transaction commands (BEGIN, SAVEPOINT) deferred until
+        # the next statement is sent, and the number of their
+        # CommandComplete messages the current result is expecting.
+        list _xact_prologue
+        int32_t _xact_prologue_replies
+
+        # Names of the prepared statements to close with the next
+        # Parse or Bind sent.
+        list _stmts_to_close
 
         ConnectionStatus con_status
         ProtocolState state
@@ -104,6 +113,17 @@ cdef class CoreProtocol:
         # True - completed, False - suspended
         bint result_execute_completed
 
+        # Limits on the number of rows and the total size of
+        # DataRow messages accumulated in result; 0 - no limit.
+        int64_t result_max_rows
+        int64_t result_max_size
+        int64_t result_size
+
+        # Decode dates and timestamps into epoch microseconds.
+        bint result_raw_timestamps
+        # Type of the returned rows, None - Record.
+        object result_row_factory
+
     cdef _process__auth(self, char mtype)
     cdef _process__prepare(self, char mtype)
     cdef _process__bind_execute(self, char mtype)
@@ -144,21 +164,17 @@ cdef class CoreProtocol:
 
     cdef _ensure_connected(self)
 
-    cdef WriteBuffer _build_bind_message(self, str portal_name,
-                                         str stmt_name,
-                                         WriteBuffer bind_data)
-
 
     cdef _connect(self)
     cdef _prepare(self, str stmt_name, str query)
-    cdef _send_bind_message(self, str portal_name, str stmt_name,
-                            WriteBuffer bind_data, int32_t limit)
-    cdef _bind_execute(self, str portal_name, str stmt_name,
-                       WriteBuffer bind_data, int32_t limit)
-    cdef _bind_execute_many(self, str portal_name, str stmt_name,
-                            object bind_data)
-    cdef _bind(self, str portal_name, str stmt_name,
-               WriteBuffer bind_data)
+    cdef _write_xact_prologue(self, WriteBuffer buf)
+    cdef _write_stmt_closes(self, WriteBuffer buf)
+    cdef _send_bind_message(self, str portal_name, WriteBuffer bind_msg,
+                            int32_t limit)
+    cdef _bind_execute(self, str portal_name, WriteBuffer bind_msg,
+                       int32_t limit)
+    cdef _bind_execute_many(self, str portal_name, object bind_data)
+    cdef _bind(self, WriteBuffer bind_msg)
     cdef _execute(self, str portal_name, int32_t limit)
     cdef _close(self, str name, bint is_portal)
     cdef _simple_query(self, str query)
@@ -169,6 +185,7 @@ cdef class CoreProtocol:
     cdef _decode_row(self, const char* buf, ssize_t buf_len)
 
     cdef _on_result(self)
+    cdef _on_result_limit_exceeded(self, str limit_name, int64_t limit)
     cdef _on_notification(self, pid, channel, payload)
     cdef _on_notice(self, parsed)
     cdef _set_server_parameter(self, name, val)
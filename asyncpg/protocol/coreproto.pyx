@@ -28,7 +28,9 @@ cdef class CoreProtocol:
         # executemany support data
         self._execute_iter = None
         self._execute_portal_name = None
-        self._execute_stmt_name = None
+
+        self._xact_prologue = []
+        self._stmts_to_close = []
 
         self._reset_result()
 
@@ -210,8 +212,13 @@ cdef class CoreProtocol:
 
         elif mtype == b'C':
             # CommandComplete
-            self.result_execute_completed = True
-            self._parse_msg_command_complete()
+            if self._xact_prologue_replies:
+                # Completion of a deferred BEGIN or SAVEPOINT.
+                self._xact_prologue_replies -= 1
+                self.buffer.consume_message()
+            else:
+                self.result_execute_completed = True
+                self._parse_msg_command_complete()
 
         elif mtype == b'E':
             # ErrorResponse
@@ -243,7 +250,12 @@ cdef class CoreProtocol:
 
         elif mtype == b'C':
             # CommandComplete
-            self._parse_msg_command_complete()
+            if self._xact_prologue_replies:
+                # Completion of a deferred BEGIN or SAVEPOINT.
+                self._xact_prologue_replies -= 1
+                self.buffer.consume_message()
+            else:
+                self._parse_msg_command_complete()
 
         elif mtype == b'E':
             # ErrorResponse
@@ -270,8 +282,7 @@ cdef class CoreProtocol:
                 else:
                     # Next iteration over the executemany() arg sequence
                     self._send_bind_message(
-                        self._execute_portal_name, self._execute_stmt_name,
-                        buf, 0)
+                        self._execute_portal_name, buf, 0)
 
         elif mtype == b'I':
             # EmptyQueryResponse
@@ -495,10 +506,26 @@ cdef class CoreProtocol:
                 row = decoder(self, cbuf, cbuf_len)
             else:
                 mem = buf.consume_message()
+                cbuf_len = mem.length
                 row = decoder(self, mem.buf, mem.length)
 
             cpython.PyList_Append(rows, row)
 
+            self.result_size += cbuf_len
+            if (self.result_max_rows and
+                    cpython.PyList_GET_SIZE(rows) > self.result_max_rows):
+                self._skip_discard = True
+                self._on_result_limit_exceeded(
+                    'max_result_rows', self.result_max_rows)
+                return
+
+            if (self.result_max_size and
+                    self.result_size > self.result_max_size):
+                self._skip_discard = True
+                self._on_result_limit_exceeded(
+                    'max_result_size', self.result_max_size)
+                return
+
             if not buf.has_message() or buf.get_message_type() != b'D':
                 self._skip_discard = True
                 return
@@ -634,6 +661,12 @@ cdef class CoreProtocol:
         self.result_row_desc = None
         self.result_status_msg = None
         self.result_execute_completed = False
+        self.result_max_rows = 0
+        self.result_max_size = 0
+        self.result_size = 0
+        self.result_raw_timestamps = False
+        self.result_row_factory = None
+        self._xact_prologue_replies = 0
         self._discard_data = False
 
     cdef _set_state(self, ProtocolState new_state):
@@ -684,21 +717,6 @@ cdef class CoreProtocol:
         if self.con_status != CONNECTION_OK:
             raise RuntimeError('not connected')
 
-    cdef WriteBuffer _build_bind_message(self, str portal_name,
-                                         str stmt_name,
-                                         WriteBuffer bind_data):
-        cdef WriteBuffer buf
-
-        buf = WriteBuffer.new_message(b'B')
-        buf.write_str(portal_name, self.encoding)
-        buf.write_str(stmt_name, self.encoding)
-
-        # Arguments
-        buf.write_buffer(bind_data)
-
-        buf.end_message()
-        return buf
-
     # API for subclasses
 
     cdef _connect(self):
@@ -751,6 +769,9 @@ cdef class CoreProtocol:
 
         packet = WriteBuffer.new()
 
+        if self._stmts_to_close:
+            self._write_stmt_closes(packet)
+
         buf = WriteBuffer.new_message(b'P')
         buf.write_str(stmt_name, self.encoding)
         buf.write_str(query, self.encoding)
@@ -768,36 +789,86 @@ cdef class CoreProtocol:
 
         self.transport.write(memoryview(packet))
 
-    cdef _send_bind_message(self, str portal_name, str stmt_name,
-                            WriteBuffer bind_data, int32_t limit):
-
-        cdef WriteBuffer buf
-
-        buf = self._build_bind_message(portal_name, stmt_name, bind_data)
-        self._write(buf)
-
-        buf = WriteBuffer.new_message(b'E')
-        buf.write_str(portal_name, self.encoding)  # name of the portal
-        buf.write_int32(limit)  # number of rows to return; 0 - all
-        buf.end_message()
-        self._write(buf)
+    cdef _write_xact_prologue(self, WriteBuffer buf):
+        # Write the deferred transaction commands as unnamed
+        # Parse/Bind/Execute sequences.  They are not followed by
+        # Sync, so should one of them fail, the server skips the rest
+        # of the pipeline and the error is reported as the result of
+        # the statement sent along.
+        cdef WriteBuffer msg
+
+        for query in self._xact_prologue:
+            msg = WriteBuffer.new_message(b'P')
+            msg.write_bytestring(b'')  # unnamed statement
+            msg.write_str(query, self.encoding)
+            msg.write_int16(0)
+            msg.end_message()
+            buf.write_buffer(msg)
+
+            buf.write_bytes(BIND_UNNAMED_NO_PARAMS)
+
+            buf.write_bytes(EXECUTE_UNNAMED_PORTAL_PREFIX)
+            buf.write_int32(0)
+
+            self._xact_prologue_replies += 1
+
+        self._xact_prologue = []
+
+    cdef _write_stmt_closes(self, WriteBuffer buf):
+        # Write Close messages for the statements queued to be closed.
+        # CloseComplete replies are ignored by all states which can
+        # receive them.
+        cdef WriteBuffer msg
+
+        for name in self._stmts_to_close:
+            msg = WriteBuffer.new_message(b'C')
+            msg.write_byte(b'S')
+            msg.write_str(name, self.encoding)
+            msg.end_message()
+            buf.write_buffer(msg)
+
+        self._stmts_to_close = []
+
+    cdef _send_bind_message(self, str portal_name, WriteBuffer bind_msg,
+                            int32_t limit):
+        # *bind_msg* is a complete Bind message, as built by
+        # PreparedStatementState._encode_bind_msg().  Execute and Sync
+        # are appended to it, so that the whole sequence is sent with
+        # a single write.
+        cdef:
+            bytes portal
+            WriteBuffer packet
 
-        self._write_sync_message()
+        if self._stmts_to_close or self._xact_prologue:
+            packet = WriteBuffer.new()
+            self._write_stmt_closes(packet)
+            self._write_xact_prologue(packet)
+            packet.write_buffer(bind_msg)
+            bind_msg = packet
+
+        if portal_name:
+            portal = portal_name.encode(self.encoding)
+            bind_msg.write_byte(b'E')
+            bind_msg.write_int32(<int32_t>(len(portal) + 9))
+            bind_msg.write_bytestring(portal)  # name of the portal
+        else:
+            bind_msg.write_bytes(EXECUTE_UNNAMED_PORTAL_PREFIX)
+        bind_msg.write_int32(limit)  # number of rows to return; 0 - all
 
-    cdef _bind_execute(self, str portal_name, str stmt_name,
-                       WriteBuffer bind_data, int32_t limit):
+        bind_msg.write_bytes(SYNC_MESSAGE)
+        self._write(bind_msg)
 
-        cdef WriteBuffer buf
+    cdef _bind_execute(self, str portal_name, WriteBuffer bind_msg,
+                       int32_t limit):
 
         self._ensure_connected()
         self._set_state(PROTOCOL_BIND_EXECUTE)
 
         self.result = []
 
-        self._send_bind_message(portal_name, stmt_name, bind_data, limit)
+        self._send_bind_message(portal_name, bind_msg, limit)
 
-    cdef _bind_execute_many(self, str portal_name, str stmt_name,
-                            object bind_data):
+    cdef _bind_execute_many(self, str portal_name, object bind_data):
 
         cdef WriteBuffer buf
 
@@ -808,7 +879,6 @@ cdef class CoreProtocol:
         self._discard_data = True
         self._execute_iter = bind_data
         self._execute_portal_name = portal_name
-        self._execute_stmt_name = stmt_name
 
         try:
             buf = <WriteBuffer>next(bind_data)
@@ -819,7 +889,7 @@ cdef class CoreProtocol:
             self.result = e
             self._push_result()
         else:
-            self._send_bind_message(portal_name, stmt_name, buf, 0)
+            self._send_bind_message(portal_name, buf, 0)
 
     cdef _execute(self, str portal_name, int32_t limit):
         cdef WriteBuffer buf
@@ -836,17 +906,21 @@ cdef class CoreProtocol:
         self._write(buf)
         self._write_sync_message()
 
-    cdef _bind(self, str portal_name, str stmt_name,
-               WriteBuffer bind_data):
-
-        cdef WriteBuffer buf
+    cdef _bind(self, WriteBuffer bind_msg):
+        cdef WriteBuffer packet
 
         self._ensure_connected()
         self._set_state(PROTOCOL_BIND)
 
-        buf = self._build_bind_message(portal_name, stmt_name, bind_data)
-        self._write(buf)
-        self._write_sync_message()
+        if self._stmts_to_close or self._xact_prologue:
+            packet = WriteBuffer.new()
+            self._write_stmt_closes(packet)
+            self._write_xact_prologue(packet)
+            packet.write_buffer(bind_msg)
+            bind_msg = packet
+
+        bind_msg.write_bytes(SYNC_MESSAGE)
+        self._write(bind_msg)
 
     cdef _close(self, str name, bint is_portal):
         cdef WriteBuffer buf
@@ -871,6 +945,12 @@ cdef class CoreProtocol:
         cdef WriteBuffer buf
         self._ensure_connected()
         self._set_state(PROTOCOL_SIMPLE_QUERY)
+        if self._xact_prologue:
+            # A multi-statement query stops at the first error,
+            # which is just what the deferred commands need.
+            self._xact_prologue.append(query)
+            query = ';\n'.join(self._xact_prologue)
+            self._xact_prologue = []
         buf = WriteBuffer.new_message(b'Q')
         buf.write_str(query, self.encoding)
         buf.end_message()
@@ -915,6 +995,9 @@ cdef class CoreProtocol:
     cdef _on_result(self):
         pass
 
+    cdef _on_result_limit_exceeded(self, str limit_name, int64_t limit):
+        pass
+
     cdef _on_notice(self, parsed):
         pass
 
@@ -955,3 +1038,10 @@ cdef class CoreProtocol:
 
 
 cdef bytes SYNC_MESSAGE = bytes(WriteBuffer.new_message(b'S').end_message())
+# The beginning of an Execute message for the unnamed portal,
+# followed by the row limit.
+cdef bytes EXECUTE_UNNAMED_PORTAL_PREFIX = b'E\x00\x00\x00\x09\x00'
+# Bind of the unnamed statement to the unnamed portal without
+# parameters and result format codes.
+cdef bytes BIND_UNNAMED_NO_PARAMS = (
+    b'B\x00\x00\x00\x0c\x00\x00\x00\x00\x00\x00\x00\x00')
@@ -17,21 +17,42 @@ cdef class PreparedStatementState:
         list         row_desc
         list         parameters_desc
 
-        BaseProtocol protocol
+        CoreProtocol protocol
         ConnectionSettings settings
 
         int16_t      args_num
         bint         have_text_args
         tuple        args_codecs
+        # Indexes of arguments with batch codecs, or None
+        tuple        args_batch_cols
 
         int16_t      cols_num
         object       cols_desc
         bint         have_text_cols
         tuple        rows_codecs
-
-    cdef _encode_bind_msg(self, args)
+        # Indexes of columns with batch codecs, or None
+        tuple        rows_batch_cols
+
+        # Parts of the Bind message which do not depend on the
+        # arguments: the statement name and the parameter format
+        # codes, and the result format codes.
+        bytes        bind_prefix
+        bytes        bind_suffix
+        # Per-column TextInternCache instances, or None
+        tuple        rows_interners
+        # rows_codecs with date and timestamp columns decoded
+        # into epoch microseconds, built on first use
+        tuple        rows_epoch_us_codecs
+
+    cdef _ensure_bind_template(self)
+    cdef WriteBuffer _encode_bind_msg(self, str portal_name, args,
+                                      list encoded=*)
     cdef _ensure_rows_decoder(self)
     cdef _ensure_args_encoder(self)
     cdef _set_row_desc(self, object desc)
     cdef _set_args_desc(self, object desc)
-    cdef _decode_row(self, const char* cbuf, ssize_t buf_len)
+    cdef tuple _get_epoch_us_codecs(self)
+    cdef _decode_row(self, const char* cbuf, ssize_t buf_len,
+                     bint raw_timestamps, object row_factory)
+    cdef _batch_decode_rows(self, list rows)
+    cdef _make_rows(self, list rows, object row_factory)
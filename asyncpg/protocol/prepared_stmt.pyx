@@ -8,13 +8,18 @@
 @cython.final
 cdef class PreparedStatementState:
 
-    def __cinit__(self, str name, str query, BaseProtocol protocol):
+    def __cinit__(self, str name, str query, CoreProtocol protocol,
+                  ConnectionSettings settings):
         self.name = name
         self.query = query
         self.protocol = protocol
-        self.settings = protocol.settings
+        self.settings = settings
         self.row_desc = self.parameters_desc = None
         self.args_codecs = self.rows_codecs = None
+        self.args_batch_cols = self.rows_batch_cols = None
+        self.rows_interners = None
+        self.rows_epoch_us_codecs = None
+        self.bind_prefix = self.bind_suffix = None
         self.args_num = self.cols_num = 0
         self.cols_desc = None
         self.closed = False
@@ -85,25 +90,32 @@ cdef class PreparedStatementState:
     def mark_closed(self):
         self.closed = True
 
-    cdef _encode_bind_msg(self, args):
+    def _iter_bind_msgs(self, str portal_name, args):
+        # Encode the argument sequence lazily.  Arguments handled by
+        # batch codecs are encoded a chunk of rows at a time.
+        self._ensure_args_encoder()
+        if self.args_batch_cols is None:
+            for b in args:
+                yield self._encode_bind_msg(portal_name, b)
+        else:
+            for b, encoded in _batch_encode_rows(
+                    args, self.args_codecs, self.args_batch_cols):
+                yield self._encode_bind_msg(portal_name, b, encoded)
+
+    cdef _ensure_bind_template(self):
         cdef:
             int idx
             WriteBuffer writer
             Codec codec
 
-        if len(args) > 32767:
-            raise ValueError('number of arguments cannot exceed 32767')
+        if self.bind_prefix is not None:
+            return
 
         self._ensure_args_encoder()
         self._ensure_rows_decoder()
 
         writer = WriteBuffer.new()
-
-        if self.args_num != len(args):
-            raise ValueError(
-                'number of arguments ({}) does not match '
-                'number of parameters ({})'.format(
-                    len(args), self.args_num))
+        writer.write_str(self.name, self.settings._encoding)
 
         if self.have_text_args:
             writer.write_int16(self.args_num)
@@ -115,15 +127,9 @@ cdef class PreparedStatementState:
             writer.write_int32(0x00010001)
 
         writer.write_int16(self.args_num)
+        prefix = bytes(writer)
 
-        for idx from 0 <= idx < self.args_num:
-            arg = args[idx]
-            if arg is None:
-                writer.write_int32(-1)
-            else:
-                codec = <Codec>(self.args_codecs[idx])
-                codec.encode(self.settings, writer, arg)
-
+        writer = WriteBuffer.new()
         if self.have_text_cols:
             writer.write_int16(self.cols_num)
             for idx from 0 <= idx < self.cols_num:
@@ -133,6 +139,48 @@ cdef class PreparedStatementState:
             # All columns are in binary format
             writer.write_int32(0x00010001)
 
+        self.bind_suffix = bytes(writer)
+        self.bind_prefix = prefix
+
+    cdef WriteBuffer _encode_bind_msg(self, str portal_name, args,
+                                      list encoded=None):
+        cdef:
+            int idx
+            WriteBuffer writer
+            Codec codec
+
+        if len(args) > 32767:
+            raise ValueError('number of arguments cannot exceed 32767')
+
+        self._ensure_bind_template()
+
+        if self.args_num != len(args):
+            raise ValueError(
+                'number of arguments ({}) does not match '
+                'number of parameters ({})'.format(
+                    len(args), self.args_num))
+
+        writer = WriteBuffer.new_message(b'B')
+        if portal_name:
+            writer.write_str(portal_name, self.settings._encoding)
+        else:
+            writer.write_byte(0)
+        writer.write_bytes(self.bind_prefix)
+
+        for idx from 0 <= idx < self.args_num:
+            arg = args[idx]
+            if arg is None:
+                writer.write_int32(-1)
+            else:
+                codec = <Codec>(self.args_codecs[idx])
+                if encoded is not None and codec.py_batch:
+                    codec.encode_py_exchange(
+                        self.settings, writer, encoded[idx])
+                else:
+                    codec.encode(self.settings, writer, arg)
+
+        writer.write_bytes(self.bind_suffix)
+        writer.end_message()
         return writer
 
     cdef _ensure_rows_decoder(self):
@@ -143,6 +191,8 @@ cdef class PreparedStatementState:
             int oid
             Codec codec
             list codecs
+            list batch_cols
+            list interners
 
         if self.cols_desc is not None:
             return
@@ -154,6 +204,8 @@ cdef class PreparedStatementState:
         cols_mapping = collections.OrderedDict()
         cols_names = []
         codecs = []
+        batch_cols = []
+        interners = None
         for i from 0 <= i < self.cols_num:
             row = self.row_desc[i]
             col_name = row[0].decode(self.settings._encoding)
@@ -165,6 +217,14 @@ cdef class PreparedStatementState:
                 raise RuntimeError('no decoder for OID {}'.format(oid))
             if not codec.is_binary():
                 self.have_text_cols = True
+            if codec.py_batch:
+                batch_cols.append(i)
+            if (self.settings.is_type_interned(<uint32_t>oid) and
+                    self.settings.is_encoding_utf8() and
+                    is_text_codec(codec)):
+                if interners is None:
+                    interners = [None] * self.cols_num
+                interners[i] = TextInternCache()
 
             codecs.append(codec)
 
@@ -172,12 +232,17 @@ cdef class PreparedStatementState:
             cols_mapping, tuple(cols_names))
 
         self.rows_codecs = tuple(codecs)
+        if batch_cols:
+            self.rows_batch_cols = tuple(batch_cols)
+        if interners is not None:
+            self.rows_interners = tuple(interners)
 
     cdef _ensure_args_encoder(self):
         cdef:
             int p_oid
             Codec codec
             list codecs = []
+            list batch_cols = []
 
         if self.args_num == 0 or self.args_codecs is not None:
             return
@@ -189,10 +254,14 @@ cdef class PreparedStatementState:
                 raise RuntimeError('no encoder for OID {}'.format(p_oid))
             if codec.type not in {}:
                 self.have_text_args = True
+            if codec.py_batch:
+                batch_cols.append(i)
 
             codecs.append(codec)
 
         self.args_codecs = tuple(codecs)
+        if batch_cols:
+            self.args_batch_cols = tuple(batch_cols)
 
     cdef _set_row_desc(self, object desc):
         self.row_desc = _decode_row_desc(desc)
@@ -202,17 +271,36 @@ cdef class PreparedStatementState:
         self.parameters_desc = _decode_parameters_desc(desc)
         self.args_num = <int16_t>(len(self.parameters_desc))
 
-    cdef _decode_row(self, const char* cbuf, ssize_t buf_len):
+    cdef tuple _get_epoch_us_codecs(self):
+        cdef:
+            Codec codec
+            Codec raw_codec
+            list codecs
+
+        if self.rows_epoch_us_codecs is None:
+            codecs = []
+            for codec in self.rows_codecs:
+                raw_codec = get_epoch_us_codec(codec)
+                codecs.append(raw_codec if raw_codec is not None else codec)
+            self.rows_epoch_us_codecs = tuple(codecs)
+
+        return self.rows_epoch_us_codecs
+
+    cdef _decode_row(self, const char* cbuf, ssize_t buf_len,
+                     bint raw_timestamps, object row_factory):
         cdef:
             Codec codec
             int16_t fnum
             int32_t flen
             object dec_row
             tuple rows_codecs = self.rows_codecs
+            tuple rows_interners = self.rows_interners
             ConnectionSettings settings = self.settings
             int32_t i
             FastReadBuffer rbuf = self.buffer
             ssize_t bl
+            bint have_batch_cols = self.rows_batch_cols is not None
+            bint as_tuple = row_factory is not None
 
         rbuf.buf = cbuf
         rbuf.len = buf_len
@@ -229,8 +317,13 @@ cdef class PreparedStatementState:
             if fnum > 0:
                 # It's OK to have no rows_codecs for empty records
                 raise RuntimeError('invalid rows_codecs')
+        elif raw_timestamps:
+            rows_codecs = self._get_epoch_us_codecs()
 
-        dec_row = record.ApgRecord_New(self.cols_desc, fnum)
+        if as_tuple:
+            dec_row = cpython.PyTuple_New(fnum)
+        else:
+            dec_row = record.ApgRecord_New(self.cols_desc, fnum)
         for i in range(fnum):
             flen = hton.unpack_int32(rbuf.read(4))
 
@@ -246,7 +339,16 @@ cdef class PreparedStatementState:
                     rbuf._raise_ins_err(flen, bl)
                 rbuf.len = flen
                 codec = <Codec>cpython.PyTuple_GET_ITEM(rows_codecs, i)
-                val = codec.decode(settings, rbuf)
+                if (rows_interners is not None and
+                        rows_interners[i] is not None):
+                    val = (<TextInternCache>rows_interners[i]).decode(
+                        settings, rbuf)
+                elif have_batch_cols and codec.py_batch:
+                    # Keep the exchange value, the batch decoder
+                    # is invoked by _batch_decode_rows().
+                    val = codec.decode_py_exchange(settings, rbuf)
+                else:
+                    val = codec.decode(settings, rbuf)
                 if rbuf.len != 0:
                     raise BufferError(
                         'unexpected trailing {} bytes in buffer'.format(
@@ -254,14 +356,125 @@ cdef class PreparedStatementState:
                 rbuf.len = bl - flen
 
             cpython.Py_INCREF(val)
-            record.ApgRecord_SET_ITEM(dec_row, i, val)
+            if as_tuple:
+                cpython.PyTuple_SET_ITEM(dec_row, i, val)
+            else:
+                record.ApgRecord_SET_ITEM(dec_row, i, val)
 
         if rbuf.len != 0:
             raise BufferError('unexpected trailing {} bytes in buffer'.format(
                 rbuf.len))
 
+        if as_tuple and not have_batch_cols and row_factory is not tuple:
+            # Rows with batch-decoded columns are converted by
+            # _make_rows() once all of their values are decoded.
+            dec_row = record.ApgRecordDesc_MakeRow(
+                self.cols_desc, row_factory, dec_row)
+
         return dec_row
 
+    cdef _batch_decode_rows(self, list rows):
+        cdef:
+            Codec codec
+            list values
+            list decoded
+            int32_t col
+            ssize_t j
+
+        for col in self.rows_batch_cols:
+            codec = <Codec>(self.rows_codecs[col])
+
+            values = []
+            for row in rows:
+                val = <object>_row_get_item(row, col)
+                if val is not None:
+                    values.append(val)
+
+            if not values:
+                continue
+
+            decoded = _check_batch_codec_result(
+                codec, codec.py_decoder(values), len(values))
+
+            j = 0
+            for row in rows:
+                val = <object>_row_get_item(row, col)
+                if val is None:
+                    continue
+                new_val = decoded[j]
+                j += 1
+                cpython.Py_INCREF(new_val)
+                if type(row) is tuple:
+                    cpython.PyTuple_SET_ITEM(row, col, new_val)
+                else:
+                    record.ApgRecord_SET_ITEM(row, col, new_val)
+                # Release the reference previously held by the row.
+                cpython.Py_DECREF(val)
+
+    cdef _make_rows(self, list rows, object row_factory):
+        cdef:
+            ssize_t i
+            object desc = self.cols_desc
+
+        for i in range(len(rows)):
+            rows[i] = record.ApgRecordDesc_MakeRow(
+                desc, row_factory, rows[i])
+
+
+cdef inline cpython.PyObject* _row_get_item(object row, int32_t col):
+    if type(row) is tuple:
+        return cpython.PyTuple_GET_ITEM(row, col)
+    else:
+        return record.ApgRecord_GET_ITEM(row, col)
+
+
+def _batch_encode_rows(rows, tuple codecs, tuple batch_cols):
+    """Yield (row, encoded) pairs for *rows*.
+
+    *encoded* is a list holding the exchange values produced by
+    the batch encoders for the corresponding columns of *row*.
+    """
+    cdef:
+        Codec codec
+        ssize_t num_cols = len(codecs)
+        ssize_t i, j
+        list chunk
+        list encoded
+        list values
+        list data
+
+    it = iter(rows)
+    while True:
+        chunk = list(itertools.islice(it, _BATCH_CODEC_CHUNK_SIZE))
+        if not chunk:
+            break
+
+        encoded = [[None] * num_cols for i in range(len(chunk))]
+
+        for col in batch_cols:
+            codec = <Codec>(codecs[col])
+            values = []
+            for row in chunk:
+                # Malformed rows are left to the regular encoding path
+                # to report.
+                if len(row) == num_cols and row[col] is not None:
+                    values.append(row[col])
+
+            if not values:
+                continue
+
+            data = _check_batch_codec_result(
+                codec, codec.py_encoder(values), len(values))
+
+            j = 0
+            for i, row in enumerate(chunk):
+                if len(row) == num_cols and row[col] is not None:
+                    encoded[i][col] = data[j]
+                    j += 1
+
+        for i in range(len(chunk)):
+            yield chunk[i], encoded[i]
+
 
 cdef _decode_parameters_desc(object desc):
     cdef:
@@ -30,10 +30,13 @@ cdef class BaseProtocol(CoreProtocol):
         ConnectionSettings settings
         object cancel_sent_waiter
         object cancel_waiter
+        # The pending Execute of a cursor read-ahead, if any.
+        object prefetch_waiter
         object waiter
         bint return_extra
         object create_future
         object timeout_handle
+        object timer_wheel
         object timeout_callback
         object completed_callback
         object connection
@@ -49,6 +52,8 @@ cdef class BaseProtocol(CoreProtocol):
         PreparedStatementState statement
 
     cdef _get_timeout_impl(self, timeout)
+    cdef _get_result_limit(self, str name, limit)
+    cdef _get_row_factory(self, row_factory)
     cdef _check_state(self)
     cdef _new_waiter(self, timeout)
 
@@ -67,3 +72,6 @@ cdef class BaseProtocol(CoreProtocol):
 
     cdef inline resume_reading(self)
     cdef inline pause_reading(self)
+
+
+include "syncproto.pxd"
@@ -14,11 +14,13 @@ import asyncio
 import builtins
 import codecs
 import collections
+import itertools
 import socket
 import time
 
 from libc.stdint cimport int8_t, uint8_t, int16_t, uint16_t, \
                          int32_t, uint32_t, int64_t, uint64_t
+from libc.string cimport memcmp, memcpy
 
 from asyncpg.protocol cimport record
 
@@ -36,6 +38,7 @@ from cpython cimport PyBuffer_FillInfo, PyBytes_AsString
 
 from asyncpg.exceptions import _base as apg_exc_base
 from asyncpg import compat
+from asyncpg import timerwheel
 from asyncpg import types as apg_types
 from asyncpg import exceptions as apg_exc
 
@@ -97,6 +100,7 @@ cdef class BaseProtocol(CoreProtocol):
         self.waiter = connected_fut
         self.cancel_waiter = None
         self.cancel_sent_waiter = None
+        self.prefetch_waiter = None
 
         self.address = addr
         self.settings = ConnectionSettings((self.address, con_params.database))
@@ -112,6 +116,7 @@ cdef class BaseProtocol(CoreProtocol):
         self.writing_allowed.set()
 
         self.timeout_handle = None
+        self.timer_wheel = timerwheel.get_timer_wheel(loop)
         self.timeout_callback = self._on_timeout
         self.completed_callback = self._on_waiter_completed
 
@@ -136,6 +141,34 @@ cdef class BaseProtocol(CoreProtocol):
         # PQTRANS_INERROR = idle, within failed transaction
         return self.xact_status in (PQTRANS_INTRANS, PQTRANS_INERROR)
 
+    def defer_xact_command(self, str query):
+        # Queue a transaction command (BEGIN or SAVEPOINT) to be sent
+        # along with the next statement.
+        self._xact_prologue.append(query)
+
+    def discard_xact_command(self, str query):
+        # Drop a deferred transaction command, if it has not been sent
+        # yet.  Returns True if it was dropped.
+        if self._xact_prologue and self._xact_prologue[-1] == query:
+            self._xact_prologue.pop()
+            return True
+        return False
+
+    def clear_xact_commands(self):
+        self._xact_prologue = []
+
+    async def _flush_xact_prologue(self, timeout):
+        # Send the deferred transaction commands on their own, for the
+        # operations which cannot carry them.  Returns the remaining
+        # timeout budget.
+        timer = Timer(timeout)
+        with timer:
+            query = ';\n'.join(self._xact_prologue)
+            self._xact_prologue = []
+            self._simple_query(query)
+            await self._new_waiter(timer.get_remaining_budget())
+        return timer.get_remaining_budget()
+
     cdef inline resume_reading(self):
         if not self.is_reading:
             self.is_reading = True
@@ -147,6 +180,8 @@ cdef class BaseProtocol(CoreProtocol):
             self.transport.pause_reading()
 
     async def prepare(self, stmt_name, query, timeout):
+        if self.prefetch_waiter is not None:
+            await self._wait_prefetch()
         if self.cancel_waiter is not None:
             await self.cancel_waiter
         if self.cancel_sent_waiter is not None:
@@ -158,14 +193,18 @@ cdef class BaseProtocol(CoreProtocol):
 
         self._prepare(stmt_name, query)
         self.last_query = query
-        self.statement = PreparedStatementState(stmt_name, query, self)
+        self.statement = PreparedStatementState(
+            stmt_name, query, self, self.settings)
 
         return await self._new_waiter(timeout)
 
     async def bind_execute(self, PreparedStatementState state, args,
                            str portal_name, int limit, return_extra,
-                           timeout):
+                           timeout, max_rows=None, max_size=None,
+                           raw_timestamps=False, row_factory=None):
 
+        if self.prefetch_waiter is not None:
+            await self._wait_prefetch()
         if self.cancel_waiter is not None:
             await self.cancel_waiter
         if self.cancel_sent_waiter is not None:
@@ -174,13 +213,28 @@ cdef class BaseProtocol(CoreProtocol):
 
         self._check_state()
         timeout = self._get_timeout_impl(timeout)
+        if max_rows is None and max_size is None:
+            config = self.connection._config
+            max_rows = config.max_result_rows
+            max_size = config.max_result_size
+        else:
+            max_rows = self._get_result_limit('max_result_rows', max_rows)
+            max_size = self._get_result_limit('max_result_size', max_size)
+        if row_factory is not None:
+            row_factory = self._get_row_factory(row_factory)
+        if self._xact_prologue and not state.name:
+            # The deferred commands use the unnamed statement.
+            timeout = await self._flush_xact_prologue(timeout)
 
         self._bind_execute(
             portal_name,
-            state.name,
-            state._encode_bind_msg(args),
+            state._encode_bind_msg(portal_name, args),
             limit)
 
+        self.result_max_rows = max_rows
+        self.result_max_size = max_size
+        self.result_raw_timestamps = raw_timestamps
+        self.result_row_factory = row_factory
         self.last_query = state.query
         self.statement = state
         self.return_extra = return_extra
@@ -191,6 +245,8 @@ cdef class BaseProtocol(CoreProtocol):
     async def bind_execute_many(self, PreparedStatementState state, args,
                                 str portal_name, timeout):
 
+        if self.prefetch_waiter is not None:
+            await self._wait_prefetch()
         if self.cancel_waiter is not None:
             await self.cancel_waiter
         if self.cancel_sent_waiter is not None:
@@ -199,19 +255,17 @@ cdef class BaseProtocol(CoreProtocol):
 
         self._check_state()
         timeout = self._get_timeout_impl(timeout)
+        if self._xact_prologue and not state.name:
+            timeout = await self._flush_xact_prologue(timeout)
 
         # Make sure the argument sequence is encoded lazily with
         # this generator expression to keep the memory pressure under
         # control.
-        data_gen = (state._encode_bind_msg(b) for b in args)
-        arg_bufs = iter(data_gen)
+        arg_bufs = iter(state._iter_bind_msgs(portal_name, args))
 
         waiter = self._new_waiter(timeout)
 
-        self._bind_execute_many(
-            portal_name,
-            state.name,
-            arg_bufs)
+        self._bind_execute_many(portal_name, arg_bufs)
 
         self.last_query = state.query
         self.statement = state
@@ -223,6 +277,8 @@ cdef class BaseProtocol(CoreProtocol):
     async def bind(self, PreparedStatementState state, args,
                    str portal_name, timeout):
 
+        if self.prefetch_waiter is not None:
+            await self._wait_prefetch()
         if self.cancel_waiter is not None:
             await self.cancel_waiter
         if self.cancel_sent_waiter is not None:
@@ -231,11 +287,10 @@ cdef class BaseProtocol(CoreProtocol):
 
         self._check_state()
         timeout = self._get_timeout_impl(timeout)
+        if self._xact_prologue and not state.name:
+            timeout = await self._flush_xact_prologue(timeout)
 
-        self._bind(
-            portal_name,
-            state.name,
-            state._encode_bind_msg(args))
+        self._bind(state._encode_bind_msg(portal_name, args))
 
         self.last_query = state.query
         self.statement = state
@@ -246,6 +301,8 @@ cdef class BaseProtocol(CoreProtocol):
                       str portal_name, int limit, return_extra,
                       timeout):
 
+        if self.prefetch_waiter is not None:
+            await self._wait_prefetch()
         if self.cancel_waiter is not None:
             await self.cancel_waiter
         if self.cancel_sent_waiter is not None:
@@ -254,6 +311,8 @@ cdef class BaseProtocol(CoreProtocol):
 
         self._check_state()
         timeout = self._get_timeout_impl(timeout)
+        if self._xact_prologue:
+            timeout = await self._flush_xact_prologue(timeout)
 
         self._execute(
             portal_name,
@@ -266,7 +325,41 @@ cdef class BaseProtocol(CoreProtocol):
 
         return await self._new_waiter(timeout)
 
+    async def execute_ahead(self, PreparedStatementState state,
+                            str portal_name, int limit):
+        # Send Execute for the next rows of a portal without waiting
+        # for them.  The returned future resolves to the same value as
+        # execute() with return_extra, and other operations wait for it
+        # before they start.  The timeout is applied by the caller when
+        # it awaits the future.
+
+        if self.prefetch_waiter is not None:
+            await self._wait_prefetch()
+        if self.cancel_waiter is not None:
+            await self.cancel_waiter
+        if self.cancel_sent_waiter is not None:
+            await self.cancel_sent_waiter
+            self.cancel_sent_waiter = None
+
+        self._check_state()
+        if self._xact_prologue:
+            await self._flush_xact_prologue(None)
+
+        self._execute(portal_name, limit)
+
+        self.last_query = state.query
+        self.statement = state
+        self.return_extra = True
+        self.queries_count += 1
+
+        waiter = self._new_waiter(None)
+        waiter.add_done_callback(self._on_prefetch_completed)
+        self.prefetch_waiter = waiter
+        return waiter
+
     async def query(self, query, timeout):
+        if self.prefetch_waiter is not None:
+            await self._wait_prefetch()
         if self.cancel_waiter is not None:
             await self.cancel_waiter
         if self.cancel_sent_waiter is not None:
@@ -286,6 +379,8 @@ cdef class BaseProtocol(CoreProtocol):
         return await self._new_waiter(timeout)
 
     async def copy_out(self, copy_stmt, sink, timeout):
+        if self.prefetch_waiter is not None:
+            await self._wait_prefetch()
         if self.cancel_waiter is not None:
             await self.cancel_waiter
         if self.cancel_sent_waiter is not None:
@@ -295,6 +390,8 @@ cdef class BaseProtocol(CoreProtocol):
         self._check_state()
 
         timeout = self._get_timeout_impl(timeout)
+        if self._xact_prologue:
+            timeout = await self._flush_xact_prologue(timeout)
         timer = Timer(timeout)
 
         # The copy operation is guarded by a single timeout
@@ -314,11 +411,10 @@ cdef class BaseProtocol(CoreProtocol):
                 # the last CopyData message.
                 if buffer:
                     try:
-                        with timer:
-                            await asyncio.wait_for(
-                                sink(buffer),
-                                timeout=timer.get_remaining_budget(),
-                                loop=self.loop)
+                        with timer, timerwheel.timeout(
+                                timer.get_remaining_budget(),
+                                loop=self.loop):
+                            await sink(buffer)
                     except Exception as ex:
                         # Abort the COPY operation on any error in
                         # output sink.
@@ -343,6 +439,8 @@ cdef class BaseProtocol(CoreProtocol):
             ssize_t num_cols
             Codec codec
 
+        if self.prefetch_waiter is not None:
+            await self._wait_prefetch()
         if self.cancel_waiter is not None:
             await self.cancel_waiter
         if self.cancel_sent_waiter is not None:
@@ -352,6 +450,8 @@ cdef class BaseProtocol(CoreProtocol):
         self._check_state()
 
         timeout = self._get_timeout_impl(timeout)
+        if self._xact_prologue:
+            timeout = await self._flush_xact_prologue(timeout)
         timer = Timer(timeout)
 
         waiter = self._new_waiter(timer.get_remaining_budget())
@@ -382,7 +482,14 @@ cdef class BaseProtocol(CoreProtocol):
                             'no binary format encoder for '
                             'type {} (OID {})'.format(codec.name, codec.oid))
 
+                batch_cols = record_stmt.rows_batch_cols
+                if batch_cols is not None:
+                    records = _batch_encode_rows(records, codecs, batch_cols)
+
+                encoded = None
                 for row in records:
+                    if batch_cols is not None:
+                        row, encoded = row
                     # Tuple header
                     wbuf.write_int16(<int16_t>num_cols)
                     # Tuple data
@@ -392,7 +499,11 @@ cdef class BaseProtocol(CoreProtocol):
                             wbuf.write_int32(-1)
                         else:
                             codec = <Codec>cpython.PyTuple_GET_ITEM(codecs, i)
-                            codec.encode(settings, wbuf, item)
+                            if encoded is not None and codec.py_batch:
+                                codec.encode_py_exchange(
+                                    settings, wbuf, encoded[i])
+                            else:
+                                codec.encode(settings, wbuf, item)
 
                     if wbuf.len() >= _COPY_BUFFER_SIZE:
                         with timer:
@@ -418,11 +529,10 @@ cdef class BaseProtocol(CoreProtocol):
                         # rate of data messages.
                         with timer:
                             await self.writing_allowed.wait()
-                        with timer:
-                            chunk = await asyncio.wait_for(
-                                iterator.__anext__(),
-                                timeout=timer.get_remaining_budget(),
-                                loop=self.loop)
+                        with timer, timerwheel.timeout(
+                                timer.get_remaining_budget(),
+                                loop=self.loop):
+                            chunk = await iterator.__anext__()
                         self._write_copy_data_msg(chunk)
                 except builtins.StopAsyncIteration:
                     pass
@@ -453,6 +563,8 @@ cdef class BaseProtocol(CoreProtocol):
         return status_msg
 
     async def close_statement(self, PreparedStatementState state, timeout):
+        if self.prefetch_waiter is not None:
+            await self._wait_prefetch()
         if self.cancel_waiter is not None:
             await self.cancel_waiter
         if self.cancel_sent_waiter is not None:
@@ -471,6 +583,17 @@ cdef class BaseProtocol(CoreProtocol):
         state.closed = True
         return await self._new_waiter(timeout)
 
+    def defer_close_statement(self, PreparedStatementState state):
+        # Close the statement on the server along with the next
+        # statement prepared or executed, saving a round-trip.
+        if state.refs != 0:
+            raise RuntimeError(
+                'cannot close prepared statement; refs == {} != 0'.format(
+                    state.refs))
+
+        self._stmts_to_close.append(state.name)
+        state.closed = True
+
     def is_closed(self):
         return self.closing
 
@@ -486,6 +609,8 @@ cdef class BaseProtocol(CoreProtocol):
         self.transport.abort()
 
     async def close(self):
+        if self.prefetch_waiter is not None:
+            await self._wait_prefetch()
         if self.cancel_waiter is not None:
             await self.cancel_waiter
         if self.cancel_sent_waiter is not None:
@@ -527,6 +652,22 @@ cdef class BaseProtocol(CoreProtocol):
                 self.timeout_handle = None
             self._request_cancel()
 
+    def _on_prefetch_completed(self, fut):
+        if fut is self.prefetch_waiter:
+            self.prefetch_waiter = None
+        if not fut.cancelled():
+            # The rows are dropped if the cursor was abandoned.
+            fut.exception()
+
+    async def _wait_prefetch(self):
+        # The result of the read-ahead belongs to its cursor, so it is
+        # neither consumed nor cancelled here.
+        waiter = self.prefetch_waiter
+        if not waiter.done():
+            await asyncio.wait((waiter,), loop=self.loop)
+        if self.prefetch_waiter is waiter:
+            self.prefetch_waiter = None
+
     def _create_future_fallback(self):
         return asyncio.Future(loop=self.loop)
 
@@ -568,6 +709,29 @@ cdef class BaseProtocol(CoreProtocol):
             raise asyncio.TimeoutError()
         return timeout
 
+    cdef _get_result_limit(self, str name, limit):
+        if limit is None:
+            return getattr(self.connection._config, name)
+
+        if (isinstance(limit, bool) or not isinstance(limit, int) or
+                limit < 0):
+            raise ValueError(
+                'invalid {} value: expected an int greater or '
+                'equal to 0 (got {!r})'.format(name, limit))
+
+        return limit
+
+    cdef _get_row_factory(self, row_factory):
+        if row_factory is None or row_factory is Record:
+            return None
+
+        if not isinstance(row_factory, type):
+            raise TypeError(
+                'invalid row_factory value: expected a type '
+                '(got {!r})'.format(row_factory))
+
+        return row_factory
+
     cdef _check_state(self):
         if self.cancel_waiter is not None:
             raise apg_exc.InterfaceError(
@@ -585,7 +749,7 @@ cdef class BaseProtocol(CoreProtocol):
                 'cannot perform operation: another operation is in progress')
         self.waiter = self.create_future()
         if timeout is not None:
-            self.timeout_handle = self.connection._loop.call_later(
+            self.timeout_handle = self.timer_wheel.call_later(
                 timeout, self.timeout_callback, self.waiter)
         self.waiter.add_done_callback(self.completed_callback)
         return self.waiter
@@ -606,6 +770,14 @@ cdef class BaseProtocol(CoreProtocol):
         waiter.set_result(self.statement)
 
     cdef _on_result__bind_and_exec(self, object waiter):
+        if (self.result and self.statement is not None and
+                self.statement.rows_batch_cols is not None):
+            self.statement._batch_decode_rows(self.result)
+            if (self.result_row_factory is not None and
+                    self.result_row_factory is not tuple):
+                self.statement._make_rows(
+                    self.result, self.result_row_factory)
+
         if self.return_extra:
             waiter.set_result((
                 self.result,
@@ -646,7 +818,9 @@ cdef class BaseProtocol(CoreProtocol):
                 raise RuntimeError(
                     '_decode_row: statement is None')
 
-        return self.statement._decode_row(buf, buf_len)
+        return self.statement._decode_row(
+            buf, buf_len, self.result_raw_timestamps,
+            self.result_row_factory)
 
     cdef _dispatch_result(self):
         waiter = self.waiter
@@ -731,6 +905,19 @@ cdef class BaseProtocol(CoreProtocol):
             self.last_query = None
             self.return_extra = False
 
+    cdef _on_result_limit_exceeded(self, str limit_name, int64_t limit):
+        waiter = self.waiter
+        if (waiter is None or waiter.done() or
+                self.cancel_waiter is not None):
+            return
+
+        # Drop the rows accumulated so far and abort the query.
+        self.result = None
+        self._request_cancel()
+        waiter.set_exception(apg_exc.ResultTooLargeError(
+            'query result exceeded the {} limit ({})'.format(
+                limit_name, limit)))
+
     cdef _on_notice(self, parsed):
         self.connection._process_log_message(parsed, self.last_query)
 
@@ -754,6 +941,9 @@ cdef class BaseProtocol(CoreProtocol):
             self.closing = True
             self._handle_waiter_on_connection_lost(exc)
 
+        if self.connection is not None:
+            self.connection._process_terminate()
+
     def pause_writing(self):
         self.writing_allowed.clear()
 
@@ -782,6 +972,9 @@ class Protocol(BaseProtocol, asyncio.Protocol):
     pass
 
 
+include "syncproto.pyx"
+
+
 def _create_record(object mapping, tuple elems):
     # Exposed only for testing purposes.
 
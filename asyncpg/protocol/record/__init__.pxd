@@ -15,5 +15,7 @@ cdef extern from "record/recordobj.h":
 	int ApgRecord_CheckExact(object)
 	object ApgRecord_New(object, int)
 	void ApgRecord_SET_ITEM(object, int, object)
+	cpython.PyObject* ApgRecord_GET_ITEM(object, int)
 
 	object ApgRecordDesc_New(object, object)
+	object ApgRecordDesc_MakeRow(object, object, object)
@@ -952,3 +952,87 @@ ApgRecordDesc_New(PyObject *mapping, PyObject *keys)
     PyObject_GC_Track(o);
     return (PyObject *) o;
 }
+
+
+PyObject *
+ApgRecordDesc_MakeRow(PyObject *desc, PyObject *factory, PyObject *values)
+{
+    PyObject *keys;
+    PyObject *row;
+    PyObject *args;
+    PyTypeObject *type;
+    Py_ssize_t i, n;
+
+    if (!desc || !ApgRecordDesc_CheckExact(desc) ||
+            !values || !PyTuple_CheckExact(values)) {
+        PyErr_BadInternalCall();
+        return NULL;
+    }
+
+    keys = ((ApgRecordDescObject *)desc)->keys;
+    n = PyTuple_GET_SIZE(values);
+    if (PyTuple_GET_SIZE(keys) != n) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "number of values does not match record desc");
+        return NULL;
+    }
+
+    if (factory == (PyObject *)&PyTuple_Type) {
+        Py_INCREF(values);
+        return values;
+    }
+
+    if (factory == (PyObject *)&PyDict_Type) {
+        /* Column names are shared by all rows of the result. */
+        row = _PyDict_NewPresized(n);
+        if (row == NULL) {
+            return NULL;
+        }
+
+        for (i = 0; i < n; i++) {
+            if (PyDict_SetItem(row, PyTuple_GET_ITEM(keys, i),
+                               PyTuple_GET_ITEM(values, i)) < 0) {
+                Py_DECREF(row);
+                return NULL;
+            }
+        }
+
+        return row;
+    }
+
+    if (!PyType_Check(factory)) {
+        PyErr_Format(PyExc_TypeError,
+                     "row_factory must be a type, got %.200s",
+                     Py_TYPE(factory)->tp_name);
+        return NULL;
+    }
+
+    type = (PyTypeObject *)factory;
+    if (type->tp_new == NULL) {
+        PyErr_Format(PyExc_TypeError,
+                     "cannot create '%.200s' instances", type->tp_name);
+        return NULL;
+    }
+
+    /* Instances are created without calling __init__, the values
+       are assigned to the attributes named after the columns. */
+    args = PyTuple_New(0);
+    if (args == NULL) {
+        return NULL;
+    }
+    row = type->tp_new(type, args, NULL);
+    Py_DECREF(args);
+    if (row == NULL) {
+        return NULL;
+    }
+
+    for (i = 0; i < n; i++) {
+        if (PyObject_SetAttr(row, PyTuple_GET_ITEM(keys, i),
+                             PyTuple_GET_ITEM(values, i)) < 0) {
+            Py_DECREF(row);
+            return NULL;
+        }
+    }
+
+    return row;
+}
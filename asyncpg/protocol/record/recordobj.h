@@ -48,5 +48,6 @@ extern PyTypeObject ApgRecordDesc_Type;
 PyTypeObject *ApgRecord_InitTypes(void);
 PyObject *ApgRecord_New(PyObject *, Py_ssize_t);
 PyObject *ApgRecordDesc_New(PyObject *, PyObject *);
+PyObject *ApgRecordDesc_MakeRow(PyObject *, PyObject *, PyObject *);
 
 #endif
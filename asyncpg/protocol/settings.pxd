@@ -5,6 +5,12 @@
 # the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
 
 
+cdef enum NumericFormat:
+    NUMERIC_FORMAT_DECIMAL = 0
+    NUMERIC_FORMAT_FLOAT = 1
+    NUMERIC_FORMAT_INT = 2
+
+
 cdef class ConnectionSettings:
     cdef:
         str _encoding
@@ -12,6 +18,13 @@ cdef class ConnectionSettings:
         dict _settings
         bint _is_utf8
         DataCodecConfig _data_codecs
+        set _interned_types
+        set _typed_array_types
+        object _json_encoder
+        object _json_decoder
+        bint _json_raw_bytes
+        NumericFormat _numeric_format
+        int32_t _numeric_scale
 
     cdef add_setting(self, str name, str val)
     cdef inline is_encoding_utf8(self)
@@ -19,9 +32,17 @@ cdef class ConnectionSettings:
     cpdef inline register_data_types(self, types)
     cpdef inline add_python_codec(
         self, typeoid, typename, typeschema, typekind, encoder,
-        decoder, format)
+        decoder, format, batch=*)
     cpdef inline remove_python_codec(
         self, typeoid, typename, typeschema)
     cpdef inline set_builtin_type_codec(
         self, typeoid, typename, typeschema, typekind, alias_to)
+    cpdef inline set_type_interning(
+        self, typeoid, typename, typeschema, typekind, bint enabled)
+    cdef inline bint is_type_interned(self, uint32_t oid)
+    cpdef inline set_typed_array_decoding(
+        self, typeoid, typename, typeschema, bint enabled)
+    cdef inline bint is_typed_array_decoding(self, uint32_t elem_oid)
+    cpdef inline set_json_codec(self, encoder, decoder, bint raw_bytes)
+    cpdef inline set_numeric_format(self, format, scale)
     cpdef inline Codec get_data_codec(self, uint32_t oid, ServerDataFormat format=*)
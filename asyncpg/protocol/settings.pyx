@@ -14,6 +14,12 @@ cdef class ConnectionSettings:
         self._settings = {}
         self._codec = codecs.lookup('utf-8')
         self._data_codecs = DataCodecConfig(conn_key)
+        self._interned_types = set()
+        self._typed_array_types = set()
+        self._json_encoder = self._json_decoder = None
+        self._json_raw_bytes = False
+        self._numeric_format = NUMERIC_FORMAT_DECIMAL
+        self._numeric_scale = 0
 
     cdef add_setting(self, str name, str val):
         self._settings[name] = val
@@ -33,7 +39,8 @@ cdef class ConnectionSettings:
         self._data_codecs.add_types(types)
 
     cpdef inline add_python_codec(self, typeoid, typename, typeschema,
-                                  typekind, encoder, decoder, format):
+                                  typekind, encoder, decoder, format,
+                                  batch=False):
         cdef:
             ServerDataFormat _format
             ClientExchangeFormat xformat
@@ -55,7 +62,7 @@ cdef class ConnectionSettings:
 
         self._data_codecs.add_python_codec(typeoid, typename, typeschema,
                                            typekind, encoder, decoder,
-                                           _format, xformat)
+                                           _format, xformat, batch)
 
     cpdef inline remove_python_codec(self, typeoid, typename, typeschema):
         self._data_codecs.remove_python_codec(typeoid, typename, typeschema)
@@ -65,6 +72,69 @@ cdef class ConnectionSettings:
         self._data_codecs.set_builtin_type_codec(typeoid, typename, typeschema,
                                           typekind, alias_to)
 
+    cpdef inline set_type_interning(self, typeoid, typename, typeschema,
+                                    typekind, bint enabled):
+        if (typekind != 'enum' and
+                typeoid not in (NAMEOID, BPCHAROID, VARCHAROID, TEXTOID)):
+            raise ValueError(
+                'cannot intern values of non-text type {}.{}'.format(
+                    typeschema, typename))
+
+        if enabled:
+            self._interned_types.add(typeoid)
+        else:
+            self._interned_types.discard(typeoid)
+
+    cdef inline bint is_type_interned(self, uint32_t oid):
+        return oid in self._interned_types
+
+    cpdef inline set_typed_array_decoding(self, typeoid, typename,
+                                          typeschema, bint enabled):
+        if _typed_array_typecode(typeoid) is None:
+            raise ValueError(
+                'typed array decoding is not supported for type {}.{}'.format(
+                    typeschema, typename))
+
+        if enabled:
+            self._typed_array_types.add(typeoid)
+        else:
+            self._typed_array_types.discard(typeoid)
+
+    cdef inline bint is_typed_array_decoding(self, uint32_t elem_oid):
+        return (self._typed_array_types and
+                elem_oid in self._typed_array_types)
+
+    cpdef inline set_json_codec(self, encoder, decoder, bint raw_bytes):
+        if encoder is not None and not callable(encoder):
+            raise TypeError('json encoder must be callable or None')
+        if decoder is not None and not callable(decoder):
+            raise TypeError('json decoder must be callable or None')
+
+        self._json_encoder = encoder
+        self._json_decoder = decoder
+        self._json_raw_bytes = raw_bytes
+
+    cpdef inline set_numeric_format(self, format, scale):
+        if format == 'decimal':
+            self._numeric_format = NUMERIC_FORMAT_DECIMAL
+        elif format == 'float':
+            self._numeric_format = NUMERIC_FORMAT_FLOAT
+        elif format == 'int':
+            self._numeric_format = NUMERIC_FORMAT_INT
+        else:
+            raise ValueError(
+                'invalid `format` argument, expected {}, got {!r}'.format(
+                    "'decimal', 'float' or 'int'", format
+                ))
+
+        if (not isinstance(scale, int) or isinstance(scale, bool) or
+                scale < 0 or scale > 0x3FFF):
+            raise ValueError(
+                'invalid `scale` argument: expected an integer between '
+                '0 and 16383, got {!r}'.format(scale))
+
+        self._numeric_scale = scale
+
     cpdef inline Codec get_data_codec(self, uint32_t oid,
                                       ServerDataFormat format=PG_FORMAT_ANY):
         if format == PG_FORMAT_ANY:
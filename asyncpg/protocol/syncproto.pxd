@@ -0,0 +1,31 @@
+# Copyright (C) 2016-present the asyncpg authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of asyncpg and is released under
+# the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
+
+
+cdef class BaseSyncProtocol(CoreProtocol):
+
+    cdef:
+        object address
+        ConnectionSettings settings
+        object connection
+        object sock
+        bint closing
+
+        # The outcome of the current operation, set by _on_result().
+        bint result_ready
+        object result_value
+        object result_exc
+
+        bint return_extra
+        str last_query
+
+        readonly uint64_t queries_count
+
+        PreparedStatementState statement
+
+    cdef _check_state(self)
+    cdef _wait(self, timeout)
+    cdef _lost(self, exc)
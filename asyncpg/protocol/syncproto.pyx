@@ -0,0 +1,327 @@
+# Copyright (C) 2016-present the asyncpg authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of asyncpg and is released under
+# the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
+
+
+# The number of bytes requested from the socket at once.
+cdef int SYNC_RECV_SIZE = 65536
+
+
+class _SocketTransport:
+    # The part of the asyncio transport interface used by
+    # CoreProtocol, on top of a blocking socket.
+
+    def __init__(self, sock):
+        self._sock = sock
+
+    def write(self, data):
+        self._sock.sendall(data)
+
+    def get_extra_info(self, name, default=None):
+        if name == 'socket':
+            return self._sock
+        return default
+
+    def close(self):
+        self._sock.close()
+
+    def abort(self):
+        self._sock.close()
+
+
+cdef class BaseSyncProtocol(CoreProtocol):
+    # Drives CoreProtocol over a blocking socket: every operation
+    # writes its messages and then reads from the socket until the
+    # result is pushed.
+
+    def __init__(self, addr, con_params):
+        # type of `con_params` is `_ConnectionParameters`
+        CoreProtocol.__init__(self, con_params)
+
+        self.address = addr
+        self.settings = ConnectionSettings((self.address, con_params.database))
+
+        self.connection = None
+        self.sock = None
+        self.closing = False
+
+        self.result_ready = False
+        self.result_value = None
+        self.result_exc = None
+
+        self.statement = None
+        self.return_extra = False
+        self.last_query = None
+
+        self.queries_count = 0
+
+    def set_connection(self, connection):
+        self.connection = connection
+
+    def get_server_pid(self):
+        return self.backend_pid
+
+    def get_settings(self):
+        return self.settings
+
+    def is_in_transaction(self):
+        # PQTRANS_INTRANS = idle, within transaction block
+        # PQTRANS_INERROR = idle, within failed transaction
+        return self.xact_status in (PQTRANS_INTRANS, PQTRANS_INERROR)
+
+    def is_closed(self):
+        return self.closing
+
+    def connect(self, sock, timeout):
+        self.sock = sock
+        self.transport = _SocketTransport(sock)
+        self.result_ready = False
+        self._connect()
+        return self._wait(timeout)
+
+    def prepare(self, stmt_name, query, timeout):
+        self._check_state()
+
+        self.last_query = query
+        self.statement = PreparedStatementState(
+            stmt_name, query, self, self.settings)
+        self._prepare(stmt_name, query)
+
+        return self._wait(timeout)
+
+    def bind_execute(self, PreparedStatementState state, args,
+                     str portal_name, int limit, return_extra, timeout):
+        cdef WriteBuffer bind_msg
+
+        self._check_state()
+        bind_msg = state._encode_bind_msg(portal_name, args)
+
+        self.last_query = state.query
+        self.statement = state
+        self.return_extra = return_extra
+        self.queries_count += 1
+        self._bind_execute(portal_name, bind_msg, limit)
+
+        return self._wait(timeout)
+
+    def bind_execute_many(self, PreparedStatementState state, args,
+                          str portal_name, timeout):
+        self._check_state()
+
+        # Make sure the argument sequence is encoded lazily with
+        # this generator expression to keep the memory pressure under
+        # control.
+        arg_bufs = iter(state._iter_bind_msgs(portal_name, args))
+
+        self.last_query = state.query
+        self.statement = state
+        self.return_extra = False
+        self.queries_count += 1
+        self._bind_execute_many(portal_name, arg_bufs)
+
+        return self._wait(timeout)
+
+    def query(self, query, timeout):
+        self._check_state()
+
+        self.last_query = query
+        self.queries_count += 1
+        self._simple_query(query)
+
+        return self._wait(timeout)
+
+    def close_statement(self, PreparedStatementState state, timeout):
+        self._check_state()
+
+        if state.refs != 0:
+            raise RuntimeError(
+                'cannot close prepared statement; refs == {} != 0'.format(
+                    state.refs))
+
+        self._close(state.name, False)
+        state.closed = True
+        return self._wait(timeout)
+
+    def defer_close_statement(self, PreparedStatementState state):
+        # Close the statement on the server along with the next
+        # statement prepared or executed, saving a round-trip.
+        if state.refs != 0:
+            raise RuntimeError(
+                'cannot close prepared statement; refs == {} != 0'.format(
+                    state.refs))
+
+        self._stmts_to_close.append(state.name)
+        state.closed = True
+
+    def close(self):
+        if self.closing:
+            return
+        self.closing = True
+
+        try:
+            if (self.con_status == CONNECTION_OK and
+                    self.state == PROTOCOL_IDLE):
+                self._terminate()
+        except OSError:
+            pass
+        finally:
+            self.con_status = CONNECTION_BAD
+            self.sock.close()
+
+    def abort(self):
+        if self.closing:
+            return
+        self.closing = True
+        self.con_status = CONNECTION_BAD
+        self.sock.close()
+
+    cdef _check_state(self):
+        if self.closing:
+            raise apg_exc.InterfaceError(
+                'cannot perform operation: connection is closed')
+        if self.state != PROTOCOL_IDLE:
+            raise apg_exc.InterfaceError(
+                'cannot perform operation: another operation is in progress')
+
+        self.result_ready = False
+        self.result_value = None
+        self.result_exc = None
+
+    cdef _wait(self, timeout):
+        cdef bint timed_out = False
+
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+
+        try:
+            while not self.result_ready:
+                if timeout is not None and not timed_out:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        remaining = 0.001
+                    self.sock.settimeout(remaining)
+
+                try:
+                    data = self.sock.recv(SYNC_RECV_SIZE)
+                except socket.timeout:
+                    if self.state == PROTOCOL_AUTH or self.connection is None:
+                        self.abort()
+                        raise asyncio.TimeoutError() from None
+
+                    # Cancel the query and wait for the server to
+                    # finish it, so that the connection stays usable.
+                    timed_out = True
+                    self.sock.settimeout(None)
+                    try:
+                        self.connection._cancel_current_command()
+                    except Exception:
+                        self.abort()
+                        raise
+                    self._set_state(PROTOCOL_CANCELLED)
+                    continue
+                except OSError as ex:
+                    self._lost(ex)
+
+                if not data:
+                    self._lost(None)
+
+                self.buffer.feed_data(data)
+                self._read_server_messages()
+        finally:
+            if timeout is not None and not self.closing:
+                self.sock.settimeout(None)
+
+        if timed_out:
+            raise asyncio.TimeoutError()
+
+        exc, self.result_exc = self.result_exc, None
+        if exc is not None:
+            raise exc
+
+        result, self.result_value = self.result_value, None
+        return result
+
+    cdef _lost(self, exc):
+        self.closing = True
+        self.con_status = CONNECTION_BAD
+        self._set_state(PROTOCOL_FAILED)
+        self.sock.close()
+
+        err = apg_exc.ConnectionDoesNotExistError(
+            'connection was closed in the middle of operation')
+        if exc is not None:
+            err.__cause__ = exc
+        raise err
+
+    cdef _on_result(self):
+        cdef ProtocolState state = self.state
+
+        self.result_ready = True
+        if state == PROTOCOL_CANCELLED:
+            # The result of a timed out operation is ignored.
+            return
+
+        try:
+            if self.result_type == RESULT_FAILED:
+                if isinstance(self.result, dict):
+                    self.result_exc = apg_exc_base.PostgresError.new(
+                        self.result, query=self.last_query)
+                else:
+                    self.result_exc = self.result
+
+            elif state == PROTOCOL_AUTH:
+                self.result_value = True
+
+            elif state == PROTOCOL_PREPARE:
+                if self.result_param_desc is not None:
+                    self.statement._set_args_desc(self.result_param_desc)
+                if self.result_row_desc is not None:
+                    self.statement._set_row_desc(self.result_row_desc)
+                self.result_value = self.statement
+
+            elif (state == PROTOCOL_BIND_EXECUTE or
+                    state == PROTOCOL_BIND_EXECUTE_MANY or
+                    state == PROTOCOL_EXECUTE):
+                if (self.result and self.statement is not None and
+                        self.statement.rows_batch_cols is not None):
+                    self.statement._batch_decode_rows(self.result)
+
+                if self.return_extra:
+                    self.result_value = (
+                        self.result,
+                        self.result_status_msg,
+                        self.result_execute_completed)
+                else:
+                    self.result_value = self.result
+
+            elif state == PROTOCOL_CLOSE_STMT_PORTAL:
+                self.result_value = self.result
+
+            elif state == PROTOCOL_SIMPLE_QUERY:
+                self.result_value = self.result_status_msg.decode(
+                    self.encoding)
+
+            else:
+                raise RuntimeError(
+                    'got result for unknown protocol state {}'.
+                    format(state))
+
+        except Exception as exc:
+            self.result_exc = exc
+
+        finally:
+            self.statement = None
+            self.last_query = None
+            self.return_extra = False
+
+    cdef _decode_row(self, const char* buf, ssize_t buf_len):
+        return self.statement._decode_row(buf, buf_len, False, None)
+
+    cdef _set_server_parameter(self, name, val):
+        self.settings.add_setting(name, val)
+
+
+class SyncProtocol(BaseSyncProtocol):
+    pass
@@ -0,0 +1,174 @@
+# Copyright (C) 2016-present the asyncpg authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of asyncpg and is released under
+# the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
+
+
+import collections
+import copy
+import time
+
+from . import exceptions
+from .protocol import Record
+
+
+__all__ = ('ResultCache',)
+
+
+class ResultCache:
+    """A client-side cache of query results.
+
+    A result cache is passed to :meth:`Connection.fetch()
+    <asyncpg.connection.Connection.fetch>` or :meth:`Pool.fetch()
+    <asyncpg.pool.Pool.fetch>` as the *cache* argument.  Results are
+    cached by the query text and the values and types of its arguments,
+    expire after *ttl* seconds and the least recently used entries are
+    evicted once the cache holds *max_size* results.
+
+    The cache can be invalidated by PostgreSQL notifications: once
+    :meth:`listen` is called, a ``NOTIFY`` on any of the given channels
+    clears the cache.
+
+    A cache is bound to the connection or the pool it is first used
+    with, as the results depend on the database, the role and the
+    settings of the session, and on the type codecs of the connection.
+    Using it with another connection or pool raises
+    :exc:`~asyncpg.exceptions.InterfaceError`.  The connections of a pool
+    are expected to be configured identically, e.g. in the *init*
+    callback of the pool.  Call :meth:`clear` after changing the type
+    codecs or the numeric format of the connection.
+
+    Cached results are shared by all callers and are not subject to
+    transaction isolation, so only cache the results of queries on
+    read-mostly data.  Each caller gets its own copies of rows created
+    by a ``dict`` or class *row_factory*, but the values in the rows,
+    e.g. the lists of array values, are shared and must not be modified.
+
+    :param int max_size: The maximum number of cached results.
+    :param float ttl: The number of seconds a result is cached for,
+                      ``None`` to keep results until they are evicted
+                      or invalidated.
+
+    .. versionadded:: 0.13.0
+    """
+
+    __slots__ = ('_max_size', '_ttl', '_entries', '_listeners', '_owner')
+
+    def __init__(self, *, max_size=1024, ttl=60.0):
+        if (isinstance(max_size, bool) or not isinstance(max_size, int) or
+                max_size <= 0):
+            raise ValueError(
+                'invalid max_size value: expected an int greater '
+                'than 0 (got {!r})'.format(max_size))
+
+        if ttl is not None and (not isinstance(ttl, (int, float)) or
+                                isinstance(ttl, bool) or ttl <= 0):
+            raise ValueError(
+                'invalid ttl value: expected None or a number greater '
+                'than 0 (got {!r})'.format(ttl))
+
+        self._max_size = max_size
+        self._ttl = ttl
+        # key -> (expiration time, rows), in LRU order; see
+        # _StatementCache in connection.py for details.
+        self._entries = collections.OrderedDict()
+        # (connection, channel) pairs this cache listens on.
+        self._listeners = set()
+        # The connection or pool the cached results come from.
+        self._owner = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_max_size(self):
+        return self._max_size
+
+    def get_ttl(self):
+        return self._ttl
+
+    def clear(self):
+        """Remove all results from the cache."""
+        self._entries.clear()
+
+    async def listen(self, connection, *channels):
+        """Clear the cache on notifications received on *channels*.
+
+        :param connection: A :class:`~asyncpg.connection.Connection`
+                           to listen on.  For pools, use a connection
+                           which is not returned to the pool, as
+                           listeners are removed on release.
+        :param str channels: Channel names.
+        """
+        for channel in channels:
+            if (connection, channel) in self._listeners:
+                continue
+            await connection.add_listener(channel, self._on_notification)
+            self._listeners.add((connection, channel))
+
+    async def unlisten(self, connection, *channels):
+        """Stop listening on *channels* added by :meth:`listen`."""
+        for channel in channels:
+            if (connection, channel) not in self._listeners:
+                continue
+            self._listeners.discard((connection, channel))
+            await connection.remove_listener(channel, self._on_notification)
+
+    def _on_notification(self, connection, pid, channel, payload):
+        self.clear()
+
+    def _check_owner(self, owner):
+        if self._owner is None:
+            self._owner = owner
+        elif self._owner is not owner:
+            raise exceptions.InterfaceError(
+                'the result cache is used by another connection or pool')
+
+    def _make_key(self, query, args, options):
+        # Equal arguments of different types, e.g. 1, True and
+        # Decimal('1.0'), may produce different results.
+        key = (query, args, _arg_types(args), options)
+        try:
+            hash(key)
+        except TypeError:
+            # Unhashable arguments, e.g. lists; such queries
+            # bypass the cache.
+            return None
+        return key
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires, rows = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key, last=True)
+        return _copy_rows(rows)
+
+    def _put(self, key, rows):
+        if self._ttl is None:
+            expires = None
+        else:
+            expires = time.monotonic() + self._ttl
+
+        self._entries[key] = (expires, _copy_rows(rows))
+        self._entries.move_to_end(key, last=True)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+
+def _copy_rows(rows):
+    if rows and type(rows[0]) not in (Record, tuple):
+        # Rows built by a dict or class row_factory are mutable.
+        return [copy.copy(row) for row in rows]
+    return list(rows)
+
+
+def _arg_types(args):
+    return tuple(_arg_types(arg) if type(arg) is tuple else type(arg)
+                 for arg in args)
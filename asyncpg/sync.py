@@ -0,0 +1,598 @@
+# Copyright (C) 2016-present the asyncpg authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of asyncpg and is released under
+# the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
+
+
+"""A blocking interface to PostgreSQL for thread-based code.
+
+Connections are driven over regular sockets without an event loop, and
+share the protocol implementation, data codecs and
+:class:`~asyncpg.Record` objects with the asyncio API.
+
+.. code-block:: python
+
+    import asyncpg.sync
+
+    con = asyncpg.sync.connect(user='postgres')
+    try:
+        with con.transaction():
+            con.execute('INSERT INTO mytab (a) VALUES ($1)', 10)
+        rows = con.fetch('SELECT * FROM mytab')
+    finally:
+        con.close()
+
+A connection must not be used by several threads at once.
+"""
+
+
+import asyncio
+import socket
+import ssl as ssl_module
+import struct
+import time
+
+from . import connect_utils
+from . import connection as _connection
+from . import exceptions
+from . import introspection
+from . import protocol
+from . import serverversion
+from . import transaction as _transaction
+
+
+__all__ = ('connect', 'Connection', 'Transaction')
+
+
+class Connection:
+    """A blocking representation of a database session.
+
+    Connections are created by calling :func:`~asyncpg.sync.connect`.
+    Unlike :class:`asyncpg.connection.Connection`, their methods block
+    the calling thread until the operation completes.
+
+    .. versionadded:: 0.13.0
+    """
+
+    __slots__ = ('_protocol', '_addr', '_config', '_params', '_stmt_cache',
+                 '_server_version', '_simple_intro_query', '_intro_query',
+                 '_simple_types_stmt', '_types_stmt', '_top_xact', '_uid')
+
+    def __init__(self, protocol, addr, config, params):
+        self._protocol = protocol
+        self._addr = addr
+        self._config = config
+        self._params = params
+        self._top_xact = None
+        self._uid = 0
+        self._simple_types_stmt = None
+        self._types_stmt = None
+
+        self._stmt_cache = _connection._StatementCache(
+            loop=None,
+            max_size=config.statement_cache_size,
+            on_remove=self._maybe_gc_stmt,
+            max_lifetime=0,
+            policy=config.statement_cache_policy)
+
+        settings = self._protocol.get_settings()
+        self._server_version = \
+            serverversion.split_server_version_string(settings.server_version)
+
+        self._simple_intro_query, self._intro_query = \
+            introspection.get_lookup_queries(self._server_version)
+
+    def get_server_pid(self):
+        """Return the PID of the Postgres server the connection is bound to."""
+        return self._protocol.get_server_pid()
+
+    def get_server_version(self):
+        """Return the version of the connected PostgreSQL server.
+
+        See :meth:`Connection.get_server_version()
+        <asyncpg.connection.Connection.get_server_version>`.
+        """
+        return self._server_version
+
+    def get_settings(self):
+        """Return connection settings.
+
+        :return: :class:`~asyncpg.ConnectionSettings`.
+        """
+        return self._protocol.get_settings()
+
+    def is_in_transaction(self):
+        """Return True if Connection is currently inside a transaction.
+
+        :return bool: True if inside transaction, False otherwise.
+        """
+        return self._protocol.is_in_transaction()
+
+    def is_closed(self):
+        """Return ``True`` if the connection is closed, ``False`` otherwise.
+        """
+        return self._protocol.is_closed()
+
+    def transaction(self, *, isolation='read_committed', readonly=False,
+                    deferrable=False):
+        """Create a :class:`~asyncpg.sync.Transaction` object.
+
+        Use it as a context manager:
+
+        .. code-block:: python
+
+            with con.transaction():
+                con.execute(...)
+
+        Nested transaction blocks use savepoints.  See
+        :meth:`Connection.transaction()
+        <asyncpg.connection.Connection.transaction>` for the arguments.
+        """
+        self._check_open()
+        return Transaction(self, isolation, readonly, deferrable)
+
+    def execute(self, query: str, *args, timeout: float=None) -> str:
+        """Execute an SQL command (or commands).
+
+        :param args: Query arguments.
+        :param float timeout: Optional timeout value in seconds.
+        :return str: Status of the last SQL command.
+        """
+        self._check_open()
+
+        if not args:
+            return self._protocol.query(query, self._get_timeout(timeout))
+
+        _, status, _ = self._execute(query, args, 0, timeout, True)
+        return status.decode()
+
+    def executemany(self, command: str, args, *, timeout: float=None):
+        """Execute an SQL *command* for each sequence of arguments in *args*.
+
+        :param command: Command to execute.
+        :param args: An iterable containing sequences of arguments.
+        :param float timeout: Optional timeout value in seconds.
+        :return None: This method discards the results of the operations.
+        """
+        self._check_open()
+        executor = lambda stmt, timeout: self._protocol.bind_execute_many(
+            stmt, args, '', timeout)
+        return self._do_execute(command, executor, timeout)
+
+    def fetch(self, query, *args, timeout=None) -> list:
+        """Run a query and return the results as a list of
+        :class:`~asyncpg.Record`.
+
+        :param str query: Query text.
+        :param args: Query arguments.
+        :param float timeout: Optional timeout value in seconds.
+        :return list: A list of :class:`~asyncpg.Record` instances.
+        """
+        self._check_open()
+        return self._execute(query, args, 0, timeout)
+
+    def fetchval(self, query, *args, column=0, timeout=None):
+        """Run a query and return a value in the first row.
+
+        :param str query: Query text.
+        :param args: Query arguments.
+        :param int column: Numeric index within the record of the value to
+                           return (defaults to 0).
+        :param float timeout: Optional timeout value in seconds.
+        :return: The value of the specified column of the first record, or
+                 None if no records were returned by the query.
+        """
+        self._check_open()
+        data = self._execute(query, args, 1, timeout)
+        if not data:
+            return None
+        return data[0][column]
+
+    def fetchrow(self, query, *args, timeout=None):
+        """Run a query and return the first row.
+
+        :param str query: Query text
+        :param args: Query arguments
+        :param float timeout: Optional timeout value in seconds.
+        :return: The first row as a :class:`~asyncpg.Record` instance,
+                 or None if no records were returned by the query.
+        """
+        self._check_open()
+        data = self._execute(query, args, 1, timeout)
+        if not data:
+            return None
+        return data[0]
+
+    def get_statement_cache_stats(self):
+        """Return the statistics of the statement cache.
+
+        See :meth:`Connection.get_statement_cache_stats()
+        <asyncpg.connection.Connection.get_statement_cache_stats>`.
+        """
+        return self._stmt_cache.get_stats()
+
+    def close(self):
+        """Close the connection gracefully."""
+        self._stmt_cache.clear()
+        self._protocol.close()
+
+    def terminate(self):
+        """Terminate the connection without waiting for pending data."""
+        self._stmt_cache.clear()
+        self._protocol.abort()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _check_open(self):
+        if self.is_closed():
+            raise exceptions.InterfaceError('connection is closed')
+
+    def _get_unique_id(self, prefix):
+        self._uid += 1
+        return '__asyncpg_{}_{}__'.format(prefix, self._uid)
+
+    def _get_timeout(self, timeout):
+        if timeout is None:
+            return self._config.command_timeout
+
+        try:
+            if type(timeout) is bool:
+                raise ValueError
+            timeout = float(timeout)
+        except ValueError:
+            raise ValueError(
+                'invalid timeout value: expected non-negative float '
+                '(got {!r})'.format(timeout)) from None
+
+        if timeout <= 0:
+            raise asyncio.TimeoutError()
+        return timeout
+
+    def _get_statement(self, query, timeout):
+        statement = self._stmt_cache.get(query)
+        if statement is not None:
+            return statement
+
+        # Only use the cache when:
+        #  * `statement_cache_size` is greater than 0;
+        #  * query size is less than `max_cacheable_statement_size`.
+        use_cache = self._stmt_cache.get_max_size() > 0
+        if (use_cache and
+                self._config.max_cacheable_statement_size and
+                len(query) > self._config.max_cacheable_statement_size):
+            use_cache = False
+
+        if use_cache and not self._stmt_cache.admit(query):
+            use_cache = False
+
+        if use_cache:
+            stmt_name = self._get_unique_id('stmt')
+        else:
+            stmt_name = ''
+
+        started = time.monotonic()
+        statement = self._protocol.prepare(stmt_name, query, timeout)
+
+        ready = statement._init_types()
+        if ready is not True:
+            types = self._introspect_types(ready)
+            self._protocol.get_settings().register_data_types(types)
+
+        if use_cache:
+            self._stmt_cache.put(query, statement,
+                                 cost=time.monotonic() - started)
+
+        return statement
+
+    def _introspect_types(self, typeoids):
+        args = (list(typeoids),)
+
+        if self._simple_intro_query is not None:
+            # Try the cheap query first, it is enough unless
+            # there are composite or domain types involved.
+            if self._simple_types_stmt is None:
+                self._simple_types_stmt = self._prepare_intro_query(
+                    self._simple_intro_query)
+
+            types = self._protocol.bind_execute(
+                self._simple_types_stmt, args, '', 0, False, None)
+            if all(map(introspection.is_simple_type, types)):
+                return types
+
+        if self._types_stmt is None:
+            self._types_stmt = self._prepare_intro_query(self._intro_query)
+
+        return self._protocol.bind_execute(
+            self._types_stmt, args, '', 0, False, None)
+
+    def _prepare_intro_query(self, query):
+        stmt = self._protocol.prepare(self._get_unique_id('stmt'), query, None)
+        stmt._init_types()
+        return stmt
+
+    def _execute(self, query, args, limit, timeout, return_status=False):
+        executor = lambda stmt, timeout: self._protocol.bind_execute(
+            stmt, args, '', limit, return_status, timeout)
+        return self._do_execute(query, executor, timeout)
+
+    def _do_execute(self, query, executor, timeout, retry=True):
+        timeout = self._get_timeout(timeout)
+
+        if timeout is None:
+            stmt = self._get_statement(query, None)
+        else:
+            before = time.monotonic()
+            stmt = self._get_statement(query, timeout)
+            timeout -= time.monotonic() - before
+            if timeout <= 0:
+                raise asyncio.TimeoutError()
+
+        try:
+            return executor(stmt, timeout)
+        except exceptions.InvalidCachedStatementError:
+            # See Connection._do_execute() in asyncpg.connection.
+            self._stmt_cache.clear()
+
+            if self._protocol.is_in_transaction() or not retry:
+                raise
+
+            return self._do_execute(query, executor, timeout, retry=False)
+
+    def _maybe_gc_stmt(self, stmt):
+        if stmt.refs == 0 and not self._stmt_cache.has(stmt.query):
+            # The statement is closed on the server along with
+            # the next statement sent.
+            self._protocol.defer_close_statement(stmt)
+
+    def _cancel_current_command(self):
+        # Called by the protocol when an operation times out.
+        sock = _open_socket(self._addr, self._params,
+                            self._params.connect_timeout)
+        try:
+            # Pack CancelRequest message
+            sock.sendall(struct.pack('!llll', 16, 80877102,
+                                     self._protocol.backend_pid,
+                                     self._protocol.backend_secret))
+            while sock.recv(1024):  # Wait until EOF
+                pass
+        except ConnectionResetError:
+            # On some systems Postgres will reset the connection
+            # after processing the cancellation command.
+            pass
+        finally:
+            sock.close()
+
+    def __repr__(self):
+        return '<asyncpg.sync.Connection pid:{} at 0x{:x}>'.format(
+            self.get_server_pid(), id(self))
+
+
+class Transaction:
+    """A blocking transaction or savepoint block.
+
+    Transactions are created by calling the
+    :meth:`Connection.transaction() <asyncpg.sync.Connection.transaction>`
+    function.
+
+    .. versionadded:: 0.13.0
+    """
+
+    __slots__ = ('_connection', '_isolation', '_readonly', '_deferrable',
+                 '_state', '_nested', '_id')
+
+    def __init__(self, connection, isolation, readonly, deferrable):
+        _transaction._check_isolation(isolation, readonly, deferrable)
+
+        self._connection = connection
+        self._isolation = isolation
+        self._readonly = readonly
+        self._deferrable = deferrable
+        self._state = _transaction.TransactionState.NEW
+        self._nested = False
+        self._id = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, extype, ex, tb):
+        if extype is not None:
+            self.rollback()
+        else:
+            self.commit()
+
+    def start(self):
+        """Enter the transaction or savepoint block."""
+        if self._state is not _transaction.TransactionState.NEW:
+            raise exceptions.InterfaceError(
+                'cannot start; the transaction is already {}'.format(
+                    self._state.name.lower()))
+
+        con = self._connection
+
+        if con._top_xact is None:
+            if con.is_in_transaction():
+                raise exceptions.InterfaceError(
+                    'cannot use Connection.transaction() in '
+                    'a manually started transaction')
+            query = _transaction._make_begin_query(
+                self._isolation, self._readonly, self._deferrable)
+        else:
+            # Nested transaction block
+            top_xact = con._top_xact
+            if self._isolation != top_xact._isolation:
+                raise exceptions.InterfaceError(
+                    'nested transaction has a different isolation level: '
+                    'current {!r} != outer {!r}'.format(
+                        self._isolation, top_xact._isolation))
+            self._nested = True
+            self._id = con._get_unique_id('savepoint')
+            query = 'SAVEPOINT {};'.format(self._id)
+
+        try:
+            con.execute(query)
+        except BaseException:
+            self._state = _transaction.TransactionState.FAILED
+            raise
+        else:
+            if con._top_xact is None:
+                con._top_xact = self
+            self._state = _transaction.TransactionState.STARTED
+
+    def commit(self):
+        """Exit the transaction or savepoint block and commit changes."""
+        if self._nested:
+            query = 'RELEASE SAVEPOINT {};'.format(self._id)
+        else:
+            query = 'COMMIT;'
+        self._finish('commit', query,
+                     _transaction.TransactionState.COMMITTED)
+
+    def rollback(self):
+        """Exit the transaction or savepoint block and rollback changes."""
+        if self._nested:
+            query = 'ROLLBACK TO {};'.format(self._id)
+        else:
+            query = 'ROLLBACK;'
+        self._finish('rollback', query,
+                     _transaction.TransactionState.ROLLEDBACK)
+
+    def _finish(self, opname, query, state):
+        if self._state is not _transaction.TransactionState.STARTED:
+            raise exceptions.InterfaceError(
+                'cannot {}; the transaction is {}'.format(
+                    opname, self._state.name.lower()))
+
+        con = self._connection
+        if con._top_xact is self:
+            con._top_xact = None
+
+        try:
+            con.execute(query)
+        except BaseException:
+            self._state = _transaction.TransactionState.FAILED
+            raise
+        else:
+            self._state = state
+
+
+def connect(dsn=None, *,
+            host=None, port=None,
+            user=None, password=None,
+            database=None,
+            timeout=60,
+            statement_cache_size=100,
+            max_cacheable_statement_size=1024 * 15,
+            statement_cache_policy='lru',
+            command_timeout=None,
+            ssl=None,
+            server_settings=None):
+    r"""Establish a blocking connection to a PostgreSQL server.
+
+    Returns a new :class:`~asyncpg.sync.Connection` object.  The
+    arguments have the same meaning as for
+    :func:`asyncpg.connection.connect`.
+
+    Example:
+
+    .. code-block:: pycon
+
+        >>> import asyncpg.sync
+        >>> con = asyncpg.sync.connect(user='postgres')
+        >>> con.fetchval('SELECT 1')
+        1
+
+    Connections only support the commands, queries and transactions of
+    the :class:`~asyncpg.sync.Connection` class: ``COPY``, cursors,
+    notifications and custom type codecs are only available with the
+    asyncio API.
+
+    .. versionadded:: 0.13.0
+    """
+    addrs, params, config = connect_utils._parse_connect_arguments(
+        dsn=dsn, host=host, port=port, user=user, password=password,
+        database=database, timeout=timeout, command_timeout=command_timeout,
+        statement_cache_size=statement_cache_size,
+        max_cached_statement_lifetime=0,
+        max_cacheable_statement_size=max_cacheable_statement_size,
+        statement_cache_policy=statement_cache_policy, preload_types=None,
+        max_result_rows=0, max_result_size=0,
+        ssl=ssl, server_settings=server_settings)
+
+    last_error = None
+    for addr in addrs:
+        before = time.monotonic()
+        try:
+            return _connect_addr(addr, params, config, timeout)
+        except (OSError, asyncio.TimeoutError, ConnectionError) as ex:
+            last_error = ex
+        finally:
+            timeout -= time.monotonic() - before
+
+    raise last_error
+
+
+def _connect_addr(addr, params, config, timeout):
+    if timeout <= 0:
+        raise asyncio.TimeoutError
+
+    before = time.monotonic()
+    sock = _open_socket(addr, params, timeout)
+    timeout -= time.monotonic() - before
+
+    proto = protocol.SyncProtocol(addr, params)
+    try:
+        if timeout <= 0:
+            raise asyncio.TimeoutError
+        proto.connect(sock, timeout)
+    except Exception:
+        proto.abort()
+        raise
+
+    con = Connection(proto, addr, config, params)
+    proto.set_connection(con)
+    return con
+
+
+def _open_socket(addr, params, timeout):
+    try:
+        if isinstance(addr, str):
+            # UNIX socket
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.settimeout(timeout)
+                sock.connect(addr)
+            except Exception:
+                sock.close()
+                raise
+        else:
+            sock = socket.create_connection(addr, timeout)
+            try:
+                connect_utils._set_nodelay(sock)
+                if params.ssl:
+                    # SSLRequest message.
+                    sock.sendall(struct.pack('!ll', 8, 80877103))
+                    if sock.recv(1) != b'S':
+                        raise ConnectionError(
+                            'PostgreSQL server at "{}:{}" rejected SSL '
+                            'upgrade'.format(*addr))
+                    ssl_context = params.ssl
+                    if not isinstance(ssl_context, ssl_module.SSLContext):
+                        # ssl=True: verify the server certificate and
+                        # host name, like asyncio does.
+                        ssl_context = ssl_module.create_default_context()
+                    sock = ssl_context.wrap_socket(
+                        sock, server_hostname=addr[0])
+            except Exception:
+                sock.close()
+                raise
+    except socket.timeout:
+        raise asyncio.TimeoutError from None
+
+    sock.settimeout(None)
+    return sock
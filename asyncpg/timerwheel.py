@@ -0,0 +1,178 @@
+# Copyright (C) 2016-present the asyncpg authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of asyncpg and is released under
+# the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
+
+
+import asyncio
+import math
+import time
+import weakref
+
+from . import compat
+
+
+# Timers fire at most this many seconds late.
+TIMER_RESOLUTION = 0.05
+
+# Event loops run timers which are due within the clock resolution.
+_CLOCK_RESOLUTION = time.get_clock_info('monotonic').resolution
+
+
+class TimerHandle:
+    """A timer scheduled by :meth:`TimerWheel.call_later`."""
+
+    __slots__ = ('_wheel', '_tick', '_callback', '_args', '_cancelled')
+
+    def __init__(self, wheel, tick, callback, args):
+        self._wheel = wheel
+        self._tick = tick
+        self._callback = callback
+        self._args = args
+        self._cancelled = False
+
+    def cancel(self):
+        if not self._cancelled:
+            self._cancelled = True
+            if self._wheel is not None:
+                self._wheel._remove(self)
+                self._wheel = None
+            self._callback = self._args = None
+
+    def cancelled(self):
+        return self._cancelled
+
+    def _run(self):
+        if not self._cancelled:
+            callback, args = self._callback, self._args
+            self._callback = self._args = None
+            callback(*args)
+
+
+class TimerWheel:
+    """A coarse-grained timer facility for timeouts.
+
+    Timers are bucketed by their deadline rounded up to
+    :data:`TIMER_RESOLUTION`, which makes scheduling and cancellation
+    simple dict operations.  Only a single event loop timer is used to
+    wake up at the earliest deadline.  This suits timeouts, which are
+    set for nearly every operation but rarely expire.
+    """
+
+    __slots__ = ('_loop', '_slots', '_handle', '_handle_tick')
+
+    def __init__(self, loop):
+        self._loop = loop
+        # tick -> set of TimerHandles
+        self._slots = {}
+        self._handle = None
+        self._handle_tick = 0
+
+    def call_later(self, delay, callback, *args):
+        """Arrange for *callback* to be called after at least *delay*
+        seconds.
+
+        Returns a :class:`TimerHandle` instance.
+        """
+        tick = math.ceil((self._loop.time() + delay) / TIMER_RESOLUTION)
+        handle = TimerHandle(self, tick, callback, args)
+
+        slot = self._slots.get(tick)
+        if slot is None:
+            slot = self._slots[tick] = set()
+        slot.add(handle)
+
+        if self._handle is None or tick < self._handle_tick:
+            self._schedule(tick)
+
+        return handle
+
+    def _remove(self, handle):
+        slot = self._slots.get(handle._tick)
+        if slot is not None:
+            slot.discard(handle)
+            if not slot:
+                del self._slots[handle._tick]
+        # The loop timer is left as is, if it fires early it is
+        # simply rescheduled.
+
+    def _schedule(self, tick):
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle_tick = tick
+        self._handle = self._loop.call_at(
+            tick * TIMER_RESOLUTION, self._on_tick)
+
+    def _on_tick(self):
+        self._handle = None
+        now = self._loop.time() + _CLOCK_RESOLUTION
+
+        due = [tick for tick in self._slots
+               if tick * TIMER_RESOLUTION <= now]
+        due.sort()
+        for tick in due:
+            for handle in self._slots.pop(tick):
+                handle._wheel = None
+                self._loop.call_soon(handle._run)
+
+        if self._slots:
+            self._schedule(min(self._slots))
+
+
+_wheels = weakref.WeakKeyDictionary()
+
+
+def get_timer_wheel(loop):
+    """Return the :class:`TimerWheel` shared by the users of *loop*."""
+    try:
+        return _wheels[loop]
+    except KeyError:
+        wheel = _wheels[loop] = TimerWheel(loop)
+        return wheel
+    except TypeError:
+        # The loop does not support weak references.
+        return TimerWheel(loop)
+
+
+class timeout:
+    """Raise :exc:`asyncio.TimeoutError` if the enclosed block
+    does not complete in *delay* seconds.
+
+    Unlike :func:`asyncio.wait_for`, does not create a new task: the
+    current task is cancelled when the deadline is reached.
+    """
+
+    __slots__ = ('_delay', '_loop', '_task', '_handle', '_expired')
+
+    def __init__(self, delay, *, loop):
+        self._delay = delay
+        self._loop = loop
+        self._task = None
+        self._handle = None
+        self._expired = False
+
+    def __enter__(self):
+        if self._delay is None:
+            return self
+
+        self._task = compat.current_asyncio_task(self._loop)
+        if self._task is None:
+            raise RuntimeError('timeout() must be used inside a task')
+
+        self._handle = get_timer_wheel(self._loop).call_later(
+            self._delay, self._on_timeout)
+        return self
+
+    def __exit__(self, et, e, tb):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._task = None
+
+        if et is asyncio.CancelledError and self._expired:
+            raise asyncio.TimeoutError() from None
+
+    def _on_timeout(self):
+        self._expired = True
+        self._task.cancel()
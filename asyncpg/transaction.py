@@ -5,7 +5,10 @@
 # the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
 
 
+import asyncio
+import collections
 import enum
+import random
 
 from . import exceptions as apg_errors
 
@@ -20,6 +23,14 @@ class TransactionState(enum.Enum):
 
 ISOLATION_LEVELS = {'read_committed', 'serializable', 'repeatable_read'}
 
+# Errors after which a transaction can be retried.
+RETRYABLE_ERRORS = (apg_errors.SerializationError,
+                    apg_errors.DeadlockDetectedError)
+
+
+TransactionStats = collections.namedtuple(
+    'TransactionStats', ['runs', 'retries', 'failures'])
+
 
 class Transaction:
     """Represents a transaction or savepoint block.
@@ -30,24 +41,12 @@ class Transaction:
     """
 
     __slots__ = ('_connection', '_isolation', '_readonly', '_deferrable',
-                 '_state', '_nested', '_id', '_managed')
-
-    def __init__(self, connection, isolation, readonly, deferrable):
-        if isolation not in ISOLATION_LEVELS:
-            raise ValueError(
-                'isolation is expected to be either of {}, '
-                'got {!r}'.format(ISOLATION_LEVELS, isolation))
-
-        if isolation != 'serializable':
-            if readonly:
-                raise ValueError(
-                    '"readonly" is only supported for '
-                    'serializable transactions')
+                 '_state', '_nested', '_id', '_managed', '_lazy',
+                 '_start_query')
 
-            if deferrable and not readonly:
-                raise ValueError(
-                    '"deferrable" is only supported for '
-                    'serializable readonly transactions')
+    def __init__(self, connection, isolation, readonly, deferrable,
+                 lazy=False):
+        _check_isolation(isolation, readonly, deferrable)
 
         self._connection = connection
         self._isolation = isolation
@@ -57,6 +56,8 @@ class Transaction:
         self._nested = False
         self._id = None
         self._managed = False
+        self._lazy = lazy
+        self._start_query = None
 
     async def __aenter__(self):
         if self._managed:
@@ -103,17 +104,15 @@ class Transaction:
             self._id = con._get_unique_id('savepoint')
             query = 'SAVEPOINT {};'.format(self._id)
         else:
-            if self._isolation == 'read_committed':
-                query = 'BEGIN;'
-            elif self._isolation == 'repeatable_read':
-                query = 'BEGIN ISOLATION LEVEL REPEATABLE READ;'
-            else:
-                query = 'BEGIN ISOLATION LEVEL SERIALIZABLE'
-                if self._readonly:
-                    query += ' READ ONLY'
-                if self._deferrable:
-                    query += ' DEFERRABLE'
-                query += ';'
+            query = _make_begin_query(
+                self._isolation, self._readonly, self._deferrable)
+
+        if self._lazy:
+            # The command is sent along with the next statement.
+            con._protocol.defer_xact_command(query)
+            self._start_query = query
+            self._state = TransactionState.STARTED
+            return
 
         try:
             await self._connection.execute(query)
@@ -145,12 +144,23 @@ class Transaction:
                         opname))
             self.__check_state_base(opname)
 
+    def __discard_start(self):
+        if self._start_query is None:
+            return False
+        query, self._start_query = self._start_query, None
+        return self._connection._protocol.discard_xact_command(query)
+
     async def __commit(self):
         self.__check_state('commit')
 
         if self._connection._top_xact is self:
             self._connection._top_xact = None
 
+        if self.__discard_start():
+            # Nothing was executed in the block.
+            self._state = TransactionState.COMMITTED
+            return
+
         if self._nested:
             query = 'RELEASE SAVEPOINT {};'.format(self._id)
         else:
@@ -170,6 +180,11 @@ class Transaction:
         if self._connection._top_xact is self:
             self._connection._top_xact = None
 
+        if self.__discard_start():
+            # Nothing was executed in the block.
+            self._state = TransactionState.ROLLEDBACK
+            return
+
         if self._nested:
             query = 'ROLLBACK TO {};'.format(self._id)
         else:
@@ -214,3 +229,90 @@ class Transaction:
 
         return '<{}.{} {} {:#x}>'.format(
             mod, self.__class__.__name__, ' '.join(attrs), id(self))
+
+
+class _TransactionCounters:
+    __slots__ = ('runs', 'retries', 'failures')
+
+    def __init__(self):
+        self.runs = 0
+        self.retries = 0
+        self.failures = 0
+
+    def get_stats(self):
+        return TransactionStats(self.runs, self.retries, self.failures)
+
+
+def _check_isolation(isolation, readonly, deferrable):
+    if isolation not in ISOLATION_LEVELS:
+        raise ValueError(
+            'isolation is expected to be either of {}, '
+            'got {!r}'.format(ISOLATION_LEVELS, isolation))
+
+    if isolation != 'serializable':
+        if readonly:
+            raise ValueError(
+                '"readonly" is only supported for '
+                'serializable transactions')
+
+        if deferrable and not readonly:
+            raise ValueError(
+                '"deferrable" is only supported for '
+                'serializable readonly transactions')
+
+
+def _make_begin_query(isolation, readonly, deferrable):
+    if isolation == 'read_committed':
+        query = 'BEGIN;'
+    elif isolation == 'repeatable_read':
+        query = 'BEGIN ISOLATION LEVEL REPEATABLE READ;'
+    else:
+        query = 'BEGIN ISOLATION LEVEL SERIALIZABLE'
+        if readonly:
+            query += ' READ ONLY'
+        if deferrable:
+            query += ' DEFERRABLE'
+        query += ';'
+    return query
+
+
+def _check_retry_options(retries, backoff, max_backoff):
+    if isinstance(retries, bool) or not isinstance(retries, int) or \
+            retries < 0:
+        raise ValueError(
+            'invalid retries value: expected an int greater or equal '
+            'to 0 (got {!r})'.format(retries))
+
+    for name, value in (('backoff', backoff), ('max_backoff', max_backoff)):
+        if isinstance(value, bool) or not isinstance(value, (int, float)) \
+                or value < 0:
+            raise ValueError(
+                'invalid {} value: expected a number greater or equal '
+                'to 0 (got {!r})'.format(name, value))
+
+
+async def _run_with_retries(attempt, *, retries, backoff, max_backoff,
+                            counters, loop):
+    """Await ``attempt()`` until it does not fail with a retryable error.
+
+    The delay before a retry is drawn uniformly from zero to the
+    exponentially growing backoff, so that the transactions which
+    conflicted are unlikely to collide again.
+    """
+    _check_retry_options(retries, backoff, max_backoff)
+
+    counters.runs += 1
+    n = 0
+    while True:
+        try:
+            return await attempt()
+        except RETRYABLE_ERRORS:
+            if n >= retries:
+                counters.failures += 1
+                raise
+
+        delay = random.uniform(0, min(max_backoff, backoff * 2 ** n))
+        n += 1
+        counters.retries += 1
+        if delay:
+            await asyncio.sleep(delay, loop=loop)
@@ -304,6 +304,21 @@ type_samples = [
         dict(
             input='127.0.0.1/32',
             output=ipaddress.IPv4Network('127.0.0.1/32')),
+        dict(
+            textinput='10.1.2.3/8',
+            output=ipaddress.IPv4Network('10.0.0.0/8')),
+        dict(
+            textinput='2001:db8::1/32',
+            output=ipaddress.IPv6Network('2001:db8::/32')),
+        dict(
+            input=ipaddress.IPv6Network('2001:db8::/64'),
+            output=ipaddress.IPv6Network('2001:db8::/64')),
+        dict(
+            input=ipaddress.IPv4Interface('10.0.0.1/24'),
+            output=ipaddress.IPv4Network('10.0.0.0/24')),
+        dict(
+            input=ipaddress.IPv6Interface('2001:db8::1/64'),
+            output=ipaddress.IPv6Network('2001:db8::/64')),
     ]),
     ('macaddr', 'macaddr', [
         '00:00:00:00:00:00',
@@ -452,6 +467,29 @@ class TestCodecs(tb.ConnectedTestCase):
         res = await self.con.fetchval("SELECT '-5 years -1 month'::interval")
         self.assertEqual(res, datetime.timedelta(days=-1855))
 
+    async def test_uuid(self):
+        import pickle
+
+        u = uuid.UUID('38a4ff5a-3a56-11e6-a6c2-c8f73323c6d4')
+        res = await self.con.fetchval('SELECT $1::uuid', u)
+
+        self.assertIsInstance(res, uuid.UUID)
+        self.assertEqual(res, u)
+        self.assertEqual(u, res)
+        self.assertEqual(hash(res), hash(u))
+        self.assertEqual(str(res), str(u))
+        self.assertEqual(repr(res), repr(u))
+        self.assertEqual(res.int, u.int)
+        self.assertEqual(res.bytes, u.bytes)
+        self.assertEqual(res.version, u.version)
+        self.assertEqual(pickle.loads(pickle.dumps(res)), u)
+
+        with self.assertRaises(TypeError):
+            res.foo = 1
+
+        # Decoded values are encoded directly from their bytes.
+        self.assertEqual(await self.con.fetchval('SELECT $1::uuid', res), u)
+
     async def test_numeric(self):
         # Test that we handle dscale correctly.
         cases = [
@@ -489,6 +527,126 @@ class TestCodecs(tb.ConnectedTestCase):
             await self.con.fetchval(
                 "SELECT $1::numeric", 'invalid')
 
+    async def test_numeric_formats(self):
+        cases = [
+            '0', '1', '-1', '0.001', '1234.56', '-1234.5678',
+            '12345678901234567890.123', '1e-30', '1.5e300', '-2e-300',
+            '123456789012345678901234567890', '1e400', '-1e400', '1e25',
+            '1e-400', '-1e-30',
+        ]
+
+        self.con.set_numeric_format('float')
+        try:
+            for case in cases:
+                with self.subTest(format='float', case=case):
+                    res = await self.con.fetchval(
+                        "SELECT $1::text::numeric", case)
+                    self.assertIsInstance(res, float)
+                    self.assertEqual(res, float(decimal.Decimal(case)))
+
+            res = await self.con.fetchval("SELECT 'NaN'::numeric")
+            self.assertTrue(math.isnan(res))
+
+            # Floats are encoded using their shortest representation.
+            res = await self.con.fetchval("SELECT $1::numeric::text", 0.1)
+            self.assertEqual(res, '0.1')
+        finally:
+            self.con.set_numeric_format()
+
+        self.con.set_numeric_format('int', scale=2)
+        try:
+            cases = [
+                ('0', 0), ('1', 100), ('-1.5', -150), ('1234.56', 123456),
+                ('100000000000000000000.01', 10000000000000000000001),
+                ('1e20', 10 ** 22), ('-1e30', -10 ** 32),
+            ]
+            for case, expected in cases:
+                with self.subTest(format='int', case=case):
+                    res = await self.con.fetchval(
+                        "SELECT $1::text::numeric", case)
+                    self.assertEqual(res, expected)
+
+            res = await self.con.fetchval(
+                "SELECT $1::numeric::text", 123456)
+            self.assertEqual(res, '1234.56')
+
+            res = await self.con.fetchval(
+                "SELECT $1::numeric", decimal.Decimal('0.5'))
+            self.assertEqual(res, 50)
+
+            with self.assertRaisesRegex(ValueError, 'loss of precision'):
+                await self.con.fetchval("SELECT 1.005::numeric")
+
+            with self.assertRaisesRegex(ValueError, 'NaN'):
+                await self.con.fetchval("SELECT 'NaN'::numeric")
+        finally:
+            self.con.set_numeric_format()
+
+        res = await self.con.fetchval("SELECT 1.5::numeric")
+        self.assertEqual(res, decimal.Decimal('1.5'))
+
+        with self.assertRaisesRegex(ValueError, 'invalid `format`'):
+            self.con.set_numeric_format('str')
+
+        with self.assertRaisesRegex(ValueError, 'invalid `scale`'):
+            self.con.set_numeric_format('int', scale=-1)
+
+    async def test_inet_interface(self):
+        # The host part of an interface is sent along with its netmask.
+        for value in [ipaddress.IPv4Interface('10.0.0.1/24'),
+                      ipaddress.IPv4Interface('10.0.0.1'),
+                      ipaddress.IPv6Interface('2001:db8::1/64')]:
+            with self.subTest(value=value):
+                res = await self.con.fetchval('SELECT $1::inet::text', value)
+                self.assertEqual(res, value.with_prefixlen)
+
+    async def test_raw_timestamps(self):
+        epoch = datetime.datetime(1970, 1, 1)
+        epoch_utc = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+        ts = datetime.datetime(2017, 3, 4, 5, 6, 7, 123456)
+        tstz = ts.replace(tzinfo=datetime.timezone.utc)
+        d = datetime.date(1960, 5, 6)
+
+        query = '''
+            SELECT $1::timestamp AS ts, $2::timestamptz AS tstz,
+                   $3::date AS d, 'infinity'::timestamp AS inf,
+                   '-infinity'::date AS ninf, 1::int AS i
+        '''
+
+        rows = await self.con.fetch(query, ts, tstz, d, raw_timestamps=True)
+        row = rows[0]
+
+        self.assertEqual(row['ts'], (ts - epoch) // datetime.timedelta(
+            microseconds=1))
+        self.assertEqual(row['tstz'], (tstz - epoch_utc) // datetime.timedelta(
+            microseconds=1))
+        self.assertEqual(row['d'], (d - epoch.date()).days * 86400000000)
+        self.assertEqual(row['inf'], 2 ** 63 - 1)
+        self.assertEqual(row['ninf'], -2 ** 63)
+        self.assertEqual(row['i'], 1)
+
+        # The option applies to a single query only.
+        rows = await self.con.fetch(query, ts, tstz, d)
+        self.assertEqual(rows[0]['ts'], ts)
+        self.assertEqual(rows[0]['d'], d)
+
+        st = await self.con.prepare(query)
+        rows = await st.fetch(ts, tstz, d, raw_timestamps=True)
+        self.assertEqual(rows[0]['ts'], row['ts'])
+        rows = await st.fetch(ts, tstz, d)
+        self.assertEqual(rows[0]['tstz'], tstz)
+
+        # Values near the end of the PostgreSQL timestamp range are
+        # larger than int64 once shifted to the Unix epoch.
+        rows = await self.con.fetch('''
+            SELECT '294276-12-31 23:59:59.999999'::timestamp AS ts,
+                   '294276-12-31'::date AS d
+        ''', raw_timestamps=True)
+        pg_max = 9223371331200000000 - 1
+        self.assertEqual(rows[0]['ts'], pg_max + 946684800000000)
+        self.assertEqual(rows[0]['d'], 9223371244800000000 + 946684800000000)
+
     async def test_unhandled_type_fallback(self):
         await self.con.execute('''
             CREATE EXTENSION IF NOT EXISTS isn
@@ -655,6 +813,78 @@ class TestCodecs(tb.ConnectedTestCase):
                 "SELECT $1::int[]",
                 1)
 
+    async def test_typed_arrays(self):
+        import array
+
+        cases = [
+            ('int4', array.array('i', [1, -2, 2 ** 31 - 1])),
+            ('int8', array.array('q', [1, -2, 2 ** 63 - 1])),
+            ('float4', array.array('f', [1.5, -2.25])),
+            ('float8', array.array('d', [1.5, -2.25, 1e300])),
+        ]
+
+        for typename, data in cases:
+            with self.subTest(type=typename):
+                query = 'SELECT $1::{}[]'.format(typename)
+
+                # Encoding of buffer-protocol objects.
+                res = await self.con.fetchval(query, data)
+                self.assertEqual(res, data.tolist())
+
+                res = await self.con.fetchval(query, memoryview(data))
+                self.assertEqual(res, data.tolist())
+
+                # Typed array decoding.
+                await self.con.set_typed_array_decoding(typename)
+                try:
+                    res = await self.con.fetchval(query, data)
+                    self.assertIsInstance(res, array.array)
+                    self.assertEqual(res, data)
+
+                    res = await self.con.fetchval(query, [])
+                    self.assertEqual(res, array.array(data.typecode))
+                finally:
+                    await self.con.set_typed_array_decoding(
+                        typename, enabled=False)
+
+        # Mismatching item types fall back to element-wise encoding.
+        res = await self.con.fetchval(
+            'SELECT $1::int8[]', array.array('i', [1, 2]))
+        self.assertEqual(res, [1, 2])
+
+        data = memoryview(array.array('i', range(6))).cast('B').cast(
+            'i', [2, 3])
+        res = await self.con.fetchval('SELECT $1::int4[]', data)
+        self.assertEqual(res, [[0, 1, 2], [3, 4, 5]])
+
+        await self.con.set_typed_array_decoding('int4')
+        try:
+            res = await self.con.fetchval('SELECT $1::int4[]', data)
+            self.assertEqual(res.tolist(), [[0, 1, 2], [3, 4, 5]])
+
+            with self.assertRaisesRegex(ValueError, 'NULL elements'):
+                await self.con.fetchval('SELECT ARRAY[1, NULL]::int4[]')
+        finally:
+            await self.con.set_typed_array_decoding('int4', enabled=False)
+
+        with self.assertRaisesRegex(ValueError, 'not supported'):
+            await self.con.set_typed_array_decoding('text')
+
+    async def test_typed_arrays_too_large(self):
+        import mmap
+
+        # 1.5 GiB of int8 values need more than 2 GiB on the wire
+        # with the element length words.  The anonymous mapping is
+        # never touched, so no memory is actually allocated.
+        with mmap.mmap(-1, 1536 * 1024 * 1024) as mm:
+            data = memoryview(mm).cast('q')
+            try:
+                with self.assertRaisesRegex(ValueError,
+                                            'array value is too large'):
+                    await self.con.fetchval('SELECT $1::int8[]', data)
+            finally:
+                data.release()
+
     async def test_composites(self):
         """Test encoding/decoding of composite types."""
         await self.con.execute('''
@@ -1036,6 +1266,58 @@ class TestCodecs(tb.ConnectedTestCase):
         finally:
             await conn.close()
 
+    async def test_json_codec(self):
+        import json
+
+        conn = await self.cluster.connect(database='postgres', loop=self.loop)
+        try:
+            received = []
+
+            def _decoder(value):
+                received.append(type(value))
+                return json.loads(value.decode('utf-8'))
+
+            def _encoder(value):
+                return json.dumps(value).encode('utf-8')
+
+            conn.set_json_codec(encoder=_encoder, decoder=_decoder)
+
+            data = {'foo': 'bar', 'spam': [1, 2.5, None]}
+            for typename in ('json', 'jsonb'):
+                with self.subTest(type=typename):
+                    res = await conn.fetchval(
+                        'SELECT $1::{}'.format(typename), data)
+                    self.assertEqual(res, data)
+
+                    res = await conn.fetchval(
+                        'SELECT $1::{}[]'.format(typename), [data, None])
+                    self.assertEqual(res, [data, None])
+
+            self.assertEqual(set(received), {bytes})
+
+            conn.set_json_codec(decoder=json.loads, raw_bytes=True)
+            res = await conn.fetchval('SELECT $1::jsonb', b'{"a": 1}')
+            self.assertEqual(res, {'a': 1})
+            res = await conn.fetchval('SELECT $1::json', '{"a": 2}')
+            self.assertEqual(res, {'a': 2})
+
+            # Reset to the default codec.
+            conn.set_json_codec()
+            res = await conn.fetchval('SELECT $1::jsonb', '{"a": 1}')
+            self.assertEqual(res, '{"a": 1}')
+
+            for typename in ('json', 'jsonb'):
+                with self.subTest(type=typename):
+                    with self.assertRaisesRegex(TypeError,
+                                                'expected str, got bytes'):
+                        await conn.fetchval(
+                            'SELECT $1::{}'.format(typename), b'{"a": 1}')
+
+            with self.assertRaisesRegex(TypeError, 'must be callable'):
+                conn.set_json_codec(decoder=1)
+        finally:
+            await conn.close()
+
     async def test_custom_codec_override_tuple(self):
         """Test overriding core codecs."""
         cases = [
@@ -1096,6 +1378,98 @@ class TestCodecs(tb.ConnectedTestCase):
         finally:
             await conn.close()
 
+    async def test_custom_codec_override_batch(self):
+        """Test batch-invoked codecs."""
+        conn = await self.cluster.connect(database='postgres', loop=self.loop)
+
+        calls = []
+
+        def _encoder(values):
+            calls.append(('encode', len(values)))
+            return [str(v) for v in values]
+
+        def _decoder(values):
+            calls.append(('decode', len(values)))
+            return [int(v) for v in values]
+
+        try:
+            await conn.set_type_codec(
+                'numeric', encoder=_encoder, decoder=_decoder,
+                schema='pg_catalog', format='text', batch=True
+            )
+
+            res = await conn.fetch('''
+                SELECT v::numeric, (v * 2)::numeric
+                FROM generate_series(1, 100) AS v''')
+            self.assertEqual(res, [(i, i * 2) for i in range(1, 101)])
+            self.assertEqual(calls, [('decode', 100), ('decode', 100)])
+
+            del calls[:]
+            res = await conn.fetch('''
+                SELECT NULLIF(v, 2)::numeric
+                FROM generate_series(1, 3) AS v''')
+            self.assertEqual(res, [(1,), (None,), (3,)])
+            self.assertEqual(calls, [('decode', 2)])
+
+            # Single arguments are passed as one-item lists.
+            del calls[:]
+            res = await conn.fetchval('SELECT $1::numeric', 42)
+            self.assertEqual(res, 42)
+            self.assertEqual(calls, [('encode', 1), ('decode', 1)])
+
+            await conn.execute('CREATE TEMP TABLE tab (v numeric)')
+
+            # Binary COPY cannot carry text-format values.
+            with self.assertRaisesRegex(RuntimeError,
+                                        'no binary format encoder'):
+                await conn.copy_records_to_table('tab', records=[(1,)])
+
+            del calls[:]
+            await conn.executemany(
+                'INSERT INTO tab VALUES ($1)', [(i,) for i in range(10)])
+            self.assertEqual(calls, [('encode', 10)])
+
+            res = await conn.fetchval('SELECT count(v) FROM tab')
+            self.assertEqual(res, 10)
+
+            def _bin_encoder(values):
+                calls.append(('encode', len(values)))
+                return [struct.pack('!i', v) for v in values]
+
+            def _bin_decoder(values):
+                calls.append(('decode', len(values)))
+                return [struct.unpack('!i', v)[0] for v in values]
+
+            await conn.set_type_codec(
+                'int4', encoder=_bin_encoder, decoder=_bin_decoder,
+                schema='pg_catalog', format='binary', batch=True
+            )
+            await conn.execute('CREATE TEMP TABLE tab2 (v int4)')
+
+            del calls[:]
+            await conn.copy_records_to_table(
+                'tab2', records=[(i,) for i in range(10)] + [(None,)])
+            self.assertEqual(calls, [('encode', 10)])
+
+            del calls[:]
+            res = await conn.fetch('SELECT v FROM tab2 ORDER BY v')
+            self.assertEqual(res, [(i,) for i in range(10)] + [(None,)])
+            self.assertEqual(calls, [('decode', 10)])
+
+            def _bad_decoder(values):
+                return []
+
+            await conn.set_type_codec(
+                'numeric', encoder=_encoder, decoder=_bad_decoder,
+                schema='pg_catalog', format='text', batch=True
+            )
+
+            with self.assertRaisesRegex(ValueError, 'returned 0 values'):
+                await conn.fetch('SELECT 1::numeric')
+
+        finally:
+            await conn.close()
+
     async def test_custom_codec_override_deprecation(self):
         conn = await self.cluster.connect(database='postgres', loop=self.loop)
         try:
@@ -1378,6 +1752,75 @@ class TestCodecs(tb.ConnectedTestCase):
                 DROP TYPE enum_t;
             ''')
 
+    async def test_type_interning(self):
+        await self.con.execute('''
+            CREATE TYPE enum_t AS ENUM ('abc', 'def', 'ghi');
+        ''')
+
+        query = '''
+            SELECT (ARRAY['abc', 'def', 'ghi'])[v % 3 + 1]::enum_t,
+                   'label' || (v % 3)::text
+            FROM generate_series(1, 30) AS v
+        '''
+
+        try:
+            await self.con.set_type_interning('enum_t')
+            await self.con.set_type_interning('text', schema='pg_catalog')
+
+            result = await self.con.fetch(query)
+            for i, row in enumerate(result[3:]):
+                self.assertEqual(row, result[i])
+                self.assertIs(row[0], result[i][0])
+                self.assertIs(row[1], result[i][1])
+
+            await self.con.set_type_interning(
+                'text', schema='pg_catalog', enabled=False)
+
+            result = await self.con.fetch(query)
+            self.assertEqual(result[0][1], result[3][1])
+            self.assertIsNot(result[0][1], result[3][1])
+
+            with self.assertRaisesRegex(ValueError, 'non-text type'):
+                await self.con.set_type_interning(
+                    'int4', schema='pg_catalog')
+
+        finally:
+            await self.con.execute('''
+                DROP TYPE enum_t;
+            ''')
+
+    async def test_introspection_simple_types(self):
+        await self.con.execute('''
+            CREATE TYPE enum_t AS ENUM ('abc', 'def', 'ghi');
+            CREATE TYPE enum_range_t AS RANGE (subtype = enum_t);
+            CREATE TYPE comp_t AS (a enum_t, b int);
+        ''')
+
+        try:
+            # Enums, arrays and ranges of them are introspected
+            # without the recursive query.
+            self.assertEqual(
+                await self.con.fetchval('SELECT $1::enum_t[]', ['def']),
+                ['def'])
+            self.assertEqual(
+                await self.con.fetchval(
+                    "SELECT '[abc,ghi)'::enum_range_t"),
+                asyncpg.Range('abc', 'ghi'))
+            self.assertIsNone(self.con._types_stmt)
+
+            # Composites are not.
+            self.assertEqual(
+                await self.con.fetchval('SELECT $1::comp_t[]',
+                                        [('abc', 1)]),
+                [('abc', 1)])
+            self.assertIsNotNone(self.con._types_stmt)
+        finally:
+            await self.con.execute('''
+                DROP TYPE comp_t;
+                DROP TYPE enum_range_t;
+                DROP TYPE enum_t;
+            ''')
+
     async def test_enum_and_range(self):
         await self.con.execute('''
             CREATE TYPE enum_t AS ENUM ('abc', 'def', 'ghi');
@@ -18,6 +18,7 @@ from asyncpg import _testbase as tb
 from asyncpg import connection
 from asyncpg import connect_utils
 from asyncpg import cluster as pg_cluster
+from asyncpg import sync as pg_sync
 from asyncpg.serverversion import split_server_version_string
 
 _system = platform.uname().system
@@ -445,14 +446,64 @@ class TestConnectParams(tb.TestCase):
 
         for arg in {'max_cacheable_statement_size',
                     'max_cached_statement_lifetime',
-                    'statement_cache_size'}:
+                    'statement_cache_size',
+                    'max_result_rows',
+                    'max_result_size'}:
             for val in {None, -1, True, False}:
                 with self.assertRaisesRegex(ValueError, 'greater or equal'):
                     await asyncpg.connect(**{arg: val}, loop=self.loop)
 
+        for val in {None, 'lifo', 1}:
+            with self.assertRaisesRegex(ValueError,
+                                        'invalid statement_cache_policy'):
+                await asyncpg.connect(statement_cache_policy=val,
+                                      loop=self.loop)
+
 
 class TestConnection(tb.ConnectedTestCase):
 
+    async def test_connection_preload_types(self):
+        await self.con.execute('''
+            CREATE TYPE preload_enum AS ENUM ('a', 'b');
+            CREATE SCHEMA preload_schema;
+            CREATE DOMAIN preload_schema.dom AS int CHECK (VALUE > 0);
+            CREATE TABLE preload_schema.tab (a int);
+        ''')
+
+        try:
+            oids = await self.con.fetch('''
+                SELECT $1::regtype::oid, $2::regtype::oid
+            ''', 'preload_enum', 'preload_schema.dom')
+
+            con = await self.cluster.connect(
+                database='postgres', loop=self.loop,
+                preload_types=['preload_enum', 'preload_schema.*'])
+            try:
+                settings = con._protocol.get_settings()
+                for oid in oids[0]:
+                    self.assertIsNotNone(settings.get_data_codec(oid))
+                self.assertIsNotNone(con._preloaded_types)
+
+                self.assertEqual(
+                    await con.fetchval('SELECT $1::preload_enum', 'b'), 'b')
+            finally:
+                await con.close()
+
+            with self.assertRaises(asyncpg.UndefinedObjectError):
+                await self.cluster.connect(
+                    database='postgres', loop=self.loop,
+                    preload_types=['preload_nonexistent'])
+
+            with self.assertRaisesRegex(TypeError, 'preload_types'):
+                await self.cluster.connect(
+                    database='postgres', loop=self.loop,
+                    preload_types=[1])
+        finally:
+            await self.con.execute('''
+                DROP TYPE preload_enum;
+                DROP SCHEMA preload_schema CASCADE;
+            ''')
+
     async def test_connection_isinstance(self):
         self.assertTrue(isinstance(self.con, connection.Connection))
         self.assertTrue(isinstance(self.con, object))
@@ -597,6 +648,26 @@ class TestSSLConnection(tb.ConnectedTestCase):
                 loop=self.loop,
                 ssl=True)
 
+    def test_ssl_sync_connection(self):
+        conn_spec = self.cluster.get_connection_spec()
+        conn_spec.update(host='localhost', user='ssl_user',
+                         database='postgres')
+
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_SSLv23)
+        ssl_context.load_verify_locations(SSL_CA_CERT_FILE)
+
+        con = pg_sync.connect(ssl=ssl_context, **conn_spec)
+        try:
+            # ssl_user can only connect over SSL.
+            self.assertEqual(con.fetchval('SELECT 42'), 42)
+        finally:
+            con.close()
+
+        # ssl=True uses the default context, which verifies the
+        # certificate of the server.
+        with self.assertRaisesRegex(ssl.SSLError, 'verify failed'):
+            pg_sync.connect(ssl=True, **conn_spec)
+
     async def test_ssl_connection_pool(self):
         ssl_context = ssl.SSLContext(ssl.PROTOCOL_SSLv23)
         ssl_context.load_verify_locations(SSL_CA_CERT_FILE)
@@ -5,7 +5,9 @@
 # the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
 
 
+import asyncio
 import asyncpg
+import gc
 import inspect
 
 from asyncpg import _testbase as tb
@@ -90,6 +92,65 @@ class TestIterableCursor(tb.ConnectedTestCase):
 
         self.assertEqual(recs, [(i,) for i in range(11)])
 
+    async def test_cursor_iterable_07(self):
+        st = await self.con.prepare('SELECT generate_series(0, 200)')
+        expected = await st.fetch()
+
+        for prefetch in (None, 1, 7, 50, 300):
+            with self.subTest(prefetch=prefetch):
+                async with self.con.transaction():
+                    result = []
+                    async for rec in st.cursor(prefetch=prefetch,
+                                               prefetch_ahead=True):
+                        result.append(rec)
+
+                self.assertEqual(result, expected)
+
+    async def test_cursor_iterable_08(self):
+        async with self.con.transaction():
+            with self.assertRaisesRegex(asyncpg.InterfaceError,
+                                        'prefetch_ahead argument can only'):
+                await self.con.cursor('SELECT 1', prefetch_ahead=True)
+
+    async def test_cursor_iterable_09(self):
+        # The connection is usable while the next batch is in flight.
+        result = []
+        async with self.con.transaction():
+            async for rec in self.con.cursor(
+                    'SELECT generate_series(0, 99)', prefetch=7,
+                    prefetch_ahead=True):
+                result.append(await self.con.fetchval(
+                    'SELECT $1::int * 2', rec[0]))
+
+        self.assertEqual(result, [i * 2 for i in range(100)])
+
+    async def test_cursor_iterable_10(self):
+        # Abandoning the iteration while the next batch is in flight
+        # leaves the connection usable and logs nothing, including when
+        # that batch fails.
+        contexts = []
+        old_handler = self.loop.get_exception_handler()
+        self.loop.set_exception_handler(
+            lambda loop, ctx: contexts.append(ctx))
+        try:
+            for query in ('SELECT generate_series(0, 99)',
+                          'SELECT 1 / (10 - i) '
+                          'FROM generate_series(0, 99) AS i'):
+                with self.subTest(query=query):
+                    async with self.con.transaction():
+                        async for rec in self.con.cursor(
+                                query, prefetch=10, prefetch_ahead=True):
+                            break
+
+                    self.assertEqual(await self.con.fetchval('SELECT 1'), 1)
+
+            gc.collect()
+            await asyncio.sleep(0.01, loop=self.loop)
+        finally:
+            self.loop.set_exception_handler(old_handler)
+
+        self.assertEqual(contexts, [])
+
 
 class TestCursor(tb.ConnectedTestCase):
 
@@ -7,6 +7,7 @@
 
 import asyncio
 import asyncpg
+import decimal
 import inspect
 import warnings
 
@@ -154,3 +155,273 @@ class TestExecuteScript(tb.ConnectedTestCase):
                 ''', good_data)
         finally:
             await self.con.execute('DROP TABLE exmany')
+
+    async def test_execute_many_copy(self):
+        await self.con.execute('''
+            CREATE TEMP TABLE exmany (a text PRIMARY KEY, b int DEFAULT 0)
+        ''')
+
+        try:
+            result = await self.con.executemany('''
+                INSERT INTO exmany (a, b) VALUES ($1, $2)
+            ''', [('a', 1), ('b', 2), ('c', 3)], use_copy=True)
+            self.assertIsNone(result)
+
+            # Columns not listed get their default values.
+            await self.con.executemany(
+                'INSERT INTO exmany (a) VALUES ($1)', [('d',)],
+                use_copy=True)
+
+            await self.con.executemany('''
+                INSERT INTO exmany (a, b) VALUES ($1, $2)
+                ON CONFLICT (a) DO UPDATE SET b = EXCLUDED.b + exmany.b
+            ''', [('a', 10), ('e', 5)], use_copy=True)
+
+            await self.con.executemany('''
+                INSERT INTO exmany (a, b) VALUES ($1, $2)
+                ON CONFLICT DO NOTHING
+            ''', [('b', 100), ('f', 6)], use_copy=True)
+
+            # Not a plain INSERT, executed row by row.
+            await self.con.executemany('''
+                INSERT INTO exmany (a, b) VALUES ($1, $2::int * 2)
+            ''', [('g', 7)], use_copy=True)
+
+            result = await self.con.fetch('SELECT * FROM exmany ORDER BY a')
+            self.assertEqual(result, [
+                ('a', 11), ('b', 2), ('c', 3), ('d', 0), ('e', 5), ('f', 6),
+                ('g', 14)
+            ])
+
+            # The upsert is atomic.
+            with self.assertRaises(asyncpg.CardinalityViolationError):
+                await self.con.executemany('''
+                    INSERT INTO exmany (a, b) VALUES ($1, $2)
+                    ON CONFLICT (a) DO UPDATE SET b = EXCLUDED.b
+                ''', [('h', 1), ('h', 2)], use_copy=True)
+            self.assertEqual(
+                await self.con.fetchval('SELECT count(*) FROM exmany'), 7)
+        finally:
+            await self.con.execute('DROP TABLE exmany')
+
+    async def test_execute_many_copy_not_a_table(self):
+        await self.con.execute('''
+            CREATE TABLE exmany (a int);
+            CREATE TABLE exmany_log (a int);
+            CREATE VIEW exmany_view AS SELECT a FROM exmany;
+            CREATE TABLE exmany_ruled (a int);
+            CREATE RULE exmany_log_rule AS ON INSERT TO exmany_ruled
+                DO ALSO INSERT INTO exmany_log VALUES (NEW.a);
+        ''')
+
+        try:
+            # COPY cannot write into views and ignores rules,
+            # so these are executed row by row.
+            await self.con.executemany(
+                'INSERT INTO exmany_view (a) VALUES ($1)', [(1,), (2,)],
+                use_copy=True)
+            self.assertEqual(
+                await self.con.fetch('SELECT a FROM exmany ORDER BY a'),
+                [(1,), (2,)])
+
+            await self.con.executemany(
+                'INSERT INTO "exmany_ruled" (a) VALUES ($1)', [(3,), (4,)],
+                use_copy=True)
+            self.assertEqual(
+                await self.con.fetch('SELECT a FROM exmany_ruled ORDER BY a'),
+                [(3,), (4,)])
+            self.assertEqual(
+                await self.con.fetch('SELECT a FROM exmany_log ORDER BY a'),
+                [(3,), (4,)])
+
+            with self.assertRaises(asyncpg.UndefinedTableError):
+                await self.con.executemany(
+                    'INSERT INTO exmany_nope (a) VALUES ($1)', [(1,)],
+                    use_copy=True)
+        finally:
+            await self.con.execute('''
+                DROP VIEW exmany_view;
+                DROP TABLE exmany, exmany_ruled, exmany_log;
+            ''')
+
+
+class TestResultLimits(tb.ConnectedTestCase):
+
+    async def test_result_limits_1(self):
+        query = 'SELECT generate_series(1, $1::int)'
+
+        result = await self.con.fetch(query, 10, max_result_rows=10)
+        self.assertEqual(len(result), 10)
+
+        with self.assertRaisesRegex(asyncpg.ResultTooLargeError,
+                                    'max_result_rows'):
+            await self.con.fetch(query, 100000, max_result_rows=10)
+
+        # The connection must remain usable after the abort.
+        self.assertEqual(await self.con.fetchval('SELECT 1'), 1)
+
+        with self.assertRaisesRegex(asyncpg.ResultTooLargeError,
+                                    'max_result_size'):
+            await self.con.fetch(query, 100000, max_result_size=1024)
+
+        self.assertEqual(await self.con.fetchval('SELECT 1'), 1)
+
+        st = await self.con.prepare(query)
+        with self.assertRaises(asyncpg.ResultTooLargeError):
+            await st.fetch(1000, max_result_rows=5)
+
+        with self.assertRaisesRegex(ValueError, 'max_result_rows'):
+            await self.con.fetch(query, 1, max_result_rows=-1)
+
+    @tb.with_connection_options(max_result_rows=5)
+    async def test_result_limits_2(self):
+        query = 'SELECT generate_series(1, $1::int)'
+
+        with self.assertRaises(asyncpg.ResultTooLargeError):
+            await self.con.fetch(query, 100)
+
+        # Per-call limits take precedence over the connection default.
+        result = await self.con.fetch(query, 100, max_result_rows=0)
+        self.assertEqual(len(result), 100)
+
+        # Cursors are not subject to result limits.
+        result = []
+        async with self.con.transaction():
+            async for rec in self.con.cursor(query, 100):
+                result.append(rec)
+        self.assertEqual(len(result), 100)
+
+
+class TestResultCache(tb.ConnectedTestCase):
+
+    async def test_result_cache_1(self):
+        cache = asyncpg.ResultCache(max_size=2)
+        query = 'SELECT $1::int'
+
+        # Introspect int[] before queries are counted.
+        await self.con.fetch('SELECT $1::int[]', [1])
+
+        r1 = await self.con.fetch(query, 1, cache=cache)
+        count = self.con._protocol.queries_count
+        r2 = await self.con.fetch(query, 1, cache=cache)
+        self.assertEqual(r1, r2)
+        self.assertEqual(self.con._protocol.queries_count, count)
+
+        # Different arguments and options are cached separately.
+        await self.con.fetch(query, 2, cache=cache)
+        await self.con.fetch(query, 2, cache=cache, row_factory=tuple)
+        self.assertEqual(self.con._protocol.queries_count, count + 2)
+        self.assertEqual(len(cache), 2)
+
+        # The least recently used entry was evicted.
+        await self.con.fetch(query, 1, cache=cache)
+        self.assertEqual(self.con._protocol.queries_count, count + 3)
+
+        # Unhashable arguments bypass the cache.
+        await self.con.fetch('SELECT $1::int[]', [1], cache=cache)
+        await self.con.fetch('SELECT $1::int[]', [1], cache=cache)
+        self.assertEqual(self.con._protocol.queries_count, count + 5)
+
+        # Equal arguments of different types are cached separately.
+        cache.clear()
+        res = await self.con.fetch('SELECT $1::numeric::text', 1,
+                                   cache=cache)
+        self.assertEqual(res[0][0], '1')
+        res = await self.con.fetch('SELECT $1::numeric::text',
+                                   decimal.Decimal('1.0'), cache=cache)
+        self.assertEqual(res[0][0], '1.0')
+
+        await self.con.fetch(query, 1, cache=cache)
+        count = self.con._protocol.queries_count
+        await self.con.fetch(query, True, cache=cache)
+        self.assertEqual(self.con._protocol.queries_count, count + 1)
+
+        with self.assertRaisesRegex(TypeError, 'ResultCache'):
+            await self.con.fetch(query, 1, cache={})
+
+        with self.assertRaisesRegex(ValueError, 'max_size'):
+            asyncpg.ResultCache(max_size=0)
+
+    async def test_result_cache_mutable_rows(self):
+        cache = asyncpg.ResultCache()
+        query = 'SELECT 1 AS a'
+
+        class Row:
+            __slots__ = ('a',)
+
+        for row_factory in (dict, Row):
+            with self.subTest(row_factory=row_factory):
+                res = await self.con.fetch(query, cache=cache,
+                                           row_factory=row_factory)
+                res2 = await self.con.fetch(query, cache=cache,
+                                            row_factory=row_factory)
+                self.assertIsNot(res[0], res2[0])
+
+                # Callers modifying their rows do not affect the cache.
+                for r in (res, res2):
+                    if row_factory is dict:
+                        r[0]['a'] = 2
+                    else:
+                        r[0].a = 2
+
+                res = await self.con.fetch(query, cache=cache,
+                                           row_factory=row_factory)
+                if row_factory is dict:
+                    self.assertEqual(res, [{'a': 1}])
+                else:
+                    self.assertEqual(res[0].a, 1)
+
+    async def test_result_cache_owner(self):
+        cache = asyncpg.ResultCache()
+        await self.con.fetch('SELECT 1', cache=cache)
+
+        # Results depend on the connection they come from.
+        con2 = await self.cluster.connect(database='postgres',
+                                          loop=self.loop)
+        try:
+            with self.assertRaisesRegex(asyncpg.InterfaceError,
+                                        'another connection or pool'):
+                await con2.fetch('SELECT 1', cache=cache)
+        finally:
+            await con2.close()
+
+        # Connections of a pool share the cache of the pool.
+        cache = asyncpg.ResultCache()
+        async with self.create_pool(database='postgres',
+                                    min_size=2, max_size=2) as pool:
+            await pool.fetch('SELECT 1', cache=cache)
+            async with pool.acquire() as con:
+                count = con._con._protocol.queries_count
+                self.assertEqual(
+                    await con.fetch('SELECT 1', cache=cache), [(1,)])
+                self.assertEqual(con._con._protocol.queries_count, count)
+
+            with self.assertRaisesRegex(asyncpg.InterfaceError,
+                                        'another connection or pool'):
+                await self.con.fetch('SELECT 1', cache=cache)
+
+    async def test_result_cache_ttl(self):
+        cache = asyncpg.ResultCache(ttl=0.05)
+
+        await self.con.fetch('SELECT 1', cache=cache)
+        count = self.con._protocol.queries_count
+        await asyncio.sleep(0.1, loop=self.loop)
+        await self.con.fetch('SELECT 1', cache=cache)
+        self.assertEqual(self.con._protocol.queries_count, count + 1)
+
+    async def test_result_cache_notify(self):
+        cache = asyncpg.ResultCache(ttl=None)
+        await cache.listen(self.con, 'cache_test')
+
+        try:
+            await self.con.fetch('SELECT 1', cache=cache)
+            self.assertEqual(len(cache), 1)
+
+            await self.con.execute('NOTIFY cache_test')
+            for _ in range(10):
+                if not len(cache):
+                    break
+                await asyncio.sleep(0.05, loop=self.loop)
+            self.assertEqual(len(cache), 0)
+        finally:
+            await cache.unlisten(self.con, 'cache_test')
@@ -488,6 +488,123 @@ class TestPool(tb.ConnectedTestCase):
             finally:
                 await pool.execute('DROP TABLE exmany')
 
+    async def test_pool_run_transaction(self):
+        async def worker(con, i):
+            return await con.fetchval('SELECT $1::int', i)
+
+        async with self.create_pool(database='postgres',
+                                    min_size=1, max_size=2) as pool:
+            res = await asyncio.gather(
+                *[pool.run_transaction(worker, i, isolation='serializable')
+                  for i in range(10)],
+                loop=self.loop)
+            self.assertEqual(res, list(range(10)))
+            self.assertEqual(pool.get_transaction_stats(), (10, 0, 0))
+
+    async def test_pool_share_preloaded_types(self):
+        await self.con.execute(
+            "CREATE TYPE pool_preload_enum AS ENUM ('a', 'b')")
+        try:
+            async with self.create_pool(
+                    database='postgres', min_size=2, max_size=2,
+                    preload_types=['pool_preload_enum'],
+                    share_preloaded_types=True) as pool:
+                cons = [await pool.acquire() for _ in range(2)]
+                try:
+                    # The second connection reuses the type rows
+                    # introspected by the first one.
+                    self.assertIsNotNone(cons[0]._con._preloaded_types)
+                    self.assertIs(cons[0]._con._preloaded_types,
+                                  cons[1]._con._preloaded_types)
+                    for con in cons:
+                        self.assertEqual(
+                            await con.fetchval(
+                                'SELECT $1::pool_preload_enum', 'a'),
+                            'a')
+                finally:
+                    for con in cons:
+                        await pool.release(con)
+        finally:
+            await self.con.execute('DROP TYPE pool_preload_enum')
+
+    async def test_pool_listen(self):
+        async with self.create_pool(database='postgres',
+                                    min_size=1, max_size=1) as pool:
+            sub1 = await pool.listen('pool_listen', max_size=2)
+            sub2 = await pool.listen('pool_listen')
+
+            for i in range(3):
+                await pool.execute("NOTIFY pool_listen, '{}'".format(i))
+
+            # Both subscriptions share one connection, outside the pool.
+            self.assertEqual(len(pool._listener._subscriptions), 1)
+
+            async def received(sub, count):
+                res = []
+                while len(res) < count:
+                    res.extend(n.payload for n in await sub.get_batch())
+                return res
+
+            self.assertEqual(
+                await asyncio.wait_for(received(sub2, 3), 5, loop=self.loop),
+                ['0', '1', '2'])
+            # The oldest notification did not fit in the buffer.
+            self.assertEqual(
+                await asyncio.wait_for(received(sub1, 2), 5, loop=self.loop),
+                ['1', '2'])
+            self.assertEqual(sub1.get_dropped_count(), 1)
+
+            await sub1.close()
+            self.assertEqual(await sub1.get_batch(), [])
+
+            # The listening connection is reestablished if lost.
+            con = pool._listener._con
+            await self.con.execute(
+                'SELECT pg_terminate_backend($1)',
+                con.get_server_pid())
+            for _ in range(50):
+                new_con = pool._listener._con
+                if new_con is not None and new_con is not con:
+                    if 'pool_listen' in new_con._listeners:
+                        break
+                await asyncio.sleep(0.1, loop=self.loop)
+            else:
+                self.fail('the listening connection was not reestablished')
+
+            await pool.execute("NOTIFY pool_listen, 'again'")
+            notification = await asyncio.wait_for(
+                sub2.__anext__(), 5, loop=self.loop)
+            self.assertEqual(notification.payload, 'again')
+            self.assertEqual(notification.channel, 'pool_listen')
+
+        self.assertTrue(sub2.is_closed())
+        with self.assertRaises(StopAsyncIteration):
+            await sub2.__anext__()
+
+    async def test_pool_cancel_dispatcher(self):
+        async with self.create_pool(database='postgres',
+                                    min_size=3, max_size=3,
+                                    max_concurrent_cancels=1) as pool:
+            async def sleep():
+                async with pool.acquire() as con:
+                    with self.assertRaises(asyncio.TimeoutError):
+                        await con.execute('SELECT pg_sleep(10)', timeout=0.1)
+                    self.assertEqual(await con.fetchval('SELECT 1'), 1)
+                    self.assertIs(con._con._cancel_dispatcher,
+                                  pool._cancel_dispatcher)
+
+            await asyncio.gather(*[sleep() for _ in range(3)],
+                                 loop=self.loop)
+
+            stats = pool.get_cancel_stats()
+            self.assertEqual(stats.requests, 3)
+            self.assertEqual(stats.sent, 3)
+            self.assertEqual(stats.failures, 0)
+
+        with self.assertRaisesRegex(ValueError, 'max_concurrent_cancels'):
+            await self.create_pool(database='postgres',
+                                   max_concurrent_cancels=0)
+
     async def test_pool_max_inactive_time_01(self):
         async with self.create_pool(
                 database='postgres', min_size=1, max_size=1,
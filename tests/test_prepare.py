@@ -10,9 +10,22 @@ import asyncpg
 import gc
 import unittest
 
+from asyncpg import connection as pg_connection
 from asyncpg import _testbase as tb
 
 
+class TrackingConnection(pg_connection.Connection):
+    """Connection class recording statement lookups."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.looked_up = []
+
+    async def _get_statement(self, query, timeout, **kwargs):
+        self.looked_up.append(query)
+        return await super()._get_statement(query, timeout, **kwargs)
+
+
 class TestPrepare(tb.ConnectedTestCase):
 
     async def test_prepare_01(self):
@@ -556,3 +569,104 @@ class TestPrepare(tb.ConnectedTestCase):
         self.assertEqual(r[0], 1)
         self.assertEqual(r[1], 2)
         self.assertEqual(r[2], 3)
+
+    async def test_prepare_30_stmt_gc_batched_close(self):
+        # Test that GCed statements are closed on the server along
+        # with the next statement sent.
+        cache = self.con._stmt_cache
+        cache.set_max_size(0)
+
+        stmts = [await self.con.prepare('select {}'.format(i))
+                 for i in range(5)]
+        names = [s._state.name for s in stmts]
+
+        count_query = '''
+            SELECT count(*) FROM pg_prepared_statements
+            WHERE name = any($1::text[])
+        '''
+        count_stmt = await self.con.prepare(count_query)
+        self.assertEqual(await count_stmt.fetchval(names), 5)
+
+        del stmts
+        gc.collect()
+        self.assertEqual(len(self.con._stmts_to_close), 5)
+
+        # Queue the closes and send them with the next Bind.
+        stmt = await self.con.prepare('select 1')
+        self.assertEqual(len(self.con._stmts_to_close), 0)
+        self.assertEqual(await count_stmt.fetchval(names), 0)
+        del stmt
+
+    @tb.with_connection_options(statement_cache_size=2,
+                                statement_cache_policy='lfu')
+    async def test_prepare_31_stmt_cache_lfu(self):
+        cache = self.con._stmt_cache
+
+        for i in range(1, 3):
+            for _ in range(3):
+                self.assertEqual(
+                    await self.con.fetchval('SELECT {}'.format(i)), i)
+        self.assertEqual(len(cache), 2)
+
+        # A burst of one-off queries does not evict the statements
+        # which are used often.
+        for i in range(100, 110):
+            self.assertEqual(
+                await self.con.fetchval('SELECT {}'.format(i)), i)
+
+        self.assertTrue(cache.has('SELECT 1'))
+        self.assertTrue(cache.has('SELECT 2'))
+        self.assertEqual(self.con.get_statement_cache_stats(),
+                         (4, 12, 0, 10))
+
+        # A query which is used often enough gets cached.
+        for _ in range(10):
+            await self.con.fetchval('SELECT 200')
+            if cache.has('SELECT 200'):
+                break
+        else:
+            self.fail('SELECT 200 was not cached')
+
+        stats = self.con.get_statement_cache_stats()
+        self.assertEqual(stats.evictions, 1)
+        self.assertEqual(len(cache), 2)
+
+    @tb.with_connection_options(connection_class=TrackingConnection)
+    async def test_prepare_32_execute_cached(self):
+        # Cached statements are looked up through _get_statement().
+        self.assertIsNone(self.con._config.command_timeout)
+        self.con.looked_up.clear()
+
+        for _ in range(3):
+            self.assertEqual(await self.con.fetchval('SELECT $1::int', 1), 1)
+        self.assertEqual(await self.con.execute('SELECT $1::int', 2),
+                         'SELECT 1')
+
+        self.assertEqual(self.con.looked_up, ['SELECT $1::int'] * 4)
+        self.assertEqual(self.con.get_statement_cache_stats().hits, 3)
+
+        # A statement invalidated by a schema change is re-prepared.
+        await self.con.execute('CREATE TEMP TABLE tab (a int)')
+        try:
+            await self.con.execute('INSERT INTO tab VALUES (1)')
+            self.assertEqual(await self.con.fetch('SELECT * FROM tab'),
+                             [(1,)])
+            await self.con.execute('ALTER TABLE tab ADD COLUMN b int')
+            self.assertEqual(await self.con.fetch('SELECT * FROM tab'),
+                             [(1, None)])
+        finally:
+            await self.con.execute('DROP TABLE tab')
+
+    @tb.with_connection_options(statement_cache_size=2,
+                                statement_cache_policy='lfu')
+    async def test_prepare_33_stmt_cache_lfu_full(self):
+        # The statements admitted into a full cache are executed, and
+        # entries used before are evicted instead.
+        for i in range(20):
+            self.assertEqual(
+                await self.con.fetchval('SELECT $1::int + {}'.format(i), 1),
+                i + 1)
+
+        stats = self.con.get_statement_cache_stats()
+        self.assertEqual(len(self.con._stmt_cache), 2)
+        self.assertGreater(stats.evictions, 0)
@@ -332,3 +332,40 @@ class TestRecord(tb.ConnectedTestCase):
         with self.assertRaisesRegex(
                 TypeError, "cannot create 'asyncpg.Record' instances"):
             asyncpg.Record()
+
+    async def test_record_row_factory(self):
+        query = 'SELECT 1 AS a, $1::text AS b'
+
+        r = await self.con.fetchrow(query, 'x', row_factory=tuple)
+        self.assertIs(type(r), tuple)
+        self.assertEqual(r, (1, 'x'))
+
+        rows = await self.con.fetch(query, 'x', row_factory=dict)
+        self.assertEqual(rows, [{'a': 1, 'b': 'x'}])
+
+        class Row:
+            __slots__ = ('a', 'b')
+
+            def __init__(self):
+                raise AssertionError('__init__ must not be called')
+
+        st = await self.con.prepare(query)
+        r = await st.fetchrow('y', row_factory=Row)
+        self.assertIsInstance(r, Row)
+        self.assertEqual((r.a, r.b), (1, 'y'))
+
+        r = await st.fetchrow('y', row_factory=asyncpg.Record)
+        self.assertIsInstance(r, asyncpg.Record)
+
+        class Narrow:
+            __slots__ = ('a',)
+
+        with self.assertRaises(AttributeError):
+            await self.con.fetch(query, 'x', row_factory=Narrow)
+
+        with self.assertRaisesRegex(TypeError, 'row_factory'):
+            await self.con.fetch(query, 'x', row_factory=lambda r: r)
+
+        # The connection remains usable and returns Records by default.
+        r = await self.con.fetchrow(query, 'z')
+        self.assertIsInstance(r, asyncpg.Record)
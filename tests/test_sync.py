@@ -0,0 +1,147 @@
+# Copyright (C) 2016-present the asyncpg authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of asyncpg and is released under
+# the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
+
+
+import asyncio
+import datetime
+import threading
+
+import asyncpg
+from asyncpg import _testbase as tb
+from asyncpg import sync as pg_sync
+
+
+class TestSyncConnection(tb.ClusterTestCase):
+
+    def setUp(self):
+        super().setUp()
+        conn_spec = self.cluster.get_connection_spec()
+        conn_spec['database'] = 'postgres'
+        self.con = pg_sync.connect(**conn_spec)
+
+    def tearDown(self):
+        try:
+            self.con.close()
+            self.con = None
+        finally:
+            super().tearDown()
+
+    def test_sync_fetch(self):
+        self.assertEqual(self.con.fetchval('SELECT 1'), 1)
+        self.assertIsNone(self.con.fetchrow('SELECT 1 WHERE false'))
+
+        row = self.con.fetchrow(
+            "SELECT $1::int AS a, 'x'::text AS b, $2::date AS c",
+            10, datetime.date(2017, 1, 2))
+        self.assertIsInstance(row, asyncpg.Record)
+        self.assertEqual(row['a'], 10)
+        self.assertEqual(row['b'], 'x')
+        self.assertEqual(row['c'], datetime.date(2017, 1, 2))
+
+        rows = self.con.fetch('SELECT generate_series(1, $1::int)', 3)
+        self.assertEqual(rows, [(1,), (2,), (3,)])
+
+        # Composite and array types are introspected.
+        self.assertEqual(
+            self.con.fetchval("SELECT ROW(1, 'a')::record")[0], 1)
+        self.assertEqual(self.con.fetchval('SELECT $1::int[]', [1, 2]),
+                         [1, 2])
+
+    def test_sync_introspection(self):
+        self.con.execute('''
+            CREATE TYPE sync_enum_t AS ENUM ('abc', 'def');
+            CREATE TYPE sync_comp_t AS (a sync_enum_t, b int);
+        ''')
+
+        try:
+            # Simple types are introspected without the recursive query.
+            self.assertEqual(
+                self.con.fetchval('SELECT $1::sync_enum_t[]', ['def']),
+                ['def'])
+            self.assertIsNotNone(self.con._simple_types_stmt)
+            self.assertIsNone(self.con._types_stmt)
+
+            self.assertEqual(
+                self.con.fetchval('SELECT $1::sync_comp_t', ('abc', 1)),
+                ('abc', 1))
+            self.assertIsNotNone(self.con._types_stmt)
+        finally:
+            self.con.execute('''
+                DROP TYPE sync_comp_t;
+                DROP TYPE sync_enum_t;
+            ''')
+
+    def test_sync_statement_cache(self):
+        for _ in range(3):
+            self.con.fetchval('SELECT $1::int', 1)
+        stats = self.con.get_statement_cache_stats()
+        self.assertEqual(stats.hits, 2)
+
+    def test_sync_execute(self):
+        self.con.execute('CREATE TEMP TABLE sync_tab (a int, b text)')
+        self.assertEqual(
+            self.con.execute('INSERT INTO sync_tab VALUES ($1, $2)', 1, 'a'),
+            'INSERT 0 1')
+        self.con.executemany('INSERT INTO sync_tab VALUES ($1, $2)',
+                             [(2, 'b'), (3, 'c')])
+        self.assertEqual(
+            self.con.fetchval('SELECT count(*) FROM sync_tab'), 3)
+
+        with self.assertRaises(asyncpg.UndefinedTableError):
+            self.con.execute('SELECT * FROM sync_no_such_table')
+        self.assertEqual(self.con.fetchval('SELECT 1'), 1)
+
+    def test_sync_transaction(self):
+        self.con.execute('CREATE TEMP TABLE sync_xact (a int)')
+
+        with self.assertRaises(ZeroDivisionError):
+            with self.con.transaction():
+                self.con.execute('INSERT INTO sync_xact VALUES (1)')
+                self.assertTrue(self.con.is_in_transaction())
+                1 / 0
+        self.assertFalse(self.con.is_in_transaction())
+
+        with self.con.transaction():
+            self.con.execute('INSERT INTO sync_xact VALUES (2)')
+            with self.assertRaises(ZeroDivisionError):
+                with self.con.transaction():
+                    self.con.execute('INSERT INTO sync_xact VALUES (3)')
+                    1 / 0
+
+        self.assertEqual(self.con.fetch('SELECT * FROM sync_xact'), [(2,)])
+
+    def test_sync_timeout(self):
+        with self.assertRaises(asyncio.TimeoutError):
+            self.con.execute('SELECT pg_sleep(10)', timeout=0.1)
+        # The query is cancelled and the connection remains usable.
+        self.assertEqual(self.con.fetchval('SELECT 1'), 1)
+
+    def test_sync_threads(self):
+        conn_spec = self.cluster.get_connection_spec()
+        conn_spec['database'] = 'postgres'
+        results = []
+
+        def worker(i):
+            with pg_sync.connect(**conn_spec) as con:
+                results.append(con.fetchval('SELECT $1::int', i))
+
+        threads = [threading.Thread(target=worker, args=(i,))
+                   for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(results), [0, 1, 2, 3])
+
+    def test_sync_close(self):
+        con = pg_sync.connect(
+            **dict(self.cluster.get_connection_spec(), database='postgres'))
+        self.assertFalse(con.is_closed())
+        con.close()
+        self.assertTrue(con.is_closed())
+        with self.assertRaisesRegex(asyncpg.InterfaceError, 'closed'):
+            con.fetchval('SELECT 1')
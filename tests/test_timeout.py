@@ -109,6 +109,46 @@ class TestTimeout(tb.ConnectedTestCase):
 
         self.assertEqual(await self.con.fetch('select 1'), [(1,)])
 
+    async def test_timeout_cancel_stats(self):
+        # The dispatcher of a standalone connection is created on demand.
+        self.assertIsNone(self.con._cancel_dispatcher)
+        stats = self.con.get_cancel_stats()
+        self.assertIsNotNone(self.con._cancel_dispatcher)
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.con.execute('select pg_sleep(10)', timeout=0.02)
+        self.assertEqual(await self.con.fetch('select 1'), [(1,)])
+
+        new_stats = self.con.get_cancel_stats()
+        self.assertEqual(new_stats.requests, stats.requests + 1)
+        self.assertEqual(new_stats.sent, stats.sent + 1)
+        self.assertEqual(new_stats.failures, stats.failures)
+        self.assertGreater(new_stats.total_latency, stats.total_latency)
+        self.assertGreater(new_stats.max_latency, 0)
+
+    async def test_timeout_cancel_dedup(self):
+        task = self.loop.create_task(self.con.fetch('select pg_sleep(10)'))
+        await asyncio.sleep(0.05, loop=self.loop)
+
+        # Cancellations of the same backend waiting to be sent are
+        # merged into a single CancelRequest.
+        stats = self.con.get_cancel_stats()
+        waiters = [self.loop.create_future() for _ in range(2)]
+        for waiter in waiters:
+            self.con._cancel_dispatcher.cancel(
+                self.con._addr, self.con._params,
+                self.con._protocol.backend_pid,
+                self.con._protocol.backend_secret, waiter)
+        await asyncio.gather(*waiters, loop=self.loop)
+
+        with self.assertRaises(asyncpg.QueryCanceledError), \
+                self.assertRunUnder(MAX_RUNTIME):
+            await task
+
+        new_stats = self.con.get_cancel_stats()
+        self.assertEqual(new_stats.requests, stats.requests + 2)
+        self.assertEqual(new_stats.deduplicated, stats.deduplicated + 1)
+        self.assertEqual(new_stats.sent, stats.sent + 1)
+
     async def test_invalid_timeout(self):
         for command_timeout in ('a', False, -1):
             with self.subTest(command_timeout=command_timeout):
@@ -0,0 +1,42 @@
+# Copyright (C) 2016-present the asyncpg authors and contributors
+# <see AUTHORS file>
+#
+# This module is part of asyncpg and is released under
+# the Apache 2.0 License: http://www.apache.org/licenses/LICENSE-2.0
+
+
+import asyncio
+
+from asyncpg import _testbase as tb
+from asyncpg import timerwheel
+
+
+class TestTimerWheel(tb.TestCase):
+
+    async def test_timer_wheel_1(self):
+        wheel = timerwheel.get_timer_wheel(self.loop)
+        self.assertIs(wheel, timerwheel.get_timer_wheel(self.loop))
+
+        fired = []
+        wheel.call_later(0.1, fired.append, 'a')
+        wheel.call_later(0.01, fired.append, 'b')
+        h = wheel.call_later(0.05, fired.append, 'c')
+        h.cancel()
+        self.assertTrue(h.cancelled())
+
+        await asyncio.sleep(0.3, loop=self.loop)
+        self.assertEqual(fired, ['b', 'a'])
+
+    async def test_timer_wheel_timeout(self):
+        with self.assertRaises(asyncio.TimeoutError):
+            with timerwheel.timeout(0.05, loop=self.loop):
+                await asyncio.sleep(10, loop=self.loop)
+
+        with timerwheel.timeout(0.2, loop=self.loop):
+            await asyncio.sleep(0.01, loop=self.loop)
+
+        # The task must not be cancelled once the block is exited.
+        await asyncio.sleep(0.3, loop=self.loop)
+
+        with timerwheel.timeout(None, loop=self.loop):
+            await asyncio.sleep(0.01, loop=self.loop)
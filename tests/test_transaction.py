@@ -157,3 +157,91 @@ class TestTransaction(tb.ConnectedTestCase):
             await self.con.reset()
 
         self.assertIsNone(self.con._top_xact)
+
+    async def test_transaction_lazy(self):
+        async with self.con.transaction(lazy=True):
+            # BEGIN is deferred until the first statement.
+            self.assertFalse(self.con.is_in_transaction())
+            await self.con.execute('CREATE TABLE mytab (a int)')
+            self.assertTrue(self.con.is_in_transaction())
+
+            async with self.con.transaction(lazy=True):
+                await self.con.fetchval(
+                    'INSERT INTO mytab (a) VALUES ($1) RETURNING a', 1)
+
+            with self.assertRaises(ZeroDivisionError):
+                async with self.con.transaction(lazy=True):
+                    await self.con.fetch(
+                        'INSERT INTO mytab (a) VALUES ($1)', 2)
+                    1 / 0
+
+            # Nothing is sent for an empty block.
+            async with self.con.transaction(lazy=True):
+                pass
+
+            self.assertEqual(
+                await self.con.fetchval('SELECT array_agg(a) FROM mytab'),
+                [1])
+
+        self.assertFalse(self.con.is_in_transaction())
+
+        try:
+            with self.assertRaises(asyncpg.DivisionByZeroError):
+                async with self.con.transaction(lazy=True):
+                    await self.con.execute('INSERT INTO mytab VALUES (3)')
+                    await self.con.fetchval('SELECT 1 / 0')
+
+            self.assertEqual(
+                await self.con.fetchval('SELECT array_agg(a) FROM mytab'),
+                [1])
+
+            async with self.con.transaction(lazy=True):
+                pass
+            self.assertFalse(self.con.is_in_transaction())
+        finally:
+            await self.con.execute('DROP TABLE mytab')
+
+    async def test_transaction_run_retries(self):
+        attempts = []
+
+        async def fn(con, failures):
+            attempts.append(con)
+            if len(attempts) <= failures:
+                await con.execute('''
+                    DO $$ BEGIN
+                        RAISE SQLSTATE '40001';
+                    END $$
+                ''')
+            result = await con.fetchval('SELECT 42')
+            # Each attempt runs in its own transaction.
+            self.assertTrue(con.is_in_transaction())
+            return result
+
+        self.assertEqual(
+            await self.con.run_transaction(fn, 2, backoff=0), 42)
+        self.assertEqual(attempts, [self.con] * 3)
+        self.assertFalse(self.con.is_in_transaction())
+        self.assertEqual(self.con.get_transaction_stats(), (1, 2, 0))
+
+        attempts.clear()
+        with self.assertRaises(asyncpg.SerializationError):
+            await self.con.run_transaction(fn, 10, retries=1, backoff=0)
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(self.con.get_transaction_stats(), (2, 3, 1))
+
+        async def fail(con):
+            attempts.append(con)
+            1 / 0
+
+        attempts.clear()
+        with self.assertRaises(ZeroDivisionError):
+            await self.con.run_transaction(fail)
+        self.assertEqual(len(attempts), 1)
+
+        with self.assertRaisesRegex(ValueError, 'invalid retries'):
+            await self.con.run_transaction(fn, 0, retries=-1)
+
+        async with self.con.transaction():
+            with self.assertRaisesRegex(asyncpg.InterfaceError,
+                                        'inside a transaction'):
+                await self.con.run_transaction(fn, 0)